@@ -0,0 +1,89 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class _NotModified(Exception):
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for read endpoints.
+
+    Views implement get_validators() returning (version, last_modified): a
+    cheap string that changes whenever the data behind the endpoint does,
+    and an optional aware datetime. After authentication and permission
+    checks, a GET or HEAD whose If-None-Match / If-Modified-Since still
+    matches is answered with 304 before the handler queries or serializes
+    anything.
+    """
+
+    def get_validators(self):
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_headers = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        validators = self.get_validators()
+        if validators is None:
+            return
+
+        version, last_modified = validators
+        # The same data renders differently per URL and media type, so both go into the tag.
+        variant = f'{request.get_full_path()}|{request.accepted_media_type}|{version}'
+        etag = '"%s"' % hashlib.md5(variant.encode('utf-8'), usedforsecurity=False).hexdigest()
+        last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+        self._conditional_headers = {'ETag': etag}
+        if last_modified_ts is not None:
+            self._conditional_headers['Last-Modified'] = http_date(last_modified_ts)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if response is not None:
+            raise _NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, '_conditional_headers', None)
+        if headers and response.status_code in (200, 304):
+            for name, value in headers.items():
+                response.headers.setdefault(name, value)
+        return response
+
+
+def queryset_validators(queryset, field='updated_at'):
+    """(version, last_modified) from one MAX(field)/COUNT(*) aggregate over the queryset."""
+    stats = queryset.order_by().aggregate(last_modified=Max(field), count=Count('pk'))
+    last_modified = stats['last_modified']
+    stamp = last_modified.isoformat() if last_modified else '-'
+    return f'{stats["count"]}:{stamp}', last_modified
+
+
+class UpdatedAtConditionalMixin(ConditionalGetMixin):
+    """
+    Validators for models with an auto_now updated_at column: an aggregate
+    over the filtered list queryset, or over the single row for retrieve.
+    Deletes change the count, so they invalidate the tag too.
+    """
+
+    def get_validators(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            except (TypeError, ValueError, ValidationError):
+                return None
+        return queryset_validators(queryset)
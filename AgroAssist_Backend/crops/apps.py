@@ -4,3 +4,6 @@
 class CropsConfig(AppConfig):
     name = 'AgroAssist_Backend.crops'
 
+    def ready(self):
+        # Connects the detail-document and catalog-snapshot invalidation signals.
+        from . import signals  # noqa: F401
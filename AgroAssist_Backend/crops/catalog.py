@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CatalogVersion, Crop, CropCareTask, CropGrowthStage, CropGuide, CropRecommendation
+from .serializers import (CropCareTaskSerializer, CropGrowthStageSerializer, CropGuideSerializer,
+                          CropRecommendationSerializer, CropSerializer)
+
+# How long a process trusts its snapshot before re-reading CatalogVersion.
+# Writes made in this process invalidate immediately; other workers catch up
+# within this window.
+_CHECK_SECONDS = float(os.getenv('CATALOG_SNAPSHOT_CHECK_SECONDS', '5'))
+
+_snapshot = None
+_checked_at = float('-inf')
+_lock = threading.Lock()
+
+
+def _group(rows, key):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[key], []).append(row)
+    return MappingProxyType({value: tuple(items) for value, items in groups.items()})
+
+
+def _by_id(rows):
+    return MappingProxyType({row['id']: row for row in rows})
+
+
+class CatalogSnapshot:
+    """
+    Serialized crop catalog plus lookup indexes, built in one pass.
+
+    Rows are the exact serializer output for each model, in each viewset's
+    default order. A snapshot is never modified after it is built; a catalog
+    change produces a new one. Treat the row dicts as read-only.
+    """
+
+    def __init__(self, version, updated_at=None):
+        self.version = version
+        self.updated_at = updated_at
+
+        crops = Crop.objects.order_by('-created_at', 'id')
+        self.crops = tuple(CropSerializer(crops, many=True).data)
+        self.crops_by_id = _by_id(self.crops)
+        self.crops_by_season = _group(self.crops, 'season')
+        self.crops_by_soil_type = _group(self.crops, 'soil_type')
+
+        # Child lists ordered by crop follow Crop.Meta.ordering, like order_by('crop', ...).
+        crop_rank = {row['id']: rank for rank, row in enumerate(self.crops)}
+
+        guides = CropGuide.objects.select_related('crop').order_by('-created_at', 'id')
+        self.guides = tuple(CropGuideSerializer(guides, many=True).data)
+        self.guides_by_id = _by_id(self.guides)
+        self.guides_by_crop_id = _group(self.guides, 'crop')
+
+        stages = CropGrowthStage.objects.select_related('crop').order_by('stage_number', 'id')
+        stages = CropGrowthStageSerializer(stages, many=True).data
+        self.growth_stages = tuple(sorted(stages, key=lambda row: crop_rank[row['crop']]))
+        self.growth_stages_by_id = _by_id(self.growth_stages)
+        self.growth_stages_by_crop_id = _group(stages, 'crop')
+
+        care_tasks = CropCareTask.objects.select_related('crop').order_by('recommended_dap', 'id')
+        care_tasks = CropCareTaskSerializer(care_tasks, many=True).data
+        self.care_tasks = tuple(sorted(care_tasks, key=lambda row: crop_rank[row['crop']]))
+        self.care_tasks_by_id = _by_id(self.care_tasks)
+        self.care_tasks_by_crop_id = _group(care_tasks, 'crop')
+
+        recommendations = CropRecommendation.objects.select_related('crop').order_by('-priority_score', 'id')
+        self.recommendations = tuple(CropRecommendationSerializer(recommendations, many=True).data)
+        self.recommendations_by_id = _by_id(self.recommendations)
+        self.recommendations_by_season = _group(self.recommendations, 'recommended_season')
+
+
+def current_catalog_version():
+    """(version, updated_at) of the catalog; (0, None) before the first change."""
+    return CatalogVersion.objects.filter(pk=1).values_list('version', 'updated_at').first() or (0, None)
+
+
+def get_catalog():
+    """
+    The current CatalogSnapshot. Costs no queries while the snapshot is
+    fresh, one query to re-check the version, and a rebuild when it moved.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < _CHECK_SECONDS:
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and time.monotonic() - _checked_at < _CHECK_SECONDS:
+            return _snapshot
+        # Read the version before the rows, so a write landing mid-build
+        # leaves this snapshot one version behind rather than mislabelled.
+        version, updated_at = current_catalog_version()
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = CatalogSnapshot(version, updated_at)
+        _checked_at = time.monotonic()
+        return _snapshot
+
+
+def mark_catalog_stale():
+    """Make the next get_catalog() call in this process re-check the version."""
+    global _checked_at
+    _checked_at = float('-inf')
+
+
+def reset_catalog():
+    """Drop the snapshot entirely (tests, or after restoring a database)."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+        mark_catalog_stale()
+
+
+def bump_catalog_version():
+    """
+    Record a catalog change. Signals call this for ORM saves and deletes;
+    bulk writes (bulk_create, update) must call it themselves.
+    """
+    updated = CatalogVersion.objects.filter(pk=1).update(version=F('version') + 1, updated_at=timezone.now())
+    if not updated:
+        CatalogVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+    transaction.on_commit(mark_catalog_stale)
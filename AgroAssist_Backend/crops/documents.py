@@ -0,0 +1,47 @@
+from django.db.models import F, prefetch_related_objects
+from django.utils import timezone
+
+from .models import CropDetailDocument
+from .serializers import CropDetailSerializer
+
+# Child tables nested in the crop details document, loaded with one query each.
+CROP_DETAIL_PREFETCH = ('growth_stages', 'care_tasks', 'guides', 'recommendations')
+
+
+def build_crop_detail(crop):
+    prefetch_related_objects([crop], *CROP_DETAIL_PREFETCH)
+    return CropDetailSerializer(crop).data
+
+
+def crop_detail_document(crop):
+    """
+    Return the details payload for a crop, rebuilding it only when stale.
+
+    Pass a crop loaded with select_related('detail_document') so a fresh
+    document costs no extra query.
+    """
+    try:
+        document = crop.detail_document
+    except CropDetailDocument.DoesNotExist:
+        document = None
+
+    if document is not None and document.payload is not None:
+        return document.payload
+
+    if document is None:
+        # Create the row first: a child row saved while we serialize then bumps its version
+        # instead of invalidating nothing and leaving a stale first payload behind.
+        CropDetailDocument.objects.bulk_create([CropDetailDocument(crop=crop)], ignore_conflicts=True)
+        # Still version 0 (whichever request inserted it) = untouched since it was created.
+        current = CropDetailDocument.objects.filter(crop=crop, version=0)
+    else:
+        current = CropDetailDocument.objects.filter(pk=document.pk, version=document.version)
+
+    payload = build_crop_detail(crop)
+    # Only store it if no child row changed while we were serializing.
+    current.update(payload=payload, built_at=timezone.now())
+    return payload
+
+
+def invalidate_crop_documents(crop_ids):
+    CropDetailDocument.objects.filter(crop_id__in=crop_ids).update(payload=None, version=F('version') + 1)
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CropDetailDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('payload', models.JSONField(blank=True, null=True)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('crop', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='detail_document', to='crops.crop')),
+            ],
+            options={
+                'verbose_name': 'Crop Detail Document',
+                'verbose_name_plural': 'Crop Detail Documents',
+            },
+        ),
+    ]
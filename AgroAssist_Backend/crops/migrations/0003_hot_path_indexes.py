@@ -0,0 +1,41 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0002_detail_documents'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['season', 'soil_type'], name='crop_season_soil_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crop',
+            index=models.Index(fields=['-created_at'], name='crop_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropcaretask',
+            index=models.Index(fields=['crop', 'recommended_dap'], name='caretask_crop_dap_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropgrowthstage',
+            index=models.Index(fields=['crop', 'stage_number'], name='growthstage_crop_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cropguide',
+            index=models.Index(fields=['-created_at'], name='cropguide_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croprecommendation',
+            index=models.Index(fields=['recommended_season', '-priority_score'], name='croprec_season_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croprecommendation',
+            index=models.Index(fields=['-priority_score'], name='croprec_priority_idx'),
+        ),
+    ]
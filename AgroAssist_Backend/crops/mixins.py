@@ -0,0 +1,62 @@
+from django.http import Http404
+from rest_framework.response import Response
+
+from AgroAssist_Backend.conditional import ConditionalGetMixin
+from AgroAssist_Backend.sparse_fields import apply_sparse_fields
+
+from .catalog import get_catalog
+
+
+class CatalogSnapshotMixin(ConditionalGetMixin):
+    """
+    Serves catalog list/retrieve from the in-process CatalogSnapshot.
+
+    catalog_rows names the snapshot attribute with the default-ordered rows
+    (e.g. 'guides'); '<catalog_rows>_by_id' is used for retrieve. Requests
+    with ?search=, ?ordering= or ?expand= go to the database as before.
+    Every GET is validated against the catalog version, so unchanged
+    catalog reads (including crop details) can be answered with 304.
+    """
+
+    catalog_rows = None
+    catalog_bypass_params = ('search', 'ordering', 'expand')
+
+    def get_validators(self):
+        catalog = get_catalog()
+        return f'catalog-{catalog.version}', catalog.updated_at
+
+    def use_catalog(self):
+        params = self.request.query_params
+        return not any(name in params for name in self.catalog_bypass_params)
+
+    def catalog_list(self, catalog):
+        return getattr(catalog, self.catalog_rows)
+
+    def catalog_response(self, rows):
+        request = self.request
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([apply_sparse_fields(row, request) for row in page])
+        return Response([apply_sparse_fields(row, request) for row in rows])
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_catalog():
+            return super().list(request, *args, **kwargs)
+        return self.catalog_response(self.catalog_list(get_catalog()))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_catalog():
+            return super().retrieve(request, *args, **kwargs)
+        rows_by_id = getattr(get_catalog(), f'{self.catalog_rows}_by_id')
+        row = rows_by_id.get(catalog_id(self.kwargs[self.lookup_url_kwarg or self.lookup_field]))
+        if row is None:
+            raise Http404(f'No {self.queryset.model._meta.object_name} matches the given query.')
+        return Response(apply_sparse_fields(row, request))
+
+
+def catalog_id(value):
+    """Query-string/URL id as an int, or None when it is not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
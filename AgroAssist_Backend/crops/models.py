@@ -56,6 +56,11 @@ class Crop(models.Model):
         verbose_name_plural = "Crops"  # Plural name
         # ordering = Default sort order when fetching all crops
         ordering = ['-created_at']  # Newest crops first (- means descending)
+        # indexes = Match the ?season=&soil_type= filters and the default ordering
+        indexes = [
+            models.Index(fields=['season', 'soil_type'], name='crop_season_soil_idx'),
+            models.Index(fields=['-created_at'], name='crop_created_idx'),
+        ]
     
     # __str__ = What text shows when printing this object
     def __str__(self):
@@ -96,6 +101,9 @@ class CropGuide(models.Model):
     class Meta:
         verbose_name = "Crop Guide"
         verbose_name_plural = "Crop Guides"
+        indexes = [
+            models.Index(fields=['-created_at'], name='cropguide_created_idx'),  # Default list ordering
+        ]
     
     def __str__(self):
         # Shows "Rice Guide" format
@@ -133,6 +141,9 @@ class CropGrowthStage(models.Model):
         ordering = ['crop', 'stage_number']
         verbose_name = "Growth Stage"
         verbose_name_plural = "Growth Stages"
+        indexes = [
+            models.Index(fields=['crop', 'stage_number'], name='growthstage_crop_stage_idx'),  # for_crop lookups
+        ]
     
     def __str__(self):
         # Shows "Rice - Stage 1: Germination" format
@@ -167,6 +178,9 @@ class CropCareTask(models.Model):
         ordering = ['crop', 'recommended_dap']
         verbose_name = "Care Task"
         verbose_name_plural = "Care Tasks"
+        indexes = [
+            models.Index(fields=['crop', 'recommended_dap'], name='caretask_crop_dap_idx'),  # for_crop lookups
+        ]
     
     def __str__(self):
         # Shows "Rice - Apply Fertilizer (30 DAP)" format
@@ -199,7 +213,51 @@ class CropRecommendation(models.Model):
         verbose_name = "Crop Recommendation"
         verbose_name_plural = "Crop Recommendations"
         ordering = ['-priority_score']  # Show highest priority first (- = descending)
+        indexes = [
+            models.Index(fields=['recommended_season', '-priority_score'], name='croprec_season_priority_idx'),  # by_season
+            models.Index(fields=['-priority_score'], name='croprec_priority_idx'),  # Default list ordering
+        ]
     
     def __str__(self):
         # Shows "Recommend Rice in Kharif" format
         return f"Recommend {self.crop.name} in {self.recommended_season}"
+
+
+# MODEL 6: CropDetailDocument - Precomputed JSON for the /crops/{id}/details/ endpoint
+class CropDetailDocument(models.Model):
+    # OneToOneField = Exactly one cached document per crop
+    crop = models.OneToOneField(Crop, on_delete=models.CASCADE, related_name='detail_document')  # Which crop
+    
+    # PositiveIntegerField = Bumped every time the crop or one of its child rows changes
+    version = models.PositiveIntegerField(default=0)  # Document version (used for stale-write checks)
+    
+    # JSONField = Serialized CropDetailSerializer output (null = needs rebuild)
+    payload = models.JSONField(blank=True, null=True)  # Cached response body
+    
+    # DateTimeField = When payload was last rebuilt
+    built_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = "Crop Detail Document"
+        verbose_name_plural = "Crop Detail Documents"
+    
+    def __str__(self):
+        # Shows "Rice details v3" format
+        return f"{self.crop.name} details v{self.version}"
+
+
+# MODEL 7: CatalogVersion - Single-row counter bumped on every crop catalog change
+class CatalogVersion(models.Model):
+    # PositiveBigIntegerField = Incremented when a crop, guide, stage, care task or recommendation changes
+    version = models.PositiveBigIntegerField(default=0)  # Worker processes compare this to their in-memory snapshot
+    
+    # DateTimeField = When the catalog last changed
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Catalog Version"
+        verbose_name_plural = "Catalog Version"
+    
+    def __str__(self):
+        # Shows "Catalog v12" format
+        return f"Catalog v{self.version}"
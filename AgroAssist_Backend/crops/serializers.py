@@ -2,12 +2,14 @@
 # Serializers convert Python model objects to JSON and vice versa
 from rest_framework import serializers
 
+from AgroAssist_Backend.sparse_fields import SparseFieldsMixin
+
 # Import models we want to serialize (convert to JSON)
 from .models import Crop, CropGuide, CropGrowthStage, CropCareTask, CropRecommendation
 
 
 # SERIALIZER 1: CropSerializer - Convert Crop model to/from JSON
-class CropSerializer(serializers.ModelSerializer):
+class CropSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # ModelSerializer automatically creates fields based on model
     
     class Meta:
@@ -30,7 +32,7 @@ class CropSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 2: CropGuideSerializer - Convert CropGuide model to/from JSON
-class CropGuideSerializer(serializers.ModelSerializer):
+class CropGuideSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # This serializer handles the step-by-step growing instructions
     
     # SerializerMethodField = Custom field that calls a method
@@ -45,6 +47,10 @@ class CropGuideSerializer(serializers.ModelSerializer):
                   'created_at', 'updated_at']  # All important fields included
         
         read_only_fields = ['created_at', 'updated_at']  # can't edit timestamps
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'crop_name': ('crop__name',)}
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'crop': ('crop', CropSerializer)}
     
     # Method that gets called to populate crop_name field
     def get_crop_name(self, obj):
@@ -54,7 +60,7 @@ class CropGuideSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 3: CropGrowthStageSerializer - Convert growth stages to/from JSON
-class CropGrowthStageSerializer(serializers.ModelSerializer):
+class CropGrowthStageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom field to show crop name
     crop_name = serializers.SerializerMethodField()  # Shows crop name, not just ID
     
@@ -65,6 +71,10 @@ class CropGrowthStageSerializer(serializers.ModelSerializer):
                   'description', 'care_instructions', 'created_at']
         
         read_only_fields = ['created_at']  # can't edit creation time
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'crop_name': ('crop__name',)}
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'crop': ('crop', CropSerializer)}
     
     def get_crop_name(self, obj):
         # Returns the crop name for this growth stage
@@ -72,7 +82,7 @@ class CropGrowthStageSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 4: CropCareTaskSerializer - Convert care tasks to/from JSON
-class CropCareTaskSerializer(serializers.ModelSerializer):
+class CropCareTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom field to show crop name
     crop_name = serializers.SerializerMethodField()  # Shows crop name
     
@@ -82,6 +92,10 @@ class CropCareTaskSerializer(serializers.ModelSerializer):
                   'recommended_dap', 'frequency', 'instructions', 'created_at']
         
         read_only_fields = ['created_at']  # can't edit creation time
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'crop_name': ('crop__name',)}
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'crop': ('crop', CropSerializer)}
     
     def get_crop_name(self, obj):
         # Returns the crop name for this care task
@@ -89,7 +103,7 @@ class CropCareTaskSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 5: CropRecommendationSerializer - Convert recommendations to/from JSON
-class CropRecommendationSerializer(serializers.ModelSerializer):
+class CropRecommendationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom field to show crop name
     crop_name = serializers.SerializerMethodField()  # Shows crop name
     
@@ -99,6 +113,10 @@ class CropRecommendationSerializer(serializers.ModelSerializer):
                   'recommendation_reason', 'priority_score', 'created_at']
         
         read_only_fields = ['created_at']  # can't edit creation time
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'crop_name': ('crop__name',)}
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'crop': ('crop', CropSerializer)}
     
     def get_crop_name(self, obj):
         # Returns the crop name for this recommendation
@@ -106,7 +124,7 @@ class CropRecommendationSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 6: CropDetailSerializer - Shows all crop info with related data
-class CropDetailSerializer(serializers.ModelSerializer):
+class CropDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # NestedSerializer = Show related objects inline instead of just IDs
     
     # SerializerMethodField = Custom field for summary
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .documents import invalidate_crop_documents
+from .models import Crop, CropCareTask, CropGrowthStage, CropGuide, CropRecommendation
+
+CROP_CHILD_MODELS = (CropGuide, CropGrowthStage, CropCareTask, CropRecommendation)
+
+
+@receiver(post_save, sender=Crop, dispatch_uid='crops_crop_saved_invalidate_document')
+def invalidate_on_crop_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_crop_documents([instance.pk])
+
+
+def invalidate_on_child_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_crop_documents([instance.crop_id])
+
+
+for child_model in CROP_CHILD_MODELS:
+    post_save.connect(invalidate_on_child_change, sender=child_model, dispatch_uid=f'crops_{child_model.__name__}_saved')
+    post_delete.connect(invalidate_on_child_change, sender=child_model, dispatch_uid=f'crops_{child_model.__name__}_deleted')
+
+
+def bump_catalog_on_change(sender, instance, **kwargs):
+    # Every worker's in-memory catalog snapshot compares against this counter.
+    bump_catalog_version()
+
+
+for catalog_model in (Crop,) + CROP_CHILD_MODELS:
+    post_save.connect(bump_catalog_on_change, sender=catalog_model, dispatch_uid=f'crops_{catalog_model.__name__}_saved_catalog')
+    post_delete.connect(bump_catalog_on_change, sender=catalog_model, dispatch_uid=f'crops_{catalog_model.__name__}_deleted_catalog')
@@ -0,0 +1,211 @@
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Count, F, FloatField, Sum
+
+from AgroAssist_Backend.weather.locations import location_words, names_city
+from AgroAssist_Backend.weather.models import WeatherForecast
+
+from .models import Crop
+
+SOIL_TYPES = tuple(value for value, _ in Crop.SOIL_CHOICES)
+_SOIL_INDEX = {value: index for index, value in enumerate(SOIL_TYPES)}
+
+# How well a crop bred for one soil (column) does on a farmer's soil (row),
+# in SOIL_TYPES order: Clay, Sandy, Loamy, Mixed.
+_SOIL_FIT = np.array([
+    [1.0, 0.1, 0.6, 0.7],
+    [0.1, 1.0, 0.5, 0.6],
+    [0.6, 0.5, 1.0, 0.8],
+    [0.7, 0.6, 0.8, 1.0],
+])
+
+# Rough soil moisture (%) each soil holds without rain, and how much a
+# week's rain (mm) adds to it.
+_SOIL_BASE_MOISTURE = np.array([40.0, 15.0, 30.0, 28.0])
+_MOISTURE_PER_RAIN_MM = 0.5
+
+# Distance from the optimum at which a component scores 0.
+TEMPERATURE_TOLERANCE = 10.0
+HUMIDITY_TOLERANCE = 30.0
+SOIL_MOISTURE_TOLERANCE = 25.0
+
+COMPONENTS = ('soil', 'temperature', 'humidity', 'soil_moisture', 'water')
+WEIGHTS = np.array([0.30, 0.25, 0.15, 0.10, 0.20])
+# Only soil can be scored without a forecast for the farmer's area.
+_WEATHER_MASK = np.array([1.0, 0.0, 0.0, 0.0, 0.0])
+
+# 1 mm of water over 1 hectare is 10 cubic metres.
+_M3_PER_MM_HECTARE = 10.0
+
+
+class CropMatrix:
+    """Column arrays over the catalog crops, in catalog order. Picklable for worker processes."""
+
+    def __init__(self, crops):
+        self.ids = np.array([row['id'] for row in crops], dtype=np.int64)
+        self.seasons = np.array([row['season'] for row in crops])
+        self.soil_index = np.array([_SOIL_INDEX.get(row['soil_type'], _SOIL_INDEX['Mixed']) for row in crops],
+                                   dtype=np.intp)
+        self.temperature = np.array([row['optimal_temperature'] for row in crops], dtype=np.float64)
+        self.humidity = np.array([row['optimal_humidity'] for row in crops], dtype=np.float64)
+        self.soil_moisture = np.array([row['optimal_soil_moisture'] for row in crops], dtype=np.float64)
+        self.water = np.array([row['water_required_mm_per_week'] for row in crops], dtype=np.float64)
+        self.yield_per_hectare = np.array([float(row['expected_yield_per_hectare']) for row in crops],
+                                          dtype=np.float64)
+
+
+_matrix = (None, None)
+_matrix_lock = threading.Lock()
+
+
+def crop_matrix(catalog):
+    """CropMatrix for a CatalogSnapshot, built once per snapshot."""
+    global _matrix
+    snapshot, matrix = _matrix
+    if snapshot is catalog:
+        return matrix
+    with _matrix_lock:
+        if _matrix[0] is not catalog:
+            _matrix = (catalog, CropMatrix(catalog.crops))
+        return _matrix[1]
+
+
+_WINDOW_SUMS = {
+    'days': Count('id'),
+    'min_temperature': Sum('min_temperature'),
+    'max_temperature': Sum('max_temperature'),
+    'humidity': Sum('humidity', output_field=FloatField()),
+    # Rain weighted by its probability (percent).
+    'rain': Sum(F('expected_rainfall_mm') * F('rainfall_probability'), output_field=FloatField()),
+}
+
+
+def _forecasts(start, days):
+    return WeatherForecast.objects.filter(
+        forecast_date__gte=start,
+        forecast_date__lt=start + timedelta(days=days),
+    ).order_by()
+
+
+def _window(sums):
+    count = sums['days']
+    if not count:
+        return None
+    return {
+        'days': count,
+        'temperature': (sums['min_temperature'] + sums['max_temperature']) / 2 / count,
+        'humidity': sums['humidity'] / count,
+        'rain_mm_per_week': sums['rain'] / 100 * 7 / count,
+    }
+
+
+def forecast_window(city, start, days=7):
+    """
+    Averages of the forecasts over [start, start + days) for the locations
+    naming a farmer's city, or None when there are none (or the city is blank).
+    """
+    return forecast_windows([city], start, days)[city]
+
+
+def forecast_windows(cities, start, days=7):
+    """forecast_window() for many cities from one grouped query: {city: window or None}."""
+    cities = list(cities)
+    if not any(location_words(city) for city in cities):
+        return {city: None for city in cities}
+    locations = [
+        (location_words(row['location']), row)
+        for row in _forecasts(start, days).values('location').annotate(**_WINDOW_SUMS)
+    ]
+    windows = {}
+    for city in cities:
+        city_words = location_words(city)
+        matching = [row for words, row in locations if names_city(words, city_words)]
+        windows[city] = _window({name: sum(row[name] for row in matching) for name in _WINDOW_SUMS})
+    return windows
+
+
+def _closeness(values, target, tolerance):
+    return np.clip(1.0 - np.abs(values - target) / tolerance, 0.0, 1.0)
+
+
+def score_crops(matrix, soil_type, land_area_hectares, weather=None):
+    """
+    Score every crop in the matrix for one farm.
+
+    Returns (components, scores, irrigation_m3_per_week, expected_yield):
+    components is a (len(COMPONENTS), crops) array of 0..1 scores, scores
+    their weighted mean. Without a weather window only soil is scored.
+    """
+    crops = len(matrix.ids)
+    farmer_soil = _SOIL_INDEX.get(soil_type, _SOIL_INDEX['Mixed'])
+    components = np.zeros((len(COMPONENTS), crops))
+    components[0] = _SOIL_FIT[farmer_soil, matrix.soil_index]
+
+    if weather is None:
+        weights = WEIGHTS * _WEATHER_MASK
+        irrigation_mm = matrix.water
+    else:
+        rain = weather['rain_mm_per_week']
+        moisture = _SOIL_BASE_MOISTURE[farmer_soil] + rain * _MOISTURE_PER_RAIN_MM
+        components[1] = _closeness(matrix.temperature, weather['temperature'], TEMPERATURE_TOLERANCE)
+        components[2] = _closeness(matrix.humidity, weather['humidity'], HUMIDITY_TOLERANCE)
+        components[3] = _closeness(matrix.soil_moisture, moisture, SOIL_MOISTURE_TOLERANCE)
+        # Share of the weekly water need the forecast rain covers.
+        components[4] = np.clip(rain / np.maximum(matrix.water, 1.0), 0.0, 1.0)
+        weights = WEIGHTS
+        irrigation_mm = np.maximum(matrix.water - rain, 0.0)
+
+    scores = weights @ components / weights.sum()
+    irrigation = irrigation_mm * land_area_hectares * _M3_PER_MM_HECTARE
+    expected_yield = matrix.yield_per_hectare * land_area_hectares
+    return components, scores, irrigation, expected_yield
+
+
+def top_indexes(scores, limit, mask=None):
+    """Indexes of the `limit` best scores, best first (ties keep catalog order)."""
+    if mask is not None:
+        candidates = np.flatnonzero(mask)
+        scores = scores[candidates]
+    else:
+        candidates = np.arange(len(scores))
+    if limit < len(scores):
+        # argpartition keeps this O(n) for large catalogs; only the top slice is sorted.
+        part = np.argpartition(-scores, limit - 1)[:limit]
+        part = part[np.lexsort((part, -scores[part]))]
+    else:
+        part = np.lexsort((np.arange(len(scores)), -scores))
+    return candidates[part]
+
+
+def rank_crops(matrix, soil_type, land_area_hectares, weather=None, season=None, limit=10):
+    """Ranked result rows for one farm: crop id, score and score breakdown."""
+    components, scores, irrigation, expected_yield = score_crops(matrix, soil_type, land_area_hectares, weather)
+    mask = matrix.seasons == season if season else None
+    results = []
+    for index in top_indexes(scores, limit, mask):
+        results.append({
+            'crop': int(matrix.ids[index]),
+            'score': round(float(scores[index]), 4),
+            'breakdown': {
+                name: round(float(components[position, index]), 4)
+                for position, name in enumerate(COMPONENTS)
+                if weather is not None or name == 'soil'
+            },
+            'irrigation_m3_per_week': round(float(irrigation[index]), 2),
+            'expected_yield': round(float(expected_yield[index]), 2),
+        })
+    return results
+
+
+def with_catalog_crops(catalog, results):
+    """Replace the crop ids in rank_crops() rows with the catalog crop rows."""
+    crops_by_id = catalog.crops_by_id
+    return [{**row, 'crop': crops_by_id[row['crop']]} for row in results]
+
+
+def recommend_crops(catalog, soil_type, land_area_hectares, weather=None, season=None, limit=10):
+    """rank_crops() over the catalog snapshot, with full crop rows."""
+    results = rank_crops(crop_matrix(catalog), soil_type, land_area_hectares, weather, season, limit)
+    return with_catalog_crops(catalog, results)
@@ -1,3 +1,214 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from AgroAssist_Backend.crops import catalog, documents
+from AgroAssist_Backend.crops.models import (
+    CatalogVersion,
+    Crop,
+    CropDetailDocument,
+    CropGrowthStage,
+    CropGuide,
+    CropRecommendation,
+)
+from AgroAssist_Backend.testing import seed_api_data
+from AgroAssist_Backend.weather.models import WeatherData, WeatherForecast
+
+
+CATALOG_LIST_URLS = ('crops-list', 'crop-guides-list', 'growth-stages-list', 'care-tasks-list', 'recommendations-list')
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class CatalogSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('catalog_admin', 'catalog_admin@example.com', 'pw', is_staff=True)
+        cls.crop_id = Crop.objects.order_by('pk').values_list('pk', flat=True).first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        catalog.reset_catalog()
+        catalog.get_catalog()
+
+    def catalog_urls(self):
+        crop_param = {'crop_id': self.crop_id}
+        return [(reverse(name), {}) for name in CATALOG_LIST_URLS] + [
+            (reverse('crops-list'), {'season': 'Kharif', 'soil_type': 'Loamy', 'state': 'maharashtra'}),
+            (reverse('crops-detail', args=[self.crop_id]), {}),
+            (reverse('crops-by-season'), {'season': 'Kharif'}),
+            (reverse('crops-recommendations'), {'season': 'Kharif', 'soil_type': 'Loamy'}),
+            (reverse('crop-guides-for-crop'), crop_param),
+            (reverse('growth-stages-for-crop'), crop_param),
+            (reverse('care-tasks-for-crop'), crop_param),
+            (reverse('recommendations-by-season'), {'season': 'Kharif'}),
+        ]
+
+    def test_warm_catalog_reads_run_no_queries(self):
+        for url, params in self.catalog_urls():
+            with self.subTest(url, params=params):
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200, response.content)
+
+    def test_snapshot_responses_match_database_path(self):
+        # An empty ?search= leaves the queryset unfiltered but bypasses the snapshot.
+        for url, params in self.catalog_urls():
+            with self.subTest(url, params=params):
+                snapshot = self.client.get(url, params)
+                database = self.client.get(url, {**params, 'search': ''})
+                self.assertEqual(snapshot.content, database.content)
+
+    def test_unknown_ids_are_404(self):
+        self.assertEqual(self.client.get(reverse('crops-detail', args=[999999])).status_code, 404)
+        response = self.client.get(reverse('crop-guides-for-crop'), {'crop_id': 'x'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_save_in_this_process_is_visible_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CropRecommendation.objects.create(
+                crop_id=self.crop_id, recommended_season='Rabi', recommendation_reason='Winter fit', priority_score=9,
+            )
+        response = self.client.get(reverse('recommendations-by-season'), {'season': 'Rabi'})
+        self.assertEqual([row['priority_score'] for row in response.data['results']], [9])
+
+    def test_other_process_writes_are_picked_up_by_version_check(self):
+        # bulk_create skips signals, like a write made by another worker.
+        CropRecommendation.objects.bulk_create([
+            CropRecommendation(crop_id=self.crop_id, recommended_season='Summer', recommendation_reason='Hot', priority_score=3),
+        ])
+        url = reverse('recommendations-by-season')
+        self.assertEqual(self.client.get(url, {'season': 'Summer'}).data['count'], 0)
+
+        CatalogVersion.objects.update_or_create(pk=1, defaults={'version': catalog.get_catalog().version + 1})
+        with mock.patch.object(catalog, '_CHECK_SECONDS', 0):
+            self.assertEqual(self.client.get(url, {'season': 'Summer'}).data['count'], 1)
+
+
+class CropDetailDocumentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('crop_document_admin', 'crop_document_admin@example.com', 'pw',
+                                             is_staff=True)
+        cls.crop = Crop.objects.get()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        catalog.reset_catalog()
+        self.url = reverse('crops-details', args=[self.crop.pk])
+
+    def document(self):
+        return CropDetailDocument.objects.get(crop=self.crop)
+
+    def test_crop_and_child_writes_invalidate_the_document(self):
+        payload = self.client.get(self.url).data
+        self.assertEqual((self.document().payload, self.document().version), (payload, 0))
+
+        crop = Crop.objects.get(pk=self.crop.pk)
+        guide = CropGuide.objects.get(crop=crop)
+
+        def save(instance, **fields):
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            instance.save()
+
+        writes = [
+            ('crop', lambda: save(crop, name='Renamed crop'), lambda data: data['name'] == 'Renamed crop'),
+            ('guide', lambda: save(guide, watering_schedule='Daily'),
+             lambda data: data['guides'][0]['watering_schedule'] == 'Daily'),
+            ('growth stage delete', lambda: CropGrowthStage.objects.get(crop=crop).delete(),
+             lambda data: data['growth_stages'] == []),
+        ]
+        for label, write, check in writes:
+            with self.subTest(write=label):
+                self.client.get(self.url)
+                version = self.document().version
+                write()
+                self.assertIsNone(self.document().payload)
+                self.assertGreater(self.document().version, version)
+                self.assertTrue(check(self.client.get(self.url).data))
+
+    def test_write_during_the_first_build_is_not_stored_over(self):
+        build = documents.build_crop_detail
+
+        def build_then_concurrent_write(crop):
+            payload = build(crop)
+            # Another request adds a growth stage after this one has serialized the crop.
+            CropGrowthStage.objects.create(
+                crop_id=crop.pk, stage_name='Flowering', duration_days=20, stage_number=2,
+                optimal_temperature=26.0, optimal_humidity=60.0, optimal_soil_moisture=40.0,
+            )
+            return payload
+
+        with mock.patch.object(documents, 'build_crop_detail', build_then_concurrent_write):
+            self.assertEqual(len(self.client.get(self.url).data['growth_stages']), 1)
+        self.assertIsNone(self.document().payload)
+        self.assertEqual(len(self.client.get(self.url).data['growth_stages']), 2)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('conditional_admin', 'conditional_admin@example.com', 'pw', is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        catalog.reset_catalog()
+        catalog.get_catalog()
+
+    def test_unchanged_catalog_is_304_without_queries(self):
+        url = reverse('crops-list')
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_catalog_change_invalidates_etag(self):
+        url = reverse('growth-stages-list')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Crop.objects.first().save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_differs_per_query_string(self):
+        url = reverse('crops-list')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'season': 'Rabi'})['ETag'])
+
+    def test_weather_validators_cost_one_aggregate(self):
+        url = reverse('weather-forecast-list')
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        WeatherForecast.objects.filter(pk=WeatherForecast.objects.first().pk).update(
+            updated_at=timezone.now() + timedelta(minutes=1),
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_weather_retrieve_is_validated_per_row(self):
+        first, second = WeatherData.objects.order_by('pk')[:2]
+        url = reverse('weather-data-detail', args=[first.pk])
+        etag = self.client.get(url)['ETag']
+        WeatherData.objects.filter(pk=second.pk).update(temperature=40)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(reverse('weather-data-detail', args=['x'])).status_code, 404)
@@ -6,9 +6,13 @@ from rest_framework.pagination import PageNumberPagination  # For pagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser  # Permission classes
 
 # Import models and serializers
+from .catalog import get_catalog
+from .documents import crop_detail_document
+from .mixins import CatalogSnapshotMixin, catalog_id
 from .models import Crop, CropGuide, CropGrowthStage, CropCareTask, CropRecommendation
 from .serializers import (CropSerializer, CropGuideSerializer, CropGrowthStageSerializer,
-                         CropCareTaskSerializer, CropRecommendationSerializer, CropDetailSerializer)
+                         CropCareTaskSerializer, CropRecommendationSerializer)
+from AgroAssist_Backend.sparse_fields import SparseQuerysetMixin, apply_sparse_fields
 
 
 # CUSTOM PAGINATION - For limiting number of results returned
@@ -26,7 +30,7 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 # VIEWSET 1: CropViewSet - API endpoints for Crop model
-class CropViewSet(viewsets.ModelViewSet):
+class CropViewSet(CatalogSnapshotMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     # ModelViewSet = Automatically provides CRUD operations (Create, Read, Update, Delete)
     
     # queryset = What data to work with
@@ -53,6 +57,14 @@ class CropViewSet(viewsets.ModelViewSet):
     # permission_classes = Require authentication
     permission_classes = [IsAuthenticated]
     
+    # query_budgets = Max SQL queries per action (checked by AgroAssist_Backend/farmers/tests.py)
+    # Catalog reads come from the in-memory snapshot (at most 1 query to re-check its version);
+    # details covers a document's first build (crop + insert + 4 prefetches + update)
+    query_budgets = {'list': 1, 'retrieve': 1, 'details': 7, 'by_season': 1, 'recommendations': 1}
+    
+    # catalog_rows = Which CatalogSnapshot rows serve list/retrieve (see crops/catalog.py)
+    catalog_rows = 'crops'
+    
     def get_permissions(self):
         """Only admins can create/edit/delete crops; all authenticated users can read."""
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -76,21 +88,45 @@ class CropViewSet(viewsets.ModelViewSet):
         if state:
             queryset = queryset.filter(description__icontains=state)
 
+        # details is served from the precomputed document (rebuilt with prefetches when stale)
+        if self.action == 'details':
+            queryset = queryset.select_related('detail_document')
+
         return queryset
+
+    def catalog_list(self, catalog):
+        # Same season/soil_type/state filters as get_queryset, applied to the snapshot indexes
+        season = self.request.query_params.get('season')
+        soil_type = self.request.query_params.get('soil_type')
+        state = self.request.query_params.get('state')
+
+        if season:
+            rows = catalog.crops_by_season.get(season, ())
+            if soil_type:
+                rows = [row for row in rows if row['soil_type'] == soil_type]
+        elif soil_type:
+            rows = catalog.crops_by_soil_type.get(soil_type, ())
+        else:
+            rows = catalog.crops
+
+        if state and state.strip():
+            state = state.strip().lower()
+            rows = [row for row in rows if state in row['description'].lower()]
+        return rows
     
     # ACTION ENDPOINT: Details with related data
     @action(detail=True, methods=['get'])  # Custom action for GET request at /crops/1/details/
     def details(self, request, pk=None):
         # pk = Primary key (ID) of the crop
         
-        # Get the specific crop
+        # Get the specific crop (with its cached details document)
         crop = self.get_object()  # Get crop by ID
         
-        # Use detailed serializer that includes all related data
-        serializer = CropDetailSerializer(crop)  # Serialize with all nested data
+        # Stored CropDetailSerializer output; only re-serialized after the crop or a child row changes
+        payload = crop_detail_document(crop)
         
-        # Return JSON response
-        return Response(serializer.data)  # Send serialized data as response
+        # Return JSON response (?fields= / ?omit= pick top-level keys)
+        return Response(apply_sparse_fields(payload, request))  # Send serialized data as response
     
     # ACTION ENDPOINT: Get crops for a specific season
     @action(detail=False, methods=['get'])  # Custom action for GET request at /crops/by_season/
@@ -106,6 +142,10 @@ class CropViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST  # HTTP 400 = Bad Request
             )
         
+        # Served from the in-memory catalog (no database query)
+        if self.use_catalog():
+            return self.catalog_response(get_catalog().crops_by_season.get(season, ()))
+        
         # Filter crops by season
         crops = Crop.objects.filter(season=season)  # Get crops for this season
         
@@ -137,8 +177,19 @@ class CropViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Served from the in-memory catalog: season index, then crop soil/state filters
+        if self.use_catalog():
+            catalog = get_catalog()
+            rows = catalog.recommendations_by_season.get(season, ())
+            if soil_type:
+                rows = [row for row in rows if catalog.crops_by_id[row['crop']]['soil_type'] == soil_type]
+            if state:
+                state = state.lower()
+                rows = [row for row in rows if state in catalog.crops_by_id[row['crop']]['description'].lower()]
+            return self.catalog_response(rows)
+        
         # Get recommendations for this season (and optional soil)
-        recommendations = CropRecommendation.objects.filter(
+        recommendations = CropRecommendation.objects.select_related('crop').filter(
             recommended_season=season
         )
 
@@ -153,18 +204,18 @@ class CropViewSet(viewsets.ModelViewSet):
         page = self.paginate_queryset(recommendations)
         
         if page is not None:
-            serializer = CropRecommendationSerializer(page, many=True)
+            serializer = CropRecommendationSerializer(page, many=True, context=self.get_serializer_context())
             return self.get_paginated_response(serializer.data)
         
-        serializer = CropRecommendationSerializer(recommendations, many=True)
+        serializer = CropRecommendationSerializer(recommendations, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
 
 # VIEWSET 2: CropGuideViewSet - API endpoints for Crop Guides
-class CropGuideViewSet(viewsets.ModelViewSet):
+class CropGuideViewSet(CatalogSnapshotMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     # ModelViewSet for CRUD operations on guides
     
-    queryset = CropGuide.objects.all()  # All guides
+    queryset = CropGuide.objects.select_related('crop')  # All guides (with crop for crop_name)
     serializer_class = CropGuideSerializer  # Use CropGuideSerializer
     pagination_class = StandardResultsSetPagination  # Paginate results
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Search/sort
@@ -174,6 +225,8 @@ class CropGuideViewSet(viewsets.ModelViewSet):
     
     # ordering = Default sort (newest first)
     ordering = ['-created_at']
+    query_budgets = {'list': 1, 'retrieve': 1, 'for_crop': 1}
+    catalog_rows = 'guides'  # Reads come from the in-memory catalog snapshot
     
     # ACTION: Get guide for a specific crop
     @action(detail=False, methods=['get'])  # GET at /guides/for_crop/
@@ -187,9 +240,19 @@ class CropGuideViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Served from the in-memory catalog (first guide for the crop)
+        if self.use_catalog():
+            guides = get_catalog().guides_by_crop_id.get(catalog_id(crop_id), ())
+            if not guides:
+                return Response(
+                    {'error': 'No guide found for this crop'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(apply_sparse_fields(guides[0], request))
+        
         # Get guide for this crop
         try:
-            guide = CropGuide.objects.get(crop_id=crop_id)  # Get by crop ID
+            guide = self.get_queryset().get(crop_id=crop_id)  # Get by crop ID
         except CropGuide.DoesNotExist:  # If not found
             return Response(
                 {'error': 'No guide found for this crop'},
@@ -201,14 +264,16 @@ class CropGuideViewSet(viewsets.ModelViewSet):
 
 
 # VIEWSET 3: CropGrowthStageViewSet - API endpoints for growth stages
-class CropGrowthStageViewSet(viewsets.ReadOnlyModelViewSet):
+class CropGrowthStageViewSet(CatalogSnapshotMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     # ReadOnlyModelViewSet = Can only read (GET), not create/edit
     
-    queryset = CropGrowthStage.objects.all()  # All growth stages
+    queryset = CropGrowthStage.objects.select_related('crop')  # All growth stages (with crop)
     serializer_class = CropGrowthStageSerializer  # Use serializer
     pagination_class = StandardResultsSetPagination  # Paginate
     filter_backends = [filters.OrderingFilter]  # Can sort
     ordering = ['crop', 'stage_number']  # Sort by crop then stage number
+    query_budgets = {'list': 1, 'retrieve': 1, 'for_crop': 1}
+    catalog_rows = 'growth_stages'  # Reads come from the in-memory catalog snapshot
     
     # ACTION: Get stages for a specific crop
     @action(detail=False, methods=['get'])  # GET at /growth-stages/for_crop/
@@ -222,8 +287,12 @@ class CropGrowthStageViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Served from the in-memory catalog (already in stage order)
+        if self.use_catalog():
+            return self.catalog_response(get_catalog().growth_stages_by_crop_id.get(catalog_id(crop_id), ()))
+        
         # Get all stages for this crop in order
-        stages = CropGrowthStage.objects.filter(crop_id=crop_id).order_by('stage_number')
+        stages = self.get_queryset().filter(crop_id=crop_id).order_by('stage_number')
         
         # Paginate
         page = self.paginate_queryset(stages)
@@ -237,15 +306,17 @@ class CropGrowthStageViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 # VIEWSET 4: CropCareTaskViewSet - API endpoints for care tasks
-class CropCareTaskViewSet(viewsets.ReadOnlyModelViewSet):
+class CropCareTaskViewSet(CatalogSnapshotMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     # ReadOnlyModelViewSet = Read-only (GET only)
     
-    queryset = CropCareTask.objects.all()  # All care tasks
+    queryset = CropCareTask.objects.select_related('crop')  # All care tasks (with crop)
     serializer_class = CropCareTaskSerializer  # Use serializer
     pagination_class = StandardResultsSetPagination  # Paginate
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]  # Search/sort
     search_fields = ['task_name', 'description']  # Search by these
     ordering = ['crop', 'recommended_dap']  # Sort by crop, then by days
+    query_budgets = {'list': 1, 'retrieve': 1, 'for_crop': 1}
+    catalog_rows = 'care_tasks'  # Reads come from the in-memory catalog snapshot
     
     # ACTION: Get tasks for a specific crop
     @action(detail=False, methods=['get'])  # GET at /care-tasks/for_crop/
@@ -259,8 +330,12 @@ class CropCareTaskViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Served from the in-memory catalog (already in recommended_dap order)
+        if self.use_catalog():
+            return self.catalog_response(get_catalog().care_tasks_by_crop_id.get(catalog_id(crop_id), ()))
+        
         # Get all tasks for this crop in order
-        tasks = CropCareTask.objects.filter(crop_id=crop_id).order_by('recommended_dap')
+        tasks = self.get_queryset().filter(crop_id=crop_id).order_by('recommended_dap')
         
         # Paginate
         page = self.paginate_queryset(tasks)
@@ -274,14 +349,16 @@ class CropCareTaskViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 # VIEWSET 5: CropRecommendationViewSet - API for recommendations
-class CropRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
+class CropRecommendationViewSet(CatalogSnapshotMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     # ReadOnlyModelViewSet = Read-only
     
-    queryset = CropRecommendation.objects.all()  # All recommendations
+    queryset = CropRecommendation.objects.select_related('crop')  # All recommendations (with crop)
     serializer_class = CropRecommendationSerializer  # Use serializer
     pagination_class = StandardResultsSetPagination  # Paginate
     filter_backends = [filters.OrderingFilter]  # Can sort
     ordering = ['-priority_score']  # Most important first
+    query_budgets = {'list': 1, 'retrieve': 1, 'by_season': 1}
+    catalog_rows = 'recommendations'  # Reads come from the in-memory catalog snapshot
     
     # ACTION: Get recommendations for a season
     @action(detail=False, methods=['get'])  # GET at /recommendations/by_season/
@@ -295,8 +372,12 @@ class CropRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Served from the in-memory catalog (season index, priority order)
+        if self.use_catalog():
+            return self.catalog_response(get_catalog().recommendations_by_season.get(season, ()))
+        
         # Get recommendations for this season
-        recommendations = CropRecommendation.objects.filter(
+        recommendations = self.get_queryset().filter(
             recommended_season=season
         ).order_by('-priority_score')  # Sort by priority
         
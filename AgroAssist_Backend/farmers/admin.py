@@ -8,6 +8,7 @@ class FarmerAdmin(admin.ModelAdmin):
     list_filter = ['experience_level', 'soil_type', 'city']  # Filters
     search_fields = ['first_name', 'last_name', 'email', 'phone_number']  # Searchable
     readonly_fields = ['created_at', 'updated_at']  # Can't edit timestamps
+    raw_id_fields = ['user']  # Linked login account
 
 # Register FarmerCrop model - What crops each farmer grows
 @admin.register(FarmerCrop)
@@ -4,3 +4,6 @@
 class FarmersConfig(AppConfig):
     name = 'AgroAssist_Backend.farmers'
 
+    def ready(self):
+        # Connects the token user-cache invalidation and farmer-link signals.
+        from . import signals, stateless_token_auth  # noqa: F401
@@ -1,5 +1,7 @@
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.db.models import Value
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 from .models import Farmer
@@ -20,8 +22,8 @@ class LoginSerializer(serializers.Serializer):
         if not user.is_active:
             raise serializers.ValidationError("User account is inactive.")
 
-        token = issue_auth_token(user)
-        farmer = Farmer.objects.filter(email__iexact=user.email).first()
+        farmer = Farmer.objects.filter(user=user).first()
+        token = issue_auth_token(user, farmer=farmer)
         role = "admin" if (user.is_staff or user.is_superuser) else "farmer"
 
         attrs["payload"] = {
@@ -59,7 +61,8 @@ class FarmerRegistrationSerializer(serializers.Serializer):
         return value
 
     def validate_email(self, value):
-        if User.objects.filter(email__iexact=value).exists() or Farmer.objects.filter(email__iexact=value).exists():
+        farmers = Farmer.objects.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(value)))
+        if User.objects.filter(email__iexact=value).exists() or farmers.exists():
             raise serializers.ValidationError("This email is already registered.")
         return value
 
@@ -95,6 +98,7 @@ class FarmerRegistrationSerializer(serializers.Serializer):
         )
 
         farmer = Farmer.objects.create(
+            user=user,
             first_name=first_name,
             last_name=last_name,
             email=validated_data["email"],
@@ -110,7 +114,7 @@ class FarmerRegistrationSerializer(serializers.Serializer):
             contact_method="WhatsApp",
         )
 
-        token = issue_auth_token(user)
+        token = issue_auth_token(user, farmer=farmer)
         return {
             "token": token,
             "user_id": user.id,
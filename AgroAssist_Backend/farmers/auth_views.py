@@ -39,11 +39,11 @@ class MeView(APIView):
 
     def get(self, request):
         user = request.user
-        farmer = Farmer.objects.filter(email__iexact=user.email).first()
+        farmer = Farmer.objects.filter(user_id=user.id).first()
         role = "admin" if (user.is_staff or user.is_superuser) else "farmer"
 
         payload = {
-            "token": issue_auth_token(user),
+            "token": issue_auth_token(user, farmer=farmer),
             "id": user.id,
             "user_id": user.id,
             "username": user.username,
@@ -0,0 +1,575 @@
+import codecs
+import csv
+import hashlib
+import time
+from collections import ChainMap, deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from AgroAssist_Backend.crops.catalog import bump_catalog_version
+from AgroAssist_Backend.crops.documents import invalidate_crop_documents
+from AgroAssist_Backend.crops.models import Crop
+from AgroAssist_Backend.tasks.generation import care_templates_by_crop, generate_care_tasks
+from AgroAssist_Backend.tasks.models import FarmerTask
+
+from .csv_validation import REQUIRED_FIELDS, SECTIONS, validate_rows
+from .documents import invalidate_farmer_documents
+from .models import Farmer, FarmerCrop, ImportCheckpoint
+from .stateless_token_auth import invalidate_cached_user
+
+# Row errors listed in a bulk import result (all of them are counted as skipped).
+MAX_REPORTED_ERRORS = 100
+
+_CROP_FIELDS = [
+    'description', 'soil_type', 'growth_duration_days', 'optimal_temperature', 'optimal_humidity',
+    'optimal_soil_moisture', 'water_required_mm_per_week', 'fertilizer_required', 'expected_yield_per_hectare',
+]
+_FARMER_FIELDS = [
+    'first_name', 'last_name', 'phone_number', 'address', 'city', 'state', 'postal_code', 'preferred_language',
+    'land_area_hectares', 'soil_type', 'experience_level', 'farming_notes', 'contact_method',
+]
+_TASK_FIELDS = [
+    'task_description', 'status', 'completed_date', 'priority', 'importance', 'is_completed', 'farmer_notes',
+]
+# The fields an import writes per section, in fingerprint order.
+FINGERPRINT_FIELDS = {'crops': _CROP_FIELDS, 'farmers': _FARMER_FIELDS, 'tasks': _TASK_FIELDS}
+
+
+def row_fingerprint(values):
+    """
+    16-byte digest of a row's field values in FINGERPRINT_FIELDS order,
+    alike for a cleaned CSV row and the stored row when writing it would
+    change nothing (decimals compare as floats).
+    """
+    normalized = tuple(float(value) if isinstance(value, Decimal) else value for value in values)
+    return hashlib.blake2b(repr(normalized).encode(), digest_size=16).digest()
+
+
+class CSVRows:
+    """
+    Iterator of (row number, cleaned row) over the non-blank data rows of a
+    CSV file (the header is row 1), read incrementally from a binary file
+    so `offset` is always the byte offset just past the last row returned.
+
+    The file and its header are checked up front: ValueError if the file,
+    the header row or a required column is missing. Pass an offset and
+    last_row saved from an earlier read to continue from there; offsets
+    need an ASCII-compatible encoding (UTF-8, Latin-1, ...).
+    """
+
+    def __init__(self, file_path, delimiter=',', encoding='utf-8', required_fields=(), offset=0, last_row=1):
+        path = Path(file_path)
+        if not path.exists():
+            raise ValueError(f'File not found: {path}')
+
+        self.offset = 0
+        self.last_row = last_row
+        self._file = path.open('rb')
+        try:
+            try:
+                self._decode = codecs.getincrementaldecoder(encoding)().decode
+            except LookupError:
+                raise ValueError(f'Unknown encoding: {encoding}')
+            # csv.reader pulls exactly the lines of one record per row, so the offset never runs ahead.
+            self._reader = csv.reader(self._lines(), delimiter=delimiter)
+            header = next(self._reader, None)
+            if not header:
+                raise ValueError(f'CSV has no header row: {path}')
+            self.fieldnames = [name.strip() for name in header]
+            missing = [field for field in required_fields if field not in self.fieldnames]
+            if missing:
+                raise ValueError(f"{path.name} is missing required columns: {', '.join(missing)}")
+            if offset > self.offset:
+                self._file.seek(offset)
+                self.offset = offset
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _lines(self):
+        while True:
+            line = self._file.readline()
+            if not line:
+                return
+            self.offset += len(line)
+            yield self._decode(line)
+
+    def __iter__(self):
+        with self._file:
+            for values in self._reader:
+                if not values:
+                    # Blank line: not a row (as with csv.DictReader).
+                    continue
+                self.last_row += 1
+                cleaned = {name: value.strip() for name, value in zip(self.fieldnames, values) if name}
+                if any(cleaned.values()):
+                    yield self.last_row, cleaned
+
+
+def file_digest(file_path):
+    """Hex SHA-256 of a file's contents."""
+    with open(file_path, 'rb') as digest_file:
+        return hashlib.file_digest(digest_file, 'sha256').hexdigest()
+
+
+class CropWriter:
+    """
+    Writes cleaned crop rows: (name, season) decides between bulk_create
+    and bulk_update (crops have no unique key to upsert on). Every crop key
+    and row fingerprint is loaded once; the catalog is small. Rows that
+    match the stored crop are not written.
+    """
+
+    def __init__(self):
+        # {(name, season): (pk, fingerprint)}
+        self.crops = {}
+        # update_or_create would pick among duplicate crops too; keep the newest.
+        stored = Crop.objects.order_by('-created_at', '-pk').values_list('pk', 'name', 'season', *_CROP_FIELDS)
+        for pk, name, season, *values in stored:
+            self.crops.setdefault((name, season), (pk, row_fingerprint(values)))
+
+    def write(self, records):
+        """
+        Save (row number, fields) records in one transaction. Returns
+        (created, updated, unchanged, row errors).
+        """
+        new_crops = {}
+        changed_crops = {}
+        fingerprints = {}
+        created = updated = unchanged = 0
+        now = timezone.now()
+        for _, fields in records:
+            key = (fields['name'], fields['season'])
+            fingerprint = row_fingerprint(fields[name] for name in _CROP_FIELDS)
+            stored = self.crops.get(key)
+            # An earlier row of this chunk counts as stored.
+            if fingerprints.get(key, stored and stored[1]) == fingerprint:
+                unchanged += 1
+                continue
+            created += stored is None and key not in new_crops
+            updated += stored is not None or key in new_crops
+            crop = Crop(**fields)
+            if stored is None:
+                new_crops[key] = crop
+            else:
+                crop.pk = stored[0]
+                crop.updated_at = now
+                changed_crops[key] = crop
+            fingerprints[key] = fingerprint
+
+        if new_crops or changed_crops:
+            with transaction.atomic():
+                Crop.objects.bulk_create(new_crops.values(), batch_size=1000)
+                Crop.objects.bulk_update(changed_crops.values(), _CROP_FIELDS + ['updated_at'], batch_size=1000)
+                # What the Crop post_save signals would have done.
+                changed_ids = [crop.pk for crop in changed_crops.values()]
+                if changed_ids:
+                    invalidate_crop_documents(changed_ids)
+                    invalidate_farmer_documents(FarmerCrop.objects.filter(crop_id__in=changed_ids).values('farmer_id'))
+                bump_catalog_version()
+        for key, fingerprint in fingerprints.items():
+            crop = new_crops.get(key) or changed_crops[key]
+            self.crops[key] = (crop.pk, fingerprint)
+        return created, updated, unchanged, []
+
+
+class FarmerWriter:
+    """
+    Upserts cleaned farmer rows on email, one executemany of a single
+    INSERT ... ON CONFLICT statement per chunk. Stored emails, phone owners,
+    row fingerprints and not yet linked logins are loaded once, so the
+    phone_number check, skipping unchanged rows and the login link cost no
+    query per row.
+    """
+
+    def __init__(self):
+        # bulk_create(update_conflicts=True) spends ~90% of a farmer import preparing each value; the
+        # cleaned values are plain str/int/float already, so the same statement runs with them directly.
+        columns = [
+            Farmer._meta.get_field(name).column for name in ['email'] + _FARMER_FIELDS + ['created_at', 'updated_at']
+        ]
+        quote_name = connection.ops.quote_name
+        self.upsert_sql = 'INSERT INTO {} ({}) VALUES ({}) {}'.format(
+            quote_name(Farmer._meta.db_table),
+            ', '.join(map(quote_name, columns)),
+            ', '.join(['%s'] * len(columns)),
+            connection.ops.on_conflict_suffix_sql(
+                None, OnConflict.UPDATE, columns[1:-2] + columns[-1:], [Farmer._meta.get_field('email').column],
+            ),
+        )
+        # {lowercased email: (stored email, phone_number, fingerprint)} and {phone_number: lowercased email}
+        self.farmers = {}
+        self.phone_owners = {}
+        phone_index = _FARMER_FIELDS.index('phone_number')
+        stored = Farmer.objects.order_by().values_list('email', *_FARMER_FIELDS)
+        for email, *values in stored.iterator(chunk_size=10000):
+            self.farmers[email.lower()] = (email, values[phone_index], row_fingerprint(values))
+            self.phone_owners[values[phone_index]] = email.lower()
+        # {lowercased email: user id} of logins without a farmer profile (first one per email).
+        self.unlinked_users = {}
+        users = get_user_model().objects.filter(farmer_profile__isnull=True).exclude(email='')
+        for email, user_id in users.annotate(email_key=Lower('email')).order_by('-id').values_list('email_key', 'id'):
+            self.unlinked_users[email] = user_id
+
+    def write(self, records):
+        """
+        Save (row number, fields) records in one transaction. Returns
+        (created, updated, unchanged, row errors).
+        """
+        # Changes on top of the loaded state; applied once the transaction commits.
+        farmers = ChainMap({}, self.farmers)
+        phone_owners = ChainMap({}, self.phone_owners)
+        rows = {}
+        errors = []
+        created = updated = unchanged = 0
+        for row_number, fields in records:
+            key = fields['email']
+            values = [fields[name] for name in _FARMER_FIELDS]
+            fingerprint = row_fingerprint(values)
+            stored = farmers.get(key)
+            if stored is not None and stored[2] == fingerprint:
+                unchanged += 1
+                continue
+            phone_number = fields['phone_number']
+            owner = phone_owners.get(phone_number)
+            if owner is not None and owner != key:
+                errors.append((row_number, f"phone_number '{phone_number}' already belongs to {farmers[owner][0]}."))
+                continue
+
+            if stored is None:
+                created += 1
+                email = key
+            else:
+                updated += 1
+                # Keep the stored spelling so the upsert hits the existing row.
+                email, old_phone, _ = stored
+                if old_phone != phone_number:
+                    phone_owners[old_phone] = None
+            phone_owners[phone_number] = key
+            farmers[key] = (email, phone_number, fingerprint)
+            # A repeated email within a chunk keeps the last row (one upsert may not touch a row twice).
+            rows[key] = [email] + values
+
+        if rows:
+            now = connection.ops.adapt_datetimefield_value(timezone.now())
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.executemany(self.upsert_sql, [values + [now, now] for values in rows.values()])
+                linked = self._link_users(farmers.maps[0])
+                # What the Farmer post_save signal would have done (new farmers have no document yet).
+                stored_emails = [self.farmers[key][0] for key in rows if key in self.farmers]
+                if stored_emails:
+                    invalidate_farmer_documents(Farmer.objects.filter(email__in=stored_emails).values('pk'))
+            self.farmers.update(farmers.maps[0])
+            for phone_number, owner in phone_owners.maps[0].items():
+                if owner is None:
+                    self.phone_owners.pop(phone_number, None)
+                else:
+                    self.phone_owners[phone_number] = owner
+            for key in linked:
+                invalidate_cached_user(self.unlinked_users.pop(key))
+        return created, updated, unchanged, errors
+
+    def _link_users(self, farmers):
+        # The pre_save link to an existing login by email, for the written farmers that match one.
+        linked = []
+        for key, (email, *_) in farmers.items():
+            user_id = self.unlinked_users.get(key)
+            if user_id and Farmer.objects.filter(email=email, user__isnull=True).update(user_id=user_id):
+                linked.append(key)
+        return linked
+
+
+class TaskWriter:
+    """
+    Writes cleaned task rows. Farmers by email and crops by name (and
+    season) are loaded once; per chunk, one query finds the plantings,
+    one bulk_create adds the missing ones (with their care tasks, like the
+    FarmerCrop post_save signal), one query finds the existing tasks with
+    their fingerprints and bulk_create/bulk_update write the rows that are
+    new or changed.
+    """
+
+    def __init__(self):
+        self.farmer_ids = {}
+        for pk, email in Farmer.objects.order_by().values_list('pk', 'email').iterator(chunk_size=10000):
+            self.farmer_ids[email.lower()] = pk
+        # Like Crop.objects.filter(...).first(): the newest crop of that name (and season).
+        self.crop_ids = {}
+        self.crop_ids_by_name = {}
+        for pk, name, season in Crop.objects.order_by('-created_at', '-pk').values_list('pk', 'name', 'season'):
+            self.crop_ids.setdefault((name, season), pk)
+            self.crop_ids_by_name.setdefault(name, pk)
+        self.templates = care_templates_by_crop()
+
+    def write(self, records):
+        """
+        Save (row number, fields) records in one transaction. Returns
+        (created, updated, unchanged, row errors).
+        """
+        errors = []
+        resolved = []
+        for row_number, fields in records:
+            farmer_id = self.farmer_ids.get(fields['farmer_email'])
+            if farmer_id is None:
+                errors.append((row_number, f"farmer '{fields['farmer_email']}' not found. Import farmers first."))
+                continue
+            crop_name, crop_season = fields['crop_name'], fields['crop_season']
+            if crop_season:
+                crop_id = self.crop_ids.get((crop_name, crop_season))
+                if crop_id is None:
+                    errors.append((row_number, f"crop '{crop_name}' with season '{crop_season}' not found."))
+                    continue
+            else:
+                crop_id = self.crop_ids_by_name.get(crop_name)
+                if crop_id is None:
+                    errors.append((row_number, f"crop '{crop_name}' not found. Import crops first."))
+                    continue
+            resolved.append((farmer_id, crop_id, fields))
+        if not resolved:
+            return 0, 0, 0, errors
+
+        created = updated = unchanged = 0
+        now = timezone.now()
+        with transaction.atomic():
+            plantings = self._plantings(resolved)
+
+            tasks = FarmerTask.objects.filter(
+                farmer_crop__in={fc.pk for fc in plantings.values()},
+                due_date__in={fields['task']['due_date'] for _, _, fields in resolved},
+            ).order_by('pk').values_list('farmer_id', 'farmer_crop_id', 'task_name', 'due_date', 'pk', *_TASK_FIELDS)
+            # {(farmer_id, farmer_crop_id, task_name, due_date): (pk, fingerprint)}
+            existing = {}
+            for farmer_id, farmer_crop_id, task_name, due_date, pk, *values in tasks:
+                key = (farmer_id, farmer_crop_id, task_name, due_date)
+                if key not in existing:
+                    existing[key] = (pk, row_fingerprint(values))
+
+            new_tasks = {}
+            changed_tasks = {}
+            fingerprints = {}
+            for farmer_id, crop_id, fields in resolved:
+                farmer_crop = plantings[farmer_id, crop_id, fields['farmer_crop']['planting_date']]
+                key = (farmer_id, farmer_crop.pk, fields['task']['task_name'], fields['task']['due_date'])
+                fingerprint = row_fingerprint(fields['task'][name] for name in _TASK_FIELDS)
+                stored = existing.get(key)
+                # An earlier row of this chunk counts as stored.
+                if fingerprints.get(key, stored and stored[1]) == fingerprint:
+                    unchanged += 1
+                    continue
+                created += stored is None and key not in new_tasks
+                updated += stored is not None or key in new_tasks
+                task = FarmerTask(farmer_id=farmer_id, farmer_crop_id=farmer_crop.pk, **fields['task'])
+                if stored is None:
+                    new_tasks[key] = task
+                else:
+                    task.pk = stored[0]
+                    task.updated_at = now
+                    changed_tasks[key] = task
+                fingerprints[key] = fingerprint
+            FarmerTask.objects.bulk_create(new_tasks.values(), batch_size=1000)
+            FarmerTask.objects.bulk_update(changed_tasks.values(), _TASK_FIELDS + ['updated_at'], batch_size=1000)
+        return created, updated, unchanged, errors
+
+    def _plantings(self, resolved):
+        # {(farmer_id, crop_id, planting_date): FarmerCrop}, creating the missing ones (first row's values win).
+        wanted = {}
+        for farmer_id, crop_id, fields in resolved:
+            wanted.setdefault((farmer_id, crop_id, fields['farmer_crop']['planting_date']), fields['farmer_crop'])
+        plantings = {}
+        for farmer_crop in FarmerCrop.objects.filter(
+            farmer__in={key[0] for key in wanted},
+            crop__in={key[1] for key in wanted},
+            planting_date__in={key[2] for key in wanted},
+        ).order_by().only('id', 'farmer_id', 'crop_id', 'planting_date'):
+            key = (farmer_crop.farmer_id, farmer_crop.crop_id, farmer_crop.planting_date)
+            if key in wanted:
+                plantings[key] = farmer_crop
+
+        new_plantings = [
+            FarmerCrop(farmer_id=key[0], crop_id=key[1], **fields)
+            for key, fields in wanted.items() if key not in plantings
+        ]
+        if new_plantings:
+            FarmerCrop.objects.bulk_create(new_plantings, batch_size=1000)
+            # What the FarmerCrop post_save signals would have done.
+            generate_care_tasks(new_plantings, templates=self.templates)
+            invalidate_farmer_documents({farmer_crop.farmer_id for farmer_crop in new_plantings})
+            for farmer_crop in new_plantings:
+                plantings[farmer_crop.farmer_id, farmer_crop.crop_id, farmer_crop.planting_date] = farmer_crop
+        return plantings
+
+
+_WRITERS = {'crops': CropWriter, 'farmers': FarmerWriter, 'tasks': TaskWriter}
+
+
+def _read_chunks(rows, chunk_size, seconds):
+    # (rows, offset, last_row) per chunk_size rows read; parsing time is added to seconds['read'].
+    rows_iter = iter(rows)
+    while True:
+        started = time.perf_counter()
+        chunk = list(islice(rows_iter, chunk_size))
+        seconds['read'] += time.perf_counter() - started
+        if not chunk:
+            return
+        yield chunk, rows.offset, rows.last_row
+
+
+def bulk_import(section, file_path, delimiter=',', encoding='utf-8', chunk_size=2000, progress=None,
+                resume=False, force=False, workers=1, row_errors=None):
+    """
+    Stream one CSV file ('crops', 'farmers' or 'tasks' section) into the
+    database in chunks of chunk_size rows, one transaction per chunk, with
+    a bounded memory footprint besides the lookups the writer loads once.
+    Bulk writes skip model signals; the writers do their work (catalog
+    version, document invalidation, login links, care tasks).
+
+    The import is a pipeline: this process parses chunks, validation
+    (csv_validation.validate_rows) runs inline or, with workers > 1, in a
+    process pool with a few chunks per worker in flight, and the single
+    writer consumes the validated chunks in file order.
+
+    Every chunk commits together with the file's ImportCheckpoint (keyed
+    by section and content hash): byte offset, last row and counters.
+    resume=True continues a stopped import from its checkpoint; a file
+    already imported completely is not read again unless force=True.
+
+    A chunk that hits a conflict (a row changed by someone else meanwhile)
+    is retried row by row, so one bad row skips only itself. A row whose
+    fingerprint (row_fingerprint) matches the stored row is counted as
+    unchanged and not written, so re-importing a file costs no writes for
+    the rows it did not change. Returns {'status', 'resumed_rows', 'rows',
+    'created', 'updated', 'unchanged', 'skipped', 'errors', 'byte_offset',
+    'seconds'}: status is 'imported', 'resumed' or 'unchanged' (the whole
+    file was imported before), the counters include the rows of earlier
+    runs (resumed_rows of them), errors are the first MAX_REPORTED_ERRORS
+    messages, byte_offset is how far the file has been read and seconds
+    the time spent per stage ('read', 'validate' summed over workers,
+    'write'). progress(section, result) is called after every chunk;
+    row_errors(section, [(row number, message)]) gets every skipped row of
+    a chunk, in the chunk's transaction.
+    ValueError for an unknown section or an unreadable file.
+    """
+    if section not in _WRITERS:
+        raise ValueError(f"section must be one of: {', '.join(SECTIONS)}")
+    if not Path(file_path).exists():
+        raise ValueError(f'File not found: {file_path}')
+
+    seconds = {'read': 0.0, 'validate': 0.0, 'write': 0.0}
+    digest = file_digest(file_path)
+    checkpoint = ImportCheckpoint.objects.filter(section=section, file_hash=digest).first()
+    if checkpoint and checkpoint.completed_at and not force:
+        return dict(
+            status='unchanged', resumed_rows=checkpoint.rows, byte_offset=checkpoint.byte_offset, seconds=seconds,
+            **_counters(checkpoint),
+        )
+    if checkpoint and resume and not checkpoint.completed_at:
+        status = 'resumed'
+    else:
+        status = 'imported'
+        checkpoint = checkpoint or ImportCheckpoint(section=section, file_hash=digest)
+        checkpoint.byte_offset, checkpoint.last_row = 0, 1
+        checkpoint.rows = checkpoint.created = checkpoint.updated = checkpoint.unchanged = checkpoint.skipped = 0
+        checkpoint.errors = []
+    rows = CSVRows(
+        file_path, delimiter, encoding, REQUIRED_FIELDS[section], checkpoint.byte_offset, checkpoint.last_row,
+    )
+    checkpoint.file_name = Path(file_path).name[:255]
+    checkpoint.completed_at = None
+    checkpoint.save()
+
+    writer = _WRITERS[section]()
+    today = timezone.localdate()
+    result = dict(
+        status=status, resumed_rows=checkpoint.rows, byte_offset=checkpoint.byte_offset, seconds=seconds,
+        **_counters(checkpoint),
+    )
+    # The skipped rows of the chunk being committed, for row_errors.
+    chunk_errors = []
+
+    def reject(row_number, message):
+        result['skipped'] += 1
+        if len(result['errors']) < MAX_REPORTED_ERRORS:
+            result['errors'].append(f'{section} row {row_number}: {message}')
+        if row_errors:
+            chunk_errors.append((row_number, str(message)))
+
+    def write(records):
+        try:
+            created, updated, unchanged, errors = writer.write(records)
+        except IntegrityError as exc:
+            if len(records) == 1:
+                reject(records[0][0], exc)
+                return
+            for record in records:
+                write([record])
+            return
+        result['created'] += created
+        result['updated'] += updated
+        result['unchanged'] += unchanged
+        for row_number, message in errors:
+            reject(row_number, message)
+
+    def commit(validated, offset, last_row, size, completed=False):
+        records, rejects, validate_seconds = validated
+        seconds['validate'] += validate_seconds
+        result['rows'] += size
+        result['byte_offset'] = offset
+        chunk_errors.clear()
+        for row_number, message in rejects:
+            reject(row_number, message)
+        started = time.perf_counter()
+        # The chunk and the checkpoint that skips it on resume commit together.
+        with transaction.atomic():
+            if records:
+                write(records)
+            if chunk_errors:
+                row_errors(section, chunk_errors)
+            checkpoint.byte_offset, checkpoint.last_row = offset, last_row
+            for counter in ('rows', 'created', 'updated', 'unchanged', 'skipped', 'errors'):
+                setattr(checkpoint, counter, result[counter])
+            checkpoint.completed_at = timezone.now() if completed else None
+            checkpoint.save()
+        seconds['write'] += time.perf_counter() - started
+        if progress:
+            progress(section, result)
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = deque()
+    try:
+        for chunk, offset, last_row in _read_chunks(rows, chunk_size, seconds):
+            if pool is None:
+                commit(validate_rows(section, chunk, today), offset, last_row, len(chunk))
+                continue
+            pending.append((pool.submit(validate_rows, section, chunk, today), offset, last_row, len(chunk)))
+            # Read ahead at most two chunks per worker; memory stays bounded when writes are the bottleneck.
+            while len(pending) > 2 * workers:
+                future, *position = pending.popleft()
+                commit(future.result(), *position)
+        while pending:
+            future, *position = pending.popleft()
+            commit(future.result(), *position)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    commit(([], [], 0.0), rows.offset, rows.last_row, 0, completed=True)
+    return result
+
+
+def _counters(checkpoint):
+    return {
+        'rows': checkpoint.rows,
+        'created': checkpoint.created,
+        'updated': checkpoint.updated,
+        'unchanged': checkpoint.unchanged,
+        'skipped': checkpoint.skipped,
+        'errors': list(checkpoint.errors),
+    }
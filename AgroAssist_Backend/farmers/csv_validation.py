@@ -0,0 +1,216 @@
+import time
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+# Row validation for import_csv_data. No database or model access here: process pool workers
+# import this module without setting Django up.
+CROP_SEASONS = {'Kharif', 'Rabi', 'Summer'}
+SOIL_TYPES = {'Clay', 'Sandy', 'Loamy', 'Mixed'}
+FARMER_LANGUAGES = {'English', 'Hindi', 'Marathi'}
+FARMER_EXPERIENCE = {'Beginner', 'Intermediate', 'Expert'}
+FARMER_CROP_STATUS = {'Planned', 'Growing', 'Harvested', 'Completed'}
+TASK_STATUS = {'Pending', 'In Progress', 'Completed', 'Overdue', 'Cancelled'}
+TASK_IMPORTANCE = {'Low', 'Medium', 'High', 'Critical'}
+
+SECTIONS = ('crops', 'farmers', 'tasks')
+REQUIRED_FIELDS = {
+    'crops': [
+        'name', 'season', 'soil_type', 'growth_duration_days', 'optimal_temperature', 'optimal_humidity',
+        'optimal_soil_moisture',
+    ],
+    'farmers': [
+        'email', 'first_name', 'last_name', 'phone_number', 'address', 'city', 'state', 'postal_code',
+        'land_area_hectares', 'soil_type', 'experience_level',
+    ],
+    'tasks': ['farmer_email', 'crop_name', 'task_name', 'due_date'],
+}
+
+
+def _required(row, field_name, row_number, section):
+    value = (row.get(field_name) or '').strip()
+    if not value:
+        raise ValueError(f'{section}.{field_name} is required (row {row_number}).')
+    return value
+
+
+def _choice(value, allowed_values, field_name, row_number, section):
+    if value is None:
+        raise ValueError(f'{section}.{field_name} is required (row {row_number}).')
+
+    normalized = value.strip().lower()
+    for option in allowed_values:
+        if option.lower() == normalized:
+            return option
+
+    allowed = ', '.join(sorted(allowed_values))
+    raise ValueError(f"{section}.{field_name}='{value}' is invalid (row {row_number}). Allowed: {allowed}")
+
+
+def _to_int(value, field_name, row_number, section):
+    try:
+        return int(str(value).strip())
+    except Exception as exc:
+        raise ValueError(f'{section}.{field_name} must be an integer (row {row_number}).') from exc
+
+
+def _to_int_optional(value, default=None):
+    if value is None or str(value).strip() == '':
+        return default
+    return int(str(value).strip())
+
+
+def _to_float(value, field_name, row_number, section):
+    try:
+        return float(str(value).strip())
+    except Exception as exc:
+        raise ValueError(f'{section}.{field_name} must be a number (row {row_number}).') from exc
+
+
+def _to_float_optional(value, default=None):
+    if value is None or str(value).strip() == '':
+        return default
+    return float(str(value).strip())
+
+
+def _to_bool_optional(value, default=False):
+    if value is None or str(value).strip() == '':
+        return default
+
+    lowered = str(value).strip().lower()
+    if lowered in {'1', 'true', 'yes', 'y'}:
+        return True
+    if lowered in {'0', 'false', 'no', 'n'}:
+        return False
+    raise ValueError(f"Invalid boolean value '{value}'. Use true/false, yes/no, or 1/0.")
+
+
+def _to_date(value, field_name, row_number, section):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except Exception as exc:
+        raise ValueError(f'{section}.{field_name} must be YYYY-MM-DD (row {row_number}).') from exc
+
+
+def clean_crop(row, row_number, today=None):
+    """Crop field values of a crops CSV row; ValueError names the first bad column."""
+    return {
+        'name': _required(row, 'name', row_number, 'crops'),
+        'season': _choice(row.get('season'), CROP_SEASONS, 'season', row_number, 'crops'),
+        'description': row.get('description', ''),
+        'soil_type': _choice(row.get('soil_type'), SOIL_TYPES, 'soil_type', row_number, 'crops'),
+        'growth_duration_days': _to_int(row.get('growth_duration_days'), 'growth_duration_days', row_number, 'crops'),
+        'optimal_temperature': _to_float(row.get('optimal_temperature'), 'optimal_temperature', row_number, 'crops'),
+        'optimal_humidity': _to_float(row.get('optimal_humidity'), 'optimal_humidity', row_number, 'crops'),
+        'optimal_soil_moisture': _to_float(
+            row.get('optimal_soil_moisture'), 'optimal_soil_moisture', row_number, 'crops',
+        ),
+        'water_required_mm_per_week': _to_float_optional(row.get('water_required_mm_per_week'), default=25.0),
+        'fertilizer_required': row.get('fertilizer_required') or 'NPK',
+        'expected_yield_per_hectare': _to_float_optional(row.get('expected_yield_per_hectare'), default=0.0),
+    }
+
+
+def clean_farmer(row, row_number, today=None):
+    """Farmer field values of a farmers CSV row, email lowercased."""
+    return {
+        'email': _required(row, 'email', row_number, 'farmers').lower(),
+        'first_name': _required(row, 'first_name', row_number, 'farmers'),
+        'last_name': _required(row, 'last_name', row_number, 'farmers'),
+        'phone_number': _required(row, 'phone_number', row_number, 'farmers'),
+        'address': _required(row, 'address', row_number, 'farmers'),
+        'city': _required(row, 'city', row_number, 'farmers'),
+        'state': _required(row, 'state', row_number, 'farmers'),
+        'postal_code': _to_int(row.get('postal_code'), 'postal_code', row_number, 'farmers'),
+        'preferred_language': _choice(
+            row.get('preferred_language') or 'English', FARMER_LANGUAGES, 'preferred_language', row_number, 'farmers',
+        ),
+        'land_area_hectares': _to_float(row.get('land_area_hectares'), 'land_area_hectares', row_number, 'farmers'),
+        'soil_type': _choice(row.get('soil_type'), SOIL_TYPES, 'soil_type', row_number, 'farmers'),
+        'experience_level': _choice(
+            row.get('experience_level'), FARMER_EXPERIENCE, 'experience_level', row_number, 'farmers',
+        ),
+        'farming_notes': row.get('farming_notes', ''),
+        'contact_method': row.get('contact_method') or 'WhatsApp',
+    }
+
+
+def clean_task(row, row_number, today=None):
+    """
+    A tasks CSV row as {'farmer_email', 'crop_name', 'crop_season',
+    'farmer_crop': FarmerCrop fields, 'task': FarmerTask fields}. The
+    planting date defaults to 15 days before today.
+    """
+    farmer_email = _required(row, 'farmer_email', row_number, 'tasks').lower()
+    crop_name = _required(row, 'crop_name', row_number, 'tasks')
+    task_name = _required(row, 'task_name', row_number, 'tasks')
+    due_date = _to_date(_required(row, 'due_date', row_number, 'tasks'), 'due_date', row_number, 'tasks')
+
+    planting_date = row.get('planting_date', '').strip()
+    if planting_date:
+        planting_date = _to_date(planting_date, 'planting_date', row_number, 'tasks')
+    else:
+        planting_date = (today or timezone.localdate()) - timedelta(days=15)
+    expected_harvest = row.get('expected_harvest_date', '').strip()
+
+    status = _choice(row.get('status', '').strip() or 'Pending', TASK_STATUS, 'status', row_number, 'tasks')
+    is_completed = _to_bool_optional(row.get('is_completed'), default=(status == 'Completed'))
+    completed_date = row.get('completed_date', '').strip()
+    if completed_date:
+        completed_date = _to_date(completed_date, 'completed_date', row_number, 'tasks')
+    elif is_completed or status == 'Completed':
+        completed_date = due_date
+    else:
+        completed_date = None
+
+    return {
+        'farmer_email': farmer_email,
+        'crop_name': crop_name,
+        'crop_season': row.get('crop_season', '').strip(),
+        'farmer_crop': {
+            'planting_date': planting_date,
+            'expected_harvest_date': (
+                _to_date(expected_harvest, 'expected_harvest_date', row_number, 'tasks') if expected_harvest else None
+            ),
+            'status': _choice(
+                row.get('farmer_crop_status', '').strip() or 'Growing', FARMER_CROP_STATUS, 'farmer_crop_status',
+                row_number, 'tasks',
+            ),
+            'area_allocated_hectares': _to_float_optional(row.get('area_allocated_hectares'), default=1.0),
+            'expected_yield_kg': _to_int_optional(row.get('expected_yield_kg')),
+        },
+        'task': {
+            'task_name': task_name,
+            'due_date': due_date,
+            'task_description': row.get('task_description') or 'Task imported from CSV.',
+            'status': status,
+            'completed_date': completed_date,
+            'priority': _to_int_optional(row.get('priority'), default=5),
+            'importance': _choice(
+                row.get('importance', '').strip() or 'Medium', TASK_IMPORTANCE, 'importance', row_number, 'tasks',
+            ),
+            'is_completed': is_completed,
+            'farmer_notes': row.get('farmer_notes', ''),
+        },
+    }
+
+
+CLEANERS = {'crops': clean_crop, 'farmers': clean_farmer, 'tasks': clean_task}
+
+
+def validate_rows(section, rows, today):
+    """
+    Clean (row number, row) pairs of one section. Returns (records, rejects,
+    seconds): (row number, fields) of the valid rows, (row number, message)
+    of the others and the CPU time spent, for per-stage rates.
+    """
+    started = time.perf_counter()
+    clean = CLEANERS[section]
+    records = []
+    rejects = []
+    for row_number, row in rows:
+        try:
+            records.append((row_number, clean(row, row_number, today)))
+        except ValueError as exc:
+            rejects.append((row_number, str(exc)))
+    return records, rejects, time.perf_counter() - started
@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from AgroAssist_Backend.tasks.dispatch import (
+    ChannelPool, ReminderMessage, claim, claimable_reminders, digest_reminders, recipient, record_sends,
+)
+from AgroAssist_Backend.tasks.models import TaskReminder
+from AgroAssist_Backend.tasks.planner import reminder_channel
+from AgroAssist_Backend.weather.models import FarmersWeatherAlert
+
+from .models import Farmer
+
+# Digest wording per Farmer.preferred_language (English is the fallback).
+DIGEST_TEXT = {
+    'English': {
+        'greeting': 'AgroAssist update for {name} ({date})',
+        'tasks': 'Tasks due:',
+        'task': '- {task} (due {due})',
+        'alerts': 'Weather alerts:',
+        'alert': '- {title} [{severity}]',
+    },
+    'Hindi': {
+        'greeting': '{name} के लिए AgroAssist अपडेट ({date})',
+        'tasks': 'आज के काम:',
+        'task': '- {task} (अंतिम तिथि {due})',
+        'alerts': 'मौसम चेतावनी:',
+        'alert': '- {title} [{severity}]',
+    },
+    'Marathi': {
+        'greeting': '{name} साठी AgroAssist अपडेट ({date})',
+        'tasks': 'करायची कामे:',
+        'task': '- {task} (अंतिम तारीख {due})',
+        'alerts': 'हवामान इशारे:',
+        'alert': '- {title} [{severity}]',
+    },
+}
+
+_SEVERITY_RANK = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3}
+
+
+def render_digest(language, name, today, tasks, alerts):
+    """One message listing (task name, due date) pairs and (title, severity) alerts, most severe first."""
+    text = DIGEST_TEXT.get(language, DIGEST_TEXT['English'])
+    lines = [text['greeting'].format(name=name, date=today.isoformat())]
+    if tasks:
+        lines.append(text['tasks'])
+        lines += [text['task'].format(task=task, due=due.isoformat()) for task, due in tasks]
+    if alerts:
+        lines.append(text['alerts'])
+        alerts = sorted(alerts, key=lambda alert: _SEVERITY_RANK.get(alert[1], len(_SEVERITY_RANK)))
+        lines += [text['alert'].format(title=title, severity=severity) for title, severity in alerts]
+    return '\n'.join(lines)
+
+
+def send_daily_digests(today=None, batch_size=1000, channels=None, progress=None):
+    """
+    Send each farmer one message on their contact channel covering the
+    reminders due today and the active, not yet notified weather alerts,
+    instead of one gateway call per row. Reminders from earlier days and
+    retries are dispatch_reminders' (see digest_reminders()).
+
+    Farmers are walked in primary-key ranges of batch_size. Per range: one
+    UPDATE claims today's reminders (so dispatch_reminders skips them), one
+    query reads them and one reads the alerts, both already joined to the
+    farmer and grouped by farmer_id. After sending, one transaction marks
+    every reminder and alert of a delivered digest sent; reminders of a
+    failed digest are retried by dispatch_reminders. Returns
+    {'digests': n, 'reminders': n, 'alerts': n, 'failed': n}.
+    """
+    today = today or timezone.localdate()
+    now = timezone.now()
+    bounds = Farmer.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    totals = {'digests': 0, 'reminders': 0, 'alerts': 0, 'failed': 0}
+    if bounds['first'] is None:
+        return totals
+
+    pool = ChannelPool(settings.REMINDER_CHANNELS if channels is None else channels)
+    try:
+        for low in range(bounds['first'], bounds['last'] + 1, batch_size):
+            high = low + batch_size
+            digests = {}
+
+            token = claim(claimable_reminders(today, now).filter(
+                digest_reminders(today), task__farmer__gte=low, task__farmer__lt=high,
+            ), now)
+            reminders = TaskReminder.objects.filter(claim_token=token).order_by(
+                'task__farmer', 'task__due_date', 'pk',
+            ).values_list(
+                'task__farmer', 'task__farmer__first_name', 'task__farmer__preferred_language',
+                'task__farmer__contact_method', 'task__farmer__email', 'task__farmer__phone_number',
+                'pk', 'task_id', 'task__task_name', 'task__due_date',
+            ) if token else []
+            for *farmer, reminder_id, task_id, task_name, due_date in reminders:
+                digest = digests.setdefault(farmer[0], {'farmer': farmer, 'reminders': [], 'tasks': [], 'alerts': []})
+                digest['reminders'].append((reminder_id, task_id))
+                # A task with reminders on several offsets or channels is listed once.
+                if (task_name, due_date) not in digest['tasks']:
+                    digest['tasks'].append((task_name, due_date))
+
+            alerts = FarmersWeatherAlert.objects.filter(
+                Q(expires_at__isnull=True) | Q(expires_at__gt=now),
+                farmer__gte=low, farmer__lt=high, notified_at__isnull=True, issued_at__lte=now,
+            ).order_by('farmer', 'issued_at').values_list(
+                'farmer', 'farmer__first_name', 'farmer__preferred_language', 'farmer__contact_method',
+                'farmer__email', 'farmer__phone_number', 'pk', 'alert_title', 'severity',
+            )
+            for *farmer, alert_id, title, severity in alerts:
+                digest = digests.setdefault(farmer[0], {'farmer': farmer, 'reminders': [], 'tasks': [], 'alerts': []})
+                digest['alerts'].append((alert_id, title, severity))
+
+            if not digests:
+                continue
+            messages = []
+            for farmer_id, digest in digests.items():
+                _, name, language, contact_method, email, phone_number = digest['farmer']
+                channel = reminder_channel(contact_method)
+                text = render_digest(language, name, today, digest['tasks'],
+                                     [(title, severity) for _, title, severity in digest['alerts']])
+                messages.append(ReminderMessage(farmer_id, channel, recipient(channel, farmer_id, email, phone_number), text))
+            errors = pool.send(messages)
+
+            sent_alert_ids = [
+                alert_id
+                for farmer_id, digest in digests.items() if errors[farmer_id] is None
+                for alert_id, _, _ in digest['alerts']
+            ]
+            # All rows behind a digest are marked together, or none are.
+            with transaction.atomic():
+                totals['reminders'] += record_sends(
+                    (reminder_id, task_id, errors[farmer_id])
+                    for farmer_id, digest in digests.items()
+                    for reminder_id, task_id in digest['reminders']
+                )
+                totals['alerts'] += FarmersWeatherAlert.objects.filter(
+                    pk__in=sent_alert_ids, notified_at__isnull=True,
+                ).update(notified_at=now, updated_at=now)
+            failed = sum(1 for error in errors.values() if error is not None)
+            totals['digests'] += len(digests) - failed
+            totals['failed'] += failed
+            if progress:
+                progress(high - 1, totals)
+    finally:
+        pool.close()
+    return totals
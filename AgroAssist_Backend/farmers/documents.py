@@ -0,0 +1,49 @@
+from django.db.models import F, Prefetch, prefetch_related_objects
+from django.utils import timezone
+
+from .models import FarmerCrop, FarmerDetailDocument
+from .serializers import FarmerDetailSerializer
+
+
+def build_farmer_detail(farmer):
+    prefetch_related_objects(
+        [farmer],
+        Prefetch('farmer_crops', queryset=FarmerCrop.objects.select_related('crop')),
+        'inventory_items',
+    )
+    return FarmerDetailSerializer(farmer).data
+
+
+def farmer_detail_document(farmer):
+    """
+    Return the detail payload for a farmer, rebuilding it only when stale.
+
+    The payload holds day-relative fields (days_until_harvest, is_expired),
+    so a document built on an earlier day is rebuilt too.
+    """
+    try:
+        document = farmer.detail_document
+    except FarmerDetailDocument.DoesNotExist:
+        document = None
+
+    today = timezone.localdate()
+    if document is not None and document.payload is not None and document.built_on == today:
+        return document.payload
+
+    if document is None:
+        # Insert an empty row before building, so a write made while we serialize bumps its version
+        # (invalidating a missing row does nothing, and a stale first payload would stick).
+        FarmerDetailDocument.objects.bulk_create([FarmerDetailDocument(farmer=farmer)], ignore_conflicts=True)
+        # Whoever inserted it, version 0 means nothing changed since the row was created.
+        current = FarmerDetailDocument.objects.filter(farmer=farmer, version=0)
+    else:
+        current = FarmerDetailDocument.objects.filter(pk=document.pk, version=document.version)
+
+    payload = build_farmer_detail(farmer)
+    # Only store it if nothing changed while we were serializing.
+    current.update(payload=payload, built_on=today)
+    return payload
+
+
+def invalidate_farmer_documents(farmer_ids):
+    FarmerDetailDocument.objects.filter(farmer_id__in=farmer_ids).update(payload=None, version=F('version') + 1)
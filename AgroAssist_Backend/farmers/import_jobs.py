@@ -0,0 +1,125 @@
+import shutil
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .csv_import import bulk_import
+from .csv_validation import SECTIONS
+from .models import ImportJob, ImportJobError
+
+# A running job whose worker reported no chunk for this long belongs to a stopped worker and is taken over.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+# Bytes copied per read while an upload is written to disk.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def enqueue_import(stream, section, file_name='', delimiter=',', encoding='utf-8', force=False, requested_by_id=None):
+    """
+    Copy a binary stream (an upload's request body) into a new file in
+    settings.IMPORT_UPLOAD_DIR, UPLOAD_CHUNK_SIZE bytes at a time, and
+    queue an ImportJob for it. ValueError for an unknown section or an
+    empty upload.
+    """
+    if section not in SECTIONS:
+        raise ValueError(f"section must be one of: {', '.join(SECTIONS)}")
+    directory = Path(settings.IMPORT_UPLOAD_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{uuid.uuid4().hex}.csv'
+    try:
+        with path.open('wb') as upload:
+            shutil.copyfileobj(stream, upload, UPLOAD_CHUNK_SIZE)
+        file_size = path.stat().st_size
+        if not file_size:
+            raise ValueError('The uploaded file is empty.')
+        return ImportJob.objects.create(
+            section=section,
+            file_name=file_name[:255],
+            file_path=str(path),
+            file_size=file_size,
+            delimiter=delimiter,
+            encoding=encoding,
+            force=force,
+            requested_by_id=requested_by_id,
+        )
+    except BaseException:
+        # An aborted upload or a job that could not be queued leaves no file behind.
+        path.unlink(missing_ok=True)
+        raise
+
+
+def claim_next_job(now=None):
+    """
+    Mark the oldest queued job (or a running one that reported no chunk
+    for CLAIM_TIMEOUT) running and return it; None when there is none.
+    The UPDATE repeats the claim conditions, so concurrent workers never
+    take the same job.
+    """
+    now = now or timezone.now()
+    claimable = ImportJob.objects.filter(
+        Q(status='queued') | Q(status='running', heartbeat_at__lt=now - CLAIM_TIMEOUT),
+    )
+    for job_id in claimable.order_by('pk').values_list('pk', flat=True)[:10]:
+        claimed = claimable.filter(pk=job_id).update(
+            status='running', attempts=F('attempts') + 1, started_at=now, heartbeat_at=now, updated_at=now,
+        )
+        if claimed:
+            return ImportJob.objects.get(pk=job_id)
+    return None
+
+
+def run_import_job(job, chunk_size=2000, workers=1):
+    """
+    Import a claimed job's file with bulk_import, saving its counters,
+    byte offset and rows/s after every chunk and every skipped row as an
+    ImportJobError. A job taken over from a stopped worker resumes from
+    the file's checkpoint. Ends completed or failed (with the error as
+    message) and removes the uploaded file. Returns the job.
+    """
+    started = time.perf_counter()
+
+    def progress(section, result):
+        rows = result['rows'] - result['resumed_rows']
+        ImportJob.objects.filter(pk=job.pk).update(
+            rows_per_second=rows / max(time.perf_counter() - started, 1e-9),
+            heartbeat_at=timezone.now(),
+            updated_at=timezone.now(),
+            **_job_counters(result),
+        )
+
+    def row_errors(section, errors):
+        # A resumed job may reach a row it already reported.
+        ImportJobError.objects.bulk_create(
+            [ImportJobError(job_id=job.pk, row_number=row_number, message=message) for row_number, message in errors],
+            ignore_conflicts=True,
+        )
+
+    try:
+        result = bulk_import(
+            job.section, job.file_path, job.delimiter, job.encoding, chunk_size, progress,
+            resume=job.attempts > 1, force=job.force, workers=workers, row_errors=row_errors,
+        )
+    except Exception as exc:
+        # The counters stay as the last committed chunk saved them.
+        job.status, job.message = 'failed', str(exc) or exc.__class__.__name__
+        update_fields = ['status', 'message', 'finished_at', 'updated_at']
+    else:
+        job.status = 'completed'
+        for name, value in _job_counters(result).items():
+            setattr(job, name, value)
+        job.rows_per_second = (result['rows'] - result['resumed_rows']) / max(time.perf_counter() - started, 1e-9)
+        if result['status'] == 'unchanged':
+            job.message = 'This file was already imported unchanged; upload it with force=true to import it again.'
+        update_fields = ['status', 'message', 'rows_per_second', 'finished_at', 'updated_at', *_job_counters(result)]
+    job.finished_at = timezone.now()
+    job.save(update_fields=update_fields)
+    Path(job.file_path).unlink(missing_ok=True)
+    return job
+
+
+def _job_counters(result):
+    return {name: result[name] for name in ('rows', 'created', 'updated', 'unchanged', 'skipped', 'byte_offset')}
@@ -0,0 +1,21 @@
+from django.urls import path
+
+from .job_views import (
+    FanOutWeatherAlertsJobView,
+    MarkOverdueTasksJobView,
+    PlanRemindersJobView,
+    PrecomputeRecommendationsJobView,
+    SendDailyDigestsJobView,
+)
+
+urlpatterns = [
+    path(
+        "precompute-recommendations/",
+        PrecomputeRecommendationsJobView.as_view(),
+        name="job-precompute-recommendations",
+    ),
+    path("mark-overdue-tasks/", MarkOverdueTasksJobView.as_view(), name="job-mark-overdue-tasks"),
+    path("plan-reminders/", PlanRemindersJobView.as_view(), name="job-plan-reminders"),
+    path("send-daily-digests/", SendDailyDigestsJobView.as_view(), name="job-send-daily-digests"),
+    path("fan-out-weather-alerts/", FanOutWeatherAlertsJobView.as_view(), name="job-fan-out-weather-alerts"),
+]
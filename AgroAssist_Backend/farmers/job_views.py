@@ -0,0 +1,73 @@
+import hmac
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from AgroAssist_Backend.tasks.overdue import mark_overdue_tasks
+from AgroAssist_Backend.tasks.planner import plan_reminders
+from AgroAssist_Backend.weather.fanout import fan_out_forecast_alerts
+
+from .digest import send_daily_digests
+from .recommendations import precompute_recommendations, unranked_farmers
+
+
+class EphemeralDatabase(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "Jobs need a persistent database; this instance writes to a throwaway copy. "
+        "Run the management command where the real database is."
+    )
+    default_code = "ephemeral_database"
+
+
+class CronJobView(APIView):
+    """
+    Base for scheduler-triggered jobs, authorized by the CRON_SECRET bearer
+    token. Refuses to run on an EPHEMERAL_DATABASE (Vercel's per-instance
+    /tmp copy), where the job's writes would be thrown away.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        expected = f"Bearer {settings.CRON_SECRET}"
+        provided = request.headers.get("Authorization", "")
+        if not settings.CRON_SECRET or not hmac.compare_digest(provided.encode(), expected.encode()):
+            raise PermissionDenied("Invalid job token.")
+        if settings.EPHEMERAL_DATABASE:
+            raise EphemeralDatabase()
+
+
+class PrecomputeRecommendationsJobView(CronJobView):
+    def get(self, request):
+        # Serverless functions cannot fork a pool, and one request scores at most a batch of today's unranked farmers.
+        total = precompute_recommendations(workers=1, limit=settings.CRON_RECOMMENDATION_BATCH)
+        remaining = unranked_farmers(timezone.localdate()).count()
+        return Response({"farmers": total, "remaining": remaining}, status=status.HTTP_200_OK)
+
+
+class MarkOverdueTasksJobView(CronJobView):
+    def get(self, request):
+        return Response({"marked_overdue": mark_overdue_tasks()}, status=status.HTTP_200_OK)
+
+
+class PlanRemindersJobView(CronJobView):
+    def get(self, request):
+        return Response({"reminders_created": plan_reminders()}, status=status.HTTP_200_OK)
+
+
+class SendDailyDigestsJobView(CronJobView):
+    def get(self, request):
+        return Response(send_daily_digests(), status=status.HTTP_200_OK)
+
+
+class FanOutWeatherAlertsJobView(CronJobView):
+    def get(self, request):
+        created, suppressed = fan_out_forecast_alerts()
+        return Response({"alerts_created": created, "duplicates_skipped": suppressed}, status=status.HTTP_200_OK)
@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from AgroAssist_Backend.farmers.models import FarmerCrop
+from AgroAssist_Backend.farmers.stateless_token_auth import CachedTokenUser
+from AgroAssist_Backend.fast_lists import FastListMixin, compile_list_plan
+from AgroAssist_Backend.urls import router
+
+
+class Command(BaseCommand):
+    help = "Compare the regular serializer and the .values() fast path for every fast list endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per page to serialize (default: 100)")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per path (default: 20)")
+        parser.add_argument(
+            "--pad",
+            action="store_true",
+            help="Clone existing rows up to --rows inside a transaction that is rolled back afterwards",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        if rows < 1 or repeat < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        user = CachedTokenUser({"id": 0, "is_staff": True, "is_superuser": True, "farmer_id": None})
+        renderer = JSONRenderer()
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            for prefix, viewset, basename in router.registry:
+                if not issubclass(viewset, FastListMixin):
+                    continue
+                model = viewset.queryset.model
+                if options["pad"]:
+                    self._pad(model, rows)
+
+                view = viewset()
+                view.action = "list"
+                view.format_kwarg = None
+                view.kwargs = {}
+                view.request = Request(factory.get(f"/api/{prefix}/"))
+                view.request.user = user
+                queryset = view.filter_queryset(view.get_queryset())[:rows]
+
+                count = queryset.count()
+                if count == 0:
+                    self.stdout.write(self.style.WARNING(f"{prefix}: no rows (use --pad or seed_demo_data)"))
+                    continue
+
+                def regular():
+                    return renderer.render(view.get_serializer(queryset.all(), many=True).data)
+
+                def fast():
+                    plan = compile_list_plan(view.get_serializer())
+                    return renderer.render(plan.represent(queryset.values(*plan.paths)))
+
+                regular_body = regular()
+                fast_body = fast()
+                regular_ms = self._time(regular, repeat)
+                fast_ms = self._time(fast, repeat)
+                identical = "identical" if regular_body == fast_body else "DIFFERENT"
+                style = self.style.SUCCESS if regular_body == fast_body else self.style.ERROR
+                self.stdout.write(style(
+                    f"{prefix}: {count} rows, best of {repeat}: serializer {regular_ms:.2f} ms, fast {fast_ms:.2f} ms, "
+                    f"{regular_ms / fast_ms:.1f}x, JSON {identical}"
+                ))
+
+            # Padding rows are benchmark-only.
+            transaction.set_rollback(True)
+
+    def _time(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _pad(self, model, rows):
+        existing = model.objects.count()
+        template = model.objects.order_by("pk").first()
+        if template is None or existing >= rows:
+            return
+        values = {
+            field.attname: getattr(template, field.attname)
+            for field in model._meta.concrete_fields
+            if not field.primary_key
+        }
+        clones = []
+        for index in range(rows - existing):
+            clone = model(**values)
+            if model is FarmerCrop:
+                # (farmer, crop, planting_date) is unique.
+                clone.planting_date = template.planting_date - timedelta(days=index + 1)
+            clones.append(clone)
+        model.objects.bulk_create(clones, batch_size=500, ignore_conflicts=True)
@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.tasks.dispatch import dispatch_due_reminders, file_channels
+
+
+class Command(BaseCommand):
+    help = "Send due task reminders through the configured channel senders (settings.REMINDER_CHANNELS)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Send reminders due on or before YYYY-MM-DD (default: today)")
+        parser.add_argument("--batch-size", type=int, default=500, help="Reminders claimed per batch (default: 500)")
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches (default: until none are due)")
+        parser.add_argument(
+            "--file",
+            help="Write every channel to this JSON-lines file instead of the configured senders (for benchmarks)",
+        )
+        parser.add_argument("--latency-ms", type=int, default=0, help="Simulated gateway latency per send with --file")
+        parser.add_argument("--watch", type=int, metavar="SECONDS", help="Keep running, polling every SECONDS")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        channels = file_channels(options["file"], options["latency_ms"]) if options["file"] else None
+
+        def progress(totals):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{totals['sent']} sent, {totals['failed']} failed")
+
+        while True:
+            started = time.perf_counter()
+            totals = dispatch_due_reminders(today, options["batch_size"], options["max_batches"], channels, progress)
+            elapsed = time.perf_counter() - started
+            total = totals["sent"] + totals["failed"]
+            self.stdout.write(self.style.SUCCESS(
+                f"Sent {totals['sent']} reminders, {totals['failed']} failed in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-9):.0f} reminders/s)"
+            ))
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
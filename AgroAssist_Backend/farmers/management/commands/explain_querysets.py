@@ -0,0 +1,93 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from AgroAssist_Backend.farmers.models import Farmer
+from AgroAssist_Backend.farmers.stateless_token_auth import CachedTokenUser
+from AgroAssist_Backend.tasks.dispatch import claimable_reminders
+from AgroAssist_Backend.tasks.models import TaskReminder
+from AgroAssist_Backend.urls import router
+
+# "SCAN farmers_farmer" is a full table scan; "SCAN ... USING INDEX" is not.
+FULL_SCAN_RE = re.compile(r"\bSCAN (\w+)(?! USING)(?:\s|$)")
+TEMP_SORT_RE = re.compile(r"USE TEMP B-TREE FOR ORDER BY")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN for every registered API list queryset and the reminder jobs' "
+        "lookups, and report full table scans"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--params",
+            nargs="*",
+            default=[],
+            help="Query parameters applied to every endpoint, e.g. season=Kharif soil_type=Loamy",
+        )
+        parser.add_argument("--farmer-id", type=int, help="Farmer id used for the farmer-scoped plans (default: first farmer)")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every queryset")
+        parser.add_argument("--fail-on-scan", action="store_true", help="Exit with an error when any full scan is found")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("explain_querysets parses SQLite query plans only.")
+
+        params = dict(pair.split("=", 1) for pair in options["params"])
+        farmer_id = options.get("farmer_id") or Farmer.objects.order_by("id").values_list("id", flat=True).first()
+
+        scopes = [("admin", CachedTokenUser({"id": 0, "is_staff": True, "is_superuser": True, "farmer_id": None}))]
+        if farmer_id:
+            scopes.append(("farmer", CachedTokenUser({"id": 0, "is_staff": False, "is_superuser": False, "farmer_id": farmer_id})))
+
+        problems = 0
+        factory = APIRequestFactory()
+        for prefix, viewset, basename in router.registry:
+            for scope, user in scopes:
+                queryset = self._list_queryset(factory, viewset, prefix, user, params)
+                problems += self._report(f"{basename} [{scope}]", queryset, options["verbose_plans"])
+        for label, queryset in self._job_querysets():
+            problems += self._report(label, queryset, options["verbose_plans"])
+
+        self.stdout.write(f"--- {problems} queryset(s) with full scans or temp sorts ---")
+        if problems and options["fail_on_scan"]:
+            raise CommandError("Full table scans found.")
+
+    def _report(self, label, queryset, verbose):
+        # Print one plan's verdict; returns 1 when it has a full scan or temp sort.
+        plan = queryset.explain()
+        scans = FULL_SCAN_RE.findall(plan)
+        sorts = TEMP_SORT_RE.findall(plan)
+
+        if scans or sorts:
+            details = [f"full scan of {table}" for table in scans] + ["temp b-tree sort"] * len(sorts)
+            self.stdout.write(self.style.WARNING(f"{label}: {', '.join(details)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{label}: ok"))
+
+        if verbose or scans:
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+        return 1 if scans or sorts else 0
+
+    def _job_querysets(self):
+        # Lookups dispatch_reminders and send_daily_digests repeat once per batch.
+        now = timezone.now()
+        yield "dispatch: claimable reminders", claimable_reminders(timezone.localdate(), now).order_by("reminder_date", "pk")
+        yield "dispatch: reminders by claim token", TaskReminder.objects.filter(claim_token="0" * 32).order_by()
+
+    def _list_queryset(self, factory, viewset, prefix, user, params):
+        # Build the list queryset exactly as the viewset would, without rendering a page.
+        view = viewset()
+        view.action = "list"
+        view.format_kwarg = None
+        view.kwargs = {}
+        view.args = ()
+        view.request = Request(factory.get(f"/api/{prefix}/", params))
+        view.request.user = user
+        return view.filter_queryset(view.get_queryset())
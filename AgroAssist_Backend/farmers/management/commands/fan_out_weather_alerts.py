@@ -0,0 +1,48 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.weather.fanout import DUPLICATE_WINDOW, fan_out_forecast_alerts
+
+
+class Command(BaseCommand):
+    help = "Create weather alerts for every farmer in locations whose forecast crosses an alert threshold"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="First forecast day as YYYY-MM-DD (default: today)")
+        parser.add_argument("--days", type=int, default=3, help="Forecast days to check (default: 3)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Farmers per batch (default: 5000)")
+        parser.add_argument(
+            "--window-hours",
+            type=int,
+            default=int(DUPLICATE_WINDOW.total_seconds() // 3600),
+            help="Skip farmers alerted with the same alert type this recently (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        for name in ("days", "chunk_size"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+
+        def progress(last_pk, created, suppressed):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"up to farmer {last_pk}: {created} alerts, {suppressed} duplicates skipped")
+
+        started = time.perf_counter()
+        created, suppressed = fan_out_forecast_alerts(
+            start=start,
+            days=options["days"],
+            window=timedelta(hours=options["window_hours"]),
+            chunk_size=options["chunk_size"],
+            progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} alerts, skipped {suppressed} duplicates in {elapsed:.1f}s "
+            f"({created / max(elapsed, 1e-9):.0f} alerts/s)"
+        ))
@@ -0,0 +1,44 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.farmers.models import FarmerCrop
+from AgroAssist_Backend.tasks.generation import generate_all_care_tasks
+
+
+class Command(BaseCommand):
+    help = "Create missing FarmerTasks from crop care templates for every open farmer crop (safe to re-run)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--crop-id", type=int, help="Only farmer crops of this crop")
+        parser.add_argument("--planted-since", help="Only farmer crops planted on or after YYYY-MM-DD")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Farmer crops per transaction (default: 1000)")
+        parser.add_argument(
+            "--reschedule",
+            action="store_true",
+            help="Also move open generated tasks to planting date + recommended DAP (after bulk planting date edits)",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        queryset = FarmerCrop.objects.all()
+        if options["crop_id"]:
+            queryset = queryset.filter(crop_id=options["crop_id"])
+        if options["planted_since"]:
+            try:
+                queryset = queryset.filter(planting_date__gte=date.fromisoformat(options["planted_since"]))
+            except ValueError:
+                raise CommandError("--planted-since must be YYYY-MM-DD.")
+
+        def progress(last_pk, created, rescheduled):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"up to farmer crop {last_pk}: {created} created, {rescheduled} rescheduled")
+
+        started = time.perf_counter()
+        created, rescheduled = generate_all_care_tasks(queryset, options["chunk_size"], options["reschedule"], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} tasks, rescheduled {rescheduled} in {time.perf_counter() - started:.1f}s"
+        ))
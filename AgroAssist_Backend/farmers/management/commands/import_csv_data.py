@@ -1,5 +1,5 @@
-﻿import csv
-from datetime import timedelta
+﻿import time
+from contextlib import nullcontext
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
@@ -7,6 +7,8 @@ from django.db import transaction
 from django.utils import timezone
 
 from AgroAssist_Backend.crops.models import Crop
+from AgroAssist_Backend.farmers.csv_import import FINGERPRINT_FIELDS, CSVRows, bulk_import, row_fingerprint
+from AgroAssist_Backend.farmers.csv_validation import REQUIRED_FIELDS, clean_crop, clean_farmer, clean_task
 from AgroAssist_Backend.farmers.models import Farmer, FarmerCrop
 from AgroAssist_Backend.tasks.models import FarmerTask
 
@@ -14,14 +16,6 @@ from AgroAssist_Backend.tasks.models import FarmerTask
 class Command(BaseCommand):
     help = "Import crops, farmers, and tasks from CSV files with validation and duplicate checks"
 
-    CROP_SEASONS = {"Kharif", "Rabi", "Summer"}
-    SOIL_TYPES = {"Clay", "Sandy", "Loamy", "Mixed"}
-    FARMER_LANGUAGES = {"English", "Hindi", "Marathi"}
-    FARMER_EXPERIENCE = {"Beginner", "Intermediate", "Expert"}
-    FARMER_CROP_STATUS = {"Planned", "Growing", "Harvested", "Completed"}
-    TASK_STATUS = {"Pending", "In Progress", "Completed", "Overdue", "Cancelled"}
-    TASK_IMPORTANCE = {"Low", "Medium", "High", "Critical"}
-
     def add_arguments(self, parser):
         parser.add_argument("--crops", type=str, help="Path to crops CSV")
         parser.add_argument("--farmers", type=str, help="Path to farmers CSV")
@@ -33,6 +27,28 @@ class Command(BaseCommand):
             action="store_true",
             help="Validate and simulate import without saving to database",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Stream large files and write them in chunks, committing each chunk (a failure keeps earlier chunks)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows per chunk with --bulk (default: 2000)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="With --bulk, validate rows in this many worker processes (default: 1, no pool)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="With --bulk, continue a stopped import of the same file after its last committed chunk",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="With --bulk, import a file again even if it was already imported unchanged",
+        )
         parser.add_argument(
             "--write-templates",
             type=str,
@@ -58,16 +74,39 @@ class Command(BaseCommand):
         summary = {
             "crops_created": 0,
             "crops_updated": 0,
+            "crops_unchanged": 0,
             "crops_skipped": 0,
             "farmers_created": 0,
             "farmers_updated": 0,
+            "farmers_unchanged": 0,
             "farmers_skipped": 0,
             "tasks_created": 0,
             "tasks_updated": 0,
+            "tasks_unchanged": 0,
             "tasks_skipped": 0,
             "errors": [],
         }
 
+        if (options["resume"] or options["force"] or options["workers"] != 1) and not options["bulk"]:
+            raise CommandError("--resume, --force and --workers need --bulk.")
+        if options["bulk"]:
+            if options["chunk_size"] < 1:
+                raise CommandError("--chunk-size must be positive.")
+            if options["workers"] < 1:
+                raise CommandError("--workers must be positive.")
+            paths = [
+                (section, path)
+                for section, path in (("crops", crops_path), ("farmers", farmers_path), ("tasks", tasks_path))
+                if path
+            ]
+            # A dry run still needs one outer transaction to roll back; otherwise every chunk commits.
+            with transaction.atomic() if dry_run else nullcontext():
+                self._import_bulk(paths, delimiter, encoding, options, summary)
+                if dry_run:
+                    transaction.set_rollback(True)
+            self._print_summary(summary, dry_run)
+            return
+
         with transaction.atomic():
             if crops_path:
                 self._import_crops(crops_path, delimiter, encoding, summary)
@@ -82,40 +121,16 @@ class Command(BaseCommand):
         self._print_summary(summary, dry_run)
 
     def _import_crops(self, file_path, delimiter, encoding, summary):
-        required_fields = [
-            "name",
-            "season",
-            "soil_type",
-            "growth_duration_days",
-            "optimal_temperature",
-            "optimal_humidity",
-            "optimal_soil_moisture",
-        ]
-        rows = self._read_csv_rows(file_path, delimiter, encoding, required_fields)
+        rows = self._read_csv_rows(file_path, delimiter, encoding, REQUIRED_FIELDS["crops"])
 
         for row_number, row in rows:
             try:
-                name = self._required(row, "name", row_number, "crops")
-                season = self._choice(row.get("season"), self.CROP_SEASONS, "season", row_number, "crops")
-                soil_type = self._choice(row.get("soil_type"), self.SOIL_TYPES, "soil_type", row_number, "crops")
-
-                defaults = {
-                    "description": row.get("description", ""),
-                    "soil_type": soil_type,
-                    "growth_duration_days": self._to_int(row.get("growth_duration_days"), "growth_duration_days", row_number, "crops"),
-                    "optimal_temperature": self._to_float(row.get("optimal_temperature"), "optimal_temperature", row_number, "crops"),
-                    "optimal_humidity": self._to_float(row.get("optimal_humidity"), "optimal_humidity", row_number, "crops"),
-                    "optimal_soil_moisture": self._to_float(row.get("optimal_soil_moisture"), "optimal_soil_moisture", row_number, "crops"),
-                    "water_required_mm_per_week": self._to_float_optional(row.get("water_required_mm_per_week"), default=25.0),
-                    "fertilizer_required": row.get("fertilizer_required") or "NPK",
-                    "expected_yield_per_hectare": self._to_float_optional(row.get("expected_yield_per_hectare"), default=0.0),
-                }
-
-                crop, created = Crop.objects.update_or_create(
-                    name=name,
-                    season=season,
-                    defaults=defaults,
-                )
+                defaults = clean_crop(row, row_number)
+                lookup = {"name": defaults.pop("name"), "season": defaults.pop("season")}
+                if self._unchanged(Crop.objects.filter(**lookup), "crops", defaults):
+                    summary["crops_unchanged"] += 1
+                    continue
+                crop, created = Crop.objects.update_or_create(**lookup, defaults=defaults)
                 if created:
                     summary["crops_created"] += 1
                 else:
@@ -126,25 +141,13 @@ class Command(BaseCommand):
                 summary["errors"].append(f"crops row {row_number}: {exc}")
 
     def _import_farmers(self, file_path, delimiter, encoding, summary):
-        required_fields = [
-            "email",
-            "first_name",
-            "last_name",
-            "phone_number",
-            "address",
-            "city",
-            "state",
-            "postal_code",
-            "land_area_hectares",
-            "soil_type",
-            "experience_level",
-        ]
-        rows = self._read_csv_rows(file_path, delimiter, encoding, required_fields)
+        rows = self._read_csv_rows(file_path, delimiter, encoding, REQUIRED_FIELDS["farmers"])
 
         for row_number, row in rows:
             try:
-                email = self._required(row, "email", row_number, "farmers").lower()
-                phone_number = self._required(row, "phone_number", row_number, "farmers")
+                defaults = clean_farmer(row, row_number)
+                email = defaults.pop("email")
+                phone_number = defaults["phone_number"]
 
                 existing_with_phone = Farmer.objects.filter(phone_number=phone_number).exclude(email=email).first()
                 if existing_with_phone:
@@ -152,40 +155,9 @@ class Command(BaseCommand):
                         f"phone_number '{phone_number}' already belongs to {existing_with_phone.email}."
                     )
 
-                preferred_language = row.get("preferred_language") or "English"
-                experience_level = self._choice(
-                    row.get("experience_level"),
-                    self.FARMER_EXPERIENCE,
-                    "experience_level",
-                    row_number,
-                    "farmers",
-                )
-                soil_type = self._choice(row.get("soil_type"), self.SOIL_TYPES, "soil_type", row_number, "farmers")
-                if preferred_language:
-                    preferred_language = self._choice(
-                        preferred_language,
-                        self.FARMER_LANGUAGES,
-                        "preferred_language",
-                        row_number,
-                        "farmers",
-                    )
-
-                defaults = {
-                    "first_name": self._required(row, "first_name", row_number, "farmers"),
-                    "last_name": self._required(row, "last_name", row_number, "farmers"),
-                    "phone_number": phone_number,
-                    "address": self._required(row, "address", row_number, "farmers"),
-                    "city": self._required(row, "city", row_number, "farmers"),
-                    "state": self._required(row, "state", row_number, "farmers"),
-                    "postal_code": self._to_int(row.get("postal_code"), "postal_code", row_number, "farmers"),
-                    "preferred_language": preferred_language,
-                    "land_area_hectares": self._to_float(row.get("land_area_hectares"), "land_area_hectares", row_number, "farmers"),
-                    "soil_type": soil_type,
-                    "experience_level": experience_level,
-                    "farming_notes": row.get("farming_notes", ""),
-                    "contact_method": row.get("contact_method") or "WhatsApp",
-                }
-
+                if self._unchanged(Farmer.objects.filter(email=email), "farmers", defaults):
+                    summary["farmers_unchanged"] += 1
+                    continue
                 _, created = Farmer.objects.update_or_create(
                     email=email,
                     defaults=defaults,
@@ -200,26 +172,20 @@ class Command(BaseCommand):
                 summary["errors"].append(f"farmers row {row_number}: {exc}")
 
     def _import_tasks(self, file_path, delimiter, encoding, summary):
-        required_fields = [
-            "farmer_email",
-            "crop_name",
-            "task_name",
-            "due_date",
-        ]
-        rows = self._read_csv_rows(file_path, delimiter, encoding, required_fields)
+        rows = self._read_csv_rows(file_path, delimiter, encoding, REQUIRED_FIELDS["tasks"])
+        today = timezone.localdate()
 
         for row_number, row in rows:
             try:
-                farmer_email = self._required(row, "farmer_email", row_number, "tasks").lower()
-                crop_name = self._required(row, "crop_name", row_number, "tasks")
-                task_name = self._required(row, "task_name", row_number, "tasks")
-                due_date = self._to_date(self._required(row, "due_date", row_number, "tasks"), "due_date", row_number, "tasks")
+                fields = clean_task(row, row_number, today)
+                farmer_email = fields["farmer_email"]
+                crop_name = fields["crop_name"]
+                crop_season = fields["crop_season"]
 
                 farmer = Farmer.objects.filter(email=farmer_email).first()
                 if not farmer:
                     raise ValueError(f"farmer '{farmer_email}' not found. Import farmers first.")
 
-                crop_season = row.get("crop_season", "").strip()
                 crop_qs = Crop.objects.filter(name=crop_name)
                 if crop_season:
                     crop_qs = crop_qs.filter(season=crop_season)
@@ -229,68 +195,25 @@ class Command(BaseCommand):
                         raise ValueError(f"crop '{crop_name}' with season '{crop_season}' not found.")
                     raise ValueError(f"crop '{crop_name}' not found. Import crops first.")
 
-                planting_date = row.get("planting_date", "").strip()
-                if planting_date:
-                    planting_date = self._to_date(planting_date, "planting_date", row_number, "tasks")
-                else:
-                    planting_date = timezone.localdate() - timedelta(days=15)
-
-                expected_harvest = row.get("expected_harvest_date", "").strip()
-                expected_harvest_date = (
-                    self._to_date(expected_harvest, "expected_harvest_date", row_number, "tasks") if expected_harvest else None
-                )
-
-                farmer_crop_status = row.get("farmer_crop_status", "").strip() or "Growing"
-                farmer_crop_status = self._choice(
-                    farmer_crop_status,
-                    self.FARMER_CROP_STATUS,
-                    "farmer_crop_status",
-                    row_number,
-                    "tasks",
-                )
-
+                farmer_crop_defaults = fields["farmer_crop"]
                 farmer_crop, _ = FarmerCrop.objects.get_or_create(
                     farmer=farmer,
                     crop=crop,
-                    planting_date=planting_date,
-                    defaults={
-                        "expected_harvest_date": expected_harvest_date,
-                        "status": farmer_crop_status,
-                        "area_allocated_hectares": self._to_float_optional(row.get("area_allocated_hectares"), default=1.0),
-                        "expected_yield_kg": self._to_int_optional(row.get("expected_yield_kg")),
-                    },
+                    planting_date=farmer_crop_defaults.pop("planting_date"),
+                    defaults=farmer_crop_defaults,
                 )
 
-                status = row.get("status", "").strip() or "Pending"
-                status = self._choice(status, self.TASK_STATUS, "status", row_number, "tasks")
-                importance = row.get("importance", "").strip() or "Medium"
-                importance = self._choice(importance, self.TASK_IMPORTANCE, "importance", row_number, "tasks")
-                is_completed = self._to_bool_optional(row.get("is_completed"), default=(status == "Completed"))
-                completed_date = row.get("completed_date", "").strip()
-                if completed_date:
-                    completed_date = self._to_date(completed_date, "completed_date", row_number, "tasks")
-                elif is_completed or status == "Completed":
-                    completed_date = due_date
-                else:
-                    completed_date = None
-
-                defaults = {
-                    "task_description": row.get("task_description") or "Task imported from CSV.",
-                    "status": status,
-                    "completed_date": completed_date,
-                    "priority": self._to_int_optional(row.get("priority"), default=5),
-                    "importance": importance,
-                    "is_completed": is_completed,
-                    "farmer_notes": row.get("farmer_notes", ""),
+                defaults = fields["task"]
+                lookup = {
+                    "farmer": farmer,
+                    "farmer_crop": farmer_crop,
+                    "task_name": defaults.pop("task_name"),
+                    "due_date": defaults.pop("due_date"),
                 }
-
-                _, created = FarmerTask.objects.update_or_create(
-                    farmer=farmer,
-                    farmer_crop=farmer_crop,
-                    task_name=task_name,
-                    due_date=due_date,
-                    defaults=defaults,
-                )
+                if self._unchanged(FarmerTask.objects.filter(**lookup), "tasks", defaults):
+                    summary["tasks_unchanged"] += 1
+                    continue
+                _, created = FarmerTask.objects.update_or_create(**lookup, defaults=defaults)
 
                 if created:
                     summary["tasks_created"] += 1
@@ -301,88 +224,56 @@ class Command(BaseCommand):
                 summary["tasks_skipped"] += 1
                 summary["errors"].append(f"tasks row {row_number}: {exc}")
 
-    def _read_csv_rows(self, file_path, delimiter, encoding, required_fields):
-        path = Path(file_path)
-        if not path.exists():
-            raise CommandError(f"File not found: {path}")
-
-        with path.open("r", encoding=encoding, newline="") as csv_file:
-            reader = csv.DictReader(csv_file, delimiter=delimiter)
-            if not reader.fieldnames:
-                raise CommandError(f"CSV has no header row: {path}")
-
-            header_set = {header.strip() for header in reader.fieldnames if header}
-            missing = [field for field in required_fields if field not in header_set]
-            if missing:
-                raise CommandError(f"{path.name} is missing required columns: {', '.join(missing)}")
-
-            rows = []
-            for index, row in enumerate(reader, start=2):
-                cleaned = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
-                if any(value for value in cleaned.values()):
-                    rows.append((index, cleaned))
-            return rows
-
-    def _required(self, row, field_name, row_number, section):
-        value = (row.get(field_name) or "").strip()
-        if not value:
-            raise ValueError(f"{section}.{field_name} is required (row {row_number}).")
-        return value
-
-    def _choice(self, value, allowed_values, field_name, row_number, section):
-        if value is None:
-            raise ValueError(f"{section}.{field_name} is required (row {row_number}).")
-
-        normalized = value.strip().lower()
-        for option in allowed_values:
-            if option.lower() == normalized:
-                return option
-
-        allowed = ", ".join(sorted(allowed_values))
-        raise ValueError(f"{section}.{field_name}='{value}' is invalid (row {row_number}). Allowed: {allowed}")
-
-    def _to_int(self, value, field_name, row_number, section):
-        try:
-            return int(str(value).strip())
-        except Exception as exc:
-            raise ValueError(f"{section}.{field_name} must be an integer (row {row_number}).") from exc
+    def _unchanged(self, queryset, section, fields):
+        # True when the stored row already holds the cleaned values: saving it would only bump updated_at.
+        stored = queryset.values_list(*FINGERPRINT_FIELDS[section]).first()
+        return stored is not None and row_fingerprint(stored) == row_fingerprint(
+            fields[name] for name in FINGERPRINT_FIELDS[section]
+        )
+
+    def _import_bulk(self, paths, delimiter, encoding, options, summary):
+        def progress(section, result):
+            if options["verbosity"] > 1:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{section}: {result['rows']} rows, {result['skipped']} skipped "
+                    f"({(result['rows'] - result['resumed_rows']) / max(elapsed, 1e-9):.0f} rows/s)"
+                )
 
-    def _to_int_optional(self, value, default=None):
-        if value is None or str(value).strip() == "":
-            return default
-        return int(str(value).strip())
+        for section, path in paths:
+            started = time.perf_counter()
+            try:
+                result = bulk_import(
+                    section, path, delimiter, encoding, options["chunk_size"], progress,
+                    resume=options["resume"], force=options["force"], workers=options["workers"],
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            elapsed = time.perf_counter() - started
+            if result["status"] == "unchanged":
+                self.stdout.write(f"{section}: {path} was already imported unchanged, skipped (use --force to re-import)")
+                continue
+            summary[f"{section}_created"] += result["created"]
+            summary[f"{section}_updated"] += result["updated"]
+            summary[f"{section}_unchanged"] += result["unchanged"]
+            summary[f"{section}_skipped"] += result["skipped"]
+            summary["errors"] += result["errors"]
+            if result["status"] == "resumed":
+                self.stdout.write(f"{section}: resumed after {result['resumed_rows']} rows")
+            rows = result["rows"] - result["resumed_rows"]
+            self.stdout.write(f"{section}: {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)")
+            # Per stage: rows over the time that stage was busy (validation per worker process).
+            rates = {stage: rows / max(busy, 1e-9) for stage, busy in result["seconds"].items()}
+            self.stdout.write(
+                f"{section} stages: read {rates['read']:.0f} rows/s, validate {rates['validate']:.0f} rows/s "
+                f"per worker x {options['workers']}, write {rates['write']:.0f} rows/s"
+            )
 
-    def _to_float(self, value, field_name, row_number, section):
-        try:
-            return float(str(value).strip())
-        except Exception as exc:
-            raise ValueError(f"{section}.{field_name} must be a number (row {row_number}).") from exc
-
-    def _to_float_optional(self, value, default=None):
-        if value is None or str(value).strip() == "":
-            return default
-        return float(str(value).strip())
-
-    def _to_bool_optional(self, value, default=False):
-        if value is None or str(value).strip() == "":
-            return default
-
-        lowered = str(value).strip().lower()
-        truthy = {"1", "true", "yes", "y"}
-        falsy = {"0", "false", "no", "n"}
-        if lowered in truthy:
-            return True
-        if lowered in falsy:
-            return False
-        raise ValueError(f"Invalid boolean value '{value}'. Use true/false, yes/no, or 1/0.")
-
-    def _to_date(self, value, field_name, row_number, section):
+    def _read_csv_rows(self, file_path, delimiter, encoding, required_fields):
         try:
-            return timezone.datetime.strptime(value, "%Y-%m-%d").date()
-        except Exception as exc:
-            raise ValueError(
-                f"{section}.{field_name} must be YYYY-MM-DD (row {row_number})."
-            ) from exc
+            return CSVRows(file_path, delimiter, encoding, required_fields)
+        except ValueError as exc:
+            raise CommandError(str(exc))
 
     def _write_templates(self, output_dir):
         directory = Path(output_dir)
@@ -425,9 +316,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS("Import completed."))
 
         self.stdout.write("--- Summary ---")
-        self.stdout.write(f"Crops: created={summary['crops_created']}, updated={summary['crops_updated']}, skipped={summary['crops_skipped']}")
-        self.stdout.write(f"Farmers: created={summary['farmers_created']}, updated={summary['farmers_updated']}, skipped={summary['farmers_skipped']}")
-        self.stdout.write(f"Tasks: created={summary['tasks_created']}, updated={summary['tasks_updated']}, skipped={summary['tasks_skipped']}")
+        self.stdout.write(f"Crops: created={summary['crops_created']}, updated={summary['crops_updated']}, unchanged={summary['crops_unchanged']}, skipped={summary['crops_skipped']}")
+        self.stdout.write(f"Farmers: created={summary['farmers_created']}, updated={summary['farmers_updated']}, unchanged={summary['farmers_unchanged']}, skipped={summary['farmers_skipped']}")
+        self.stdout.write(f"Tasks: created={summary['tasks_created']}, updated={summary['tasks_updated']}, unchanged={summary['tasks_unchanged']}, skipped={summary['tasks_skipped']}")
 
         if summary["errors"]:
             self.stdout.write(self.style.WARNING("--- Row Errors ---"))
@@ -0,0 +1,47 @@
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.weather.ingest import FORMATS, KINDS, ingest_weather
+
+
+class Command(BaseCommand):
+    help = "Bulk load weather forecasts/observations from NDJSON or CSV (forecasts upsert on location + date)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON or CSV file, or - for stdin")
+        parser.add_argument("--format", choices=FORMATS, help="Input format (default: from the file extension)")
+        parser.add_argument("--kind", choices=KINDS, default="forecast", help="Row type when a row has no type column")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per transaction (default: 2000)")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+
+        def progress(summary):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{summary['rows']} rows read, {summary['rejected']} rejected")
+
+        started = time.perf_counter()
+        if path == "-":
+            summary = ingest_weather(sys.stdin.buffer, fmt, options["kind"], options["batch_size"], progress)
+        else:
+            if not Path(path).exists():
+                raise CommandError(f"File not found: {path}")
+            with open(path, "rb") as stream:
+                summary = ingest_weather(stream, fmt, options["kind"], options["batch_size"], progress)
+        elapsed = time.perf_counter() - started
+
+        for reject in summary["rejects"]:
+            self.stderr.write(f"line {reject['line']}: {'; '.join(reject['errors'])}")
+        if summary["rejected"] > len(summary["rejects"]):
+            self.stderr.write(f"... and {summary['rejected'] - len(summary['rejects'])} more rejected rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Upserted {summary['forecasts']} forecasts, added {summary['observations']} observations, "
+            f"rejected {summary['rejected']} of {summary['rows']} rows in {elapsed:.1f}s "
+            f"({summary['rows'] / max(elapsed, 1e-9) * 60:.0f} rows/min)"
+        ))
@@ -0,0 +1,32 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.tasks.overdue import mark_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = "Mark open tasks past their due date as Overdue (run daily, e.g. from cron; safe to re-run)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Treat this YYYY-MM-DD as today (default: today)")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Task ids per UPDATE (default: 10000)")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        def progress(last_pk, changed):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"up to task {last_pk}: {changed} marked overdue")
+
+        started = time.perf_counter()
+        changed = mark_overdue_tasks(today, options["batch_size"], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {changed} tasks overdue in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,50 @@
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.tasks.planner import plan_reminders
+
+
+class Command(BaseCommand):
+    help = "Create reminders for pending tasks due soon on each farmer's contact channel (run nightly; safe to re-run)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Plan as if today were YYYY-MM-DD (default: today)")
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.REMINDER_PLAN_DAYS,
+            help=f"Tasks due within this many days (default: {settings.REMINDER_PLAN_DAYS})",
+        )
+        parser.add_argument(
+            "--offsets",
+            default=",".join(str(offset) for offset in settings.REMINDER_OFFSETS_DAYS),
+            help="Comma-separated days before due date to remind on (default: %(default)s)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Tasks per batch (default: 1000)")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        try:
+            offsets = [int(offset) for offset in options["offsets"].split(",")]
+        except ValueError:
+            raise CommandError("--offsets must be comma-separated whole days, e.g. 3,1,0.")
+        if any(offset < 0 for offset in offsets) or options["days"] < 0:
+            raise CommandError("--days and --offsets cannot be negative.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        def progress(last_pk, created):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"up to task {last_pk}: {created} reminders created")
+
+        started = time.perf_counter()
+        created = plan_reminders(today, options["days"], offsets, options["chunk_size"], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} reminders in {time.perf_counter() - started:.1f}s"
+        ))
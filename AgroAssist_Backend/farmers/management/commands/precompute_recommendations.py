@@ -0,0 +1,48 @@
+import os
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.farmers.recommendations import DEFAULT_DAYS, DEFAULT_TOP, precompute_recommendations
+
+
+class Command(BaseCommand):
+    help = "Precompute crop recommendations for every farmer (run nightly, e.g. from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Run date as YYYY-MM-DD (default: today)")
+        parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Crops stored per farmer (default: {DEFAULT_TOP})")
+        parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help=f"Forecast window in days (default: {DEFAULT_DAYS})")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Farmers per chunk (default: 500)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Scoring processes; 1 scores in this process (default: CPU count)",
+        )
+        parser.add_argument("--keep-days", type=int, default=7, help="Delete runs older than this (default: 7)")
+
+    def handle(self, *args, **options):
+        try:
+            run_date = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        for name in ("top", "days", "chunk_size", "workers"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+
+        started = time.perf_counter()
+        total = precompute_recommendations(
+            run_date=run_date,
+            top=options["top"],
+            days=options["days"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            keep_days=options["keep_days"],
+            progress=lambda done: self.stdout.write(f"{done} farmers scored") if options["verbosity"] > 1 else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored recommendations for {total} farmers in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} farmers/s)"
+        ))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.farmers.import_jobs import claim_next_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = "Run the CSV import jobs uploaded through /api/import-jobs/, oldest first"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows written per transaction (default: 2000)")
+        parser.add_argument("--workers", type=int, default=1, help="Processes validating rows per job (default: 1)")
+        parser.add_argument("--watch", type=int, metavar="SECONDS", help="Keep running, polling every SECONDS")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be positive.")
+
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if not options["watch"]:
+                    return
+                time.sleep(options["watch"])
+                continue
+            if options["verbosity"] > 0:
+                self.stdout.write(f"Import job {job.pk}: {job.section} {job.file_name} (attempt {job.attempts})")
+            job = run_import_job(job, options["chunk_size"], options["workers"])
+            line = (
+                f"Import job {job.pk} {job.status}: {job.rows} rows, created={job.created}, updated={job.updated}, "
+                f"unchanged={job.unchanged}, skipped={job.skipped} ({job.rows_per_second:.0f} rows/s)"
+            )
+            if job.status == "failed":
+                self.stdout.write(self.style.ERROR(f"{line}: {job.message}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
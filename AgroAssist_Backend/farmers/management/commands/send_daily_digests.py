@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AgroAssist_Backend.farmers.digest import send_daily_digests
+from AgroAssist_Backend.tasks.dispatch import file_channels
+
+
+class Command(BaseCommand):
+    help = "Send each farmer one message with today's due reminders and active weather alerts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Include reminders due on YYYY-MM-DD (default: today)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Farmer ids per batch (default: 1000)")
+        parser.add_argument(
+            "--file",
+            help="Write every channel to this JSON-lines file instead of the configured senders (for benchmarks)",
+        )
+        parser.add_argument("--latency-ms", type=int, default=0, help="Simulated gateway latency per send with --file")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        channels = file_channels(options["file"], options["latency_ms"]) if options["file"] else None
+
+        def progress(last_pk, totals):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"up to farmer {last_pk}: {totals['digests']} digests sent")
+
+        started = time.perf_counter()
+        totals = send_daily_digests(today, options["batch_size"], channels, progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {totals['digests']} digests covering {totals['reminders']} reminders and {totals['alerts']} alerts, "
+            f"{totals['failed']} failed in {elapsed:.1f}s ({totals['digests'] / max(elapsed, 1e-9):.0f} digests/s)"
+        ))
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def link_farmers_to_users(apps, schema_editor):
+    Farmer = apps.get_model('farmers', 'Farmer')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    # One pass over users, keyed by lower-cased email; the first account wins.
+    user_ids_by_email = {}
+    for user_id, email in User.objects.exclude(email='').order_by('id').values_list('id', 'email'):
+        user_ids_by_email.setdefault(email.lower(), user_id)
+
+    linked_user_ids = set(Farmer.objects.filter(user__isnull=False).values_list('user_id', flat=True))
+    to_update = []
+    for farmer in Farmer.objects.filter(user__isnull=True).only('id', 'email'):
+        user_id = user_ids_by_email.get(farmer.email.lower())
+        if user_id and user_id not in linked_user_ids:
+            farmer.user_id = user_id
+            linked_user_ids.add(user_id)
+            to_update.append(farmer)
+
+    Farmer.objects.bulk_update(to_update, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0003_farmer_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(link_farmers_to_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0004_backfill_farmer_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerDetailDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('payload', models.JSONField(blank=True, null=True)),
+                ('built_on', models.DateField(blank=True, null=True)),
+                ('farmer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='detail_document', to='farmers.farmer')),
+            ],
+            options={
+                'verbose_name': 'Farmer Detail Document',
+                'verbose_name_plural': 'Farmer Detail Documents',
+            },
+        ),
+    ]
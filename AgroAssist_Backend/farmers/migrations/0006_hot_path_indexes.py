@@ -0,0 +1,92 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:27
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def _free_email(email, farmer_id, taken):
+    local, _, domain = email.rpartition('@')
+    tag = f'+duplicate-{farmer_id}'
+    candidate = f'{local[:254 - len(tag) - len(domain) - 1]}{tag}@{domain}'
+    counter = 1
+    while candidate.lower() in taken:
+        counter += 1
+        candidate = f'{local[:254 - len(tag) - len(str(counter)) - len(domain) - 2]}{tag}-{counter}@{domain}'
+    return candidate
+
+
+def resolve_case_variant_emails(apps, schema_editor):
+    Farmer = apps.get_model('farmers', 'Farmer')
+    FarmerDetailDocument = apps.get_model('farmers', 'FarmerDetailDocument')
+
+    # Per lower-cased email, the farmer linked to a login (else the oldest) keeps it;
+    # the others get a tagged address so farmer_email_ci_unique can be added.
+    rows = Farmer.objects.order_by('id').values_list('id', 'email', 'user_id')
+    keepers = {}
+    for farmer_id, email, user_id in rows:
+        key = email.lower()
+        kept = keepers.get(key)
+        if kept is None or (user_id is not None and kept[1] is None):
+            keepers[key] = (farmer_id, user_id)
+    taken = set(keepers)
+    renamed = []
+    for farmer_id, email, _ in rows:
+        if keepers[email.lower()][0] != farmer_id:
+            new_email = _free_email(email, farmer_id, taken)
+            taken.add(new_email.lower())
+            renamed.append(Farmer(id=farmer_id, email=new_email))
+
+    Farmer.objects.bulk_update(renamed, ['email'], batch_size=500)
+    # Queryset writes skip the signals; drop the stored detail payloads by hand.
+    renamed_ids = [farmer.id for farmer in renamed]
+    for start in range(0, len(renamed_ids), 500):
+        FarmerDetailDocument.objects.filter(farmer_id__in=renamed_ids[start:start + 500]).update(
+            payload=None, version=F('version') + 1,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0003_hot_path_indexes'),
+        ('farmers', '0005_detail_documents'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['-created_at'], name='farmer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmercrop',
+            index=models.Index(fields=['farmer', 'status', '-planting_date'], name='farmercrop_farmer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmercrop',
+            index=models.Index(fields=['farmer', '-planting_date'], name='farmercrop_farmer_planted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmercrop',
+            index=models.Index(fields=['-planting_date'], name='farmercrop_planted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerinventory',
+            index=models.Index(fields=['farmer', 'expiry_date'], name='inventory_farmer_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerinventory',
+            index=models.Index(fields=['farmer', '-created_at'], name='inventory_farmer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmerinventory',
+            index=models.Index(fields=['-created_at'], name='inventory_created_idx'),
+        ),
+        migrations.RunPython(resolve_case_variant_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='farmer',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='farmer_email_ci_unique'),
+        ),
+    ]
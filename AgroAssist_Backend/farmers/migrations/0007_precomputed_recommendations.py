@@ -0,0 +1,34 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecomputedRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_date', models.DateField()),
+                ('catalog_version', models.PositiveBigIntegerField(default=0)),
+                ('weather', models.JSONField(blank=True, null=True)),
+                ('results', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('farmer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='precomputed_recommendations', to='farmers.farmer')),
+            ],
+            options={
+                'verbose_name': 'Precomputed Recommendation',
+                'verbose_name_plural': 'Precomputed Recommendations',
+                'ordering': ['-run_date'],
+                'indexes': [models.Index(fields=['run_date'], name='precomputed_rec_run_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('farmer', 'run_date'), name='precomputed_rec_farmer_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0008_farmer_city_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20)),
+                ('file_hash', models.CharField(max_length=64)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('byte_offset', models.PositiveBigIntegerField(default=0)),
+                ('last_row', models.PositiveIntegerField(default=1)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(default=list)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Import Checkpoint',
+                'verbose_name_plural': 'Import Checkpoints',
+                'ordering': ['-updated_at'],
+                'constraints': [models.UniqueConstraint(fields=('section', 'file_hash'), name='import_checkpoint_file_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0009_import_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importcheckpoint',
+            name='unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from .models import Farmer
+
+
+def linked_farmer_id_for_user(user):
+    """Farmer id for a user, from the cached token claims when available, else via the user link."""
+    farmer_id = getattr(user, 'farmer_id', None)
+    if farmer_id:
+        return farmer_id
+    return Farmer.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+
+
+class LinkedFarmerMixin:
+    """
+    Resolves the farmer profile of request.user once per request.
+
+    Scoped querysets should filter on get_linked_farmer_id(); the full
+    Farmer row is only fetched when a view needs the instance.
+    """
+
+    def get_linked_farmer_id(self):
+        request = self.request
+        if not hasattr(request, 'farmer_id'):
+            request.farmer_id = linked_farmer_id_for_user(request.user)
+        return request.farmer_id
+
+    def get_linked_farmer(self):
+        request = self.request
+        if not hasattr(request, 'farmer'):
+            farmer_id = self.get_linked_farmer_id()
+            request.farmer = Farmer.objects.filter(id=farmer_id).first() if farmer_id else None
+        return request.farmer
@@ -1,5 +1,8 @@
 ﻿# Import Django model classes for database
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 # Import Crop model from crops app to link farmers with crops they can grow
 from AgroAssist_Backend.crops.models import Crop
@@ -63,6 +66,10 @@ class Farmer(models.Model):
     # CharField = WhatsApp or preferred contact method
     contact_method = models.CharField(max_length=20, default='WhatsApp')  # How to contact farmer
     
+    # OneToOneField = Login account for this farmer (indexed, replaces matching users by email)
+    # on_delete=models.SET_NULL = Keep the farmer profile if the login account is deleted
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='farmer_profile')  # Linked auth user
+    
     # DateTimeField = Auto-set when farmer account is created
     created_at = models.DateTimeField(auto_now_add=True)  # When farmer registered
     
@@ -74,6 +81,14 @@ class Farmer(models.Model):
         verbose_name = "Farmer"  # Display name (singular)
         verbose_name_plural = "Farmers"  # Display name (plural)
         ordering = ['-created_at']  # Show newest farmers first
+        # Case-insensitive unique email; lookups filter on Lower('email') to use it (email__iexact can't)
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='farmer_email_ci_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['-created_at'], name='farmer_created_idx'),  # Default list ordering
+            models.Index(fields=['city'], name='farmer_city_idx'),  # Weather alert fan-out by location
+        ]
     
     # __str__ = What text shows when displaying this farmer
     def __str__(self):
@@ -124,6 +139,19 @@ class FarmerCrop(models.Model):
         ordering = ['-planting_date']  # Show recently planted first
         # unique_together = No farmer can have same crop twice at same time
         unique_together = ('farmer', 'crop', 'planting_date')  # Prevent duplicates
+        # indexes = Match the farmer-scoped list and current/harvested (status) filters
+        indexes = [
+            models.Index(fields=['farmer', 'status', '-planting_date'], name='farmercrop_farmer_status_idx'),
+            models.Index(fields=['farmer', '-planting_date'], name='farmercrop_farmer_planted_idx'),
+            models.Index(fields=['-planting_date'], name='farmercrop_planted_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored planting date so saves can tell when it changed (task generation)
+        instance._stored_planting_date = instance.__dict__.get('planting_date')
+        return instance
     
     def __str__(self):
         # Shows "Rajesh Patil - Rice (Planted)" when displaying
@@ -171,8 +199,222 @@ class FarmerInventory(models.Model):
         verbose_name = "Farmer Inventory"  # Display name (singular)
         verbose_name_plural = "Farmer Inventory"  # Display name (plural)
         ordering = ['-created_at']  # Show newest items first
+        # indexes = Match the farmer-scoped list and expired/expiring_soon filters
+        indexes = [
+            models.Index(fields=['farmer', 'expiry_date'], name='inventory_farmer_expiry_idx'),
+            models.Index(fields=['farmer', '-created_at'], name='inventory_farmer_created_idx'),
+            models.Index(fields=['-created_at'], name='inventory_created_idx'),
+        ]
     
     def __str__(self):
         # Shows "Rajesh Patil - Rice Seeds (50 kg)" when displaying
         return f"{self.farmer.first_name} - {self.item_name} ({self.quantity} {self.unit})"
 
+
+# MODEL 4: FarmerDetailDocument - Precomputed JSON for the /farmers/{id}/ endpoint
+class FarmerDetailDocument(models.Model):
+    # OneToOneField = Exactly one cached document per farmer
+    farmer = models.OneToOneField(Farmer, on_delete=models.CASCADE, related_name='detail_document')  # Which farmer
+    
+    # PositiveIntegerField = Bumped every time the farmer, their crops or inventory change
+    version = models.PositiveIntegerField(default=0)  # Document version (used for stale-write checks)
+    
+    # JSONField = Serialized FarmerDetailSerializer output (null = needs rebuild)
+    payload = models.JSONField(blank=True, null=True)  # Cached response body
+    
+    # DateField = Day the payload was built for (days_until_harvest etc. change daily)
+    built_on = models.DateField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = "Farmer Detail Document"
+        verbose_name_plural = "Farmer Detail Documents"
+    
+    def __str__(self):
+        # Shows "Rajesh Patil details v3" format
+        return f"{self.farmer} details v{self.version}"
+
+
+# MODEL 5: PrecomputedRecommendation - Nightly crop ranking for one farmer
+class PrecomputedRecommendation(models.Model):
+    # ForeignKey = Which farmer this ranking is for (one row per nightly run)
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='precomputed_recommendations')
+    
+    # DateField = Day the ranking was computed for (forecast window starts here)
+    run_date = models.DateField()
+    
+    # PositiveBigIntegerField = Crop catalog version the scores were computed from
+    catalog_version = models.PositiveBigIntegerField(default=0)
+    
+    # JSONField = Forecast window used for scoring (null = soil only, no forecasts)
+    weather = models.JSONField(blank=True, null=True)
+    
+    # JSONField = Ranked rows [{'crop': id, 'score': ..., 'breakdown': {...}, ...}]
+    results = models.JSONField(default=list)
+    
+    # DateTimeField = When the nightly run wrote this row
+    computed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = "Precomputed Recommendation"
+        verbose_name_plural = "Precomputed Recommendations"
+        ordering = ['-run_date']
+        # One ranking per farmer per run (also the index behind the API lookup)
+        constraints = [
+            models.UniqueConstraint(fields=['farmer', 'run_date'], name='precomputed_rec_farmer_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['run_date'], name='precomputed_rec_run_date_idx'),  # Pruning old runs
+        ]
+    
+    def __str__(self):
+        # Shows "Rajesh Patil recommendations 2026-10-17" format
+        return f"{self.farmer} recommendations {self.run_date}"
+
+
+# MODEL 6: ImportCheckpoint - Progress of one CSV file through import_csv_data --bulk
+class ImportCheckpoint(models.Model):
+    # CharField = Which importer ran the file ("crops", "farmers" or "tasks")
+    section = models.CharField(max_length=20)
+    
+    # CharField = SHA-256 of the file contents (the same file under another name matches)
+    file_hash = models.CharField(max_length=64)
+    
+    # CharField = File name of the last run, for people reading the table
+    file_name = models.CharField(max_length=255, blank=True)
+    
+    # PositiveBigIntegerField = Byte offset just past the last committed row (resume seeks here)
+    byte_offset = models.PositiveBigIntegerField(default=0)
+    
+    # PositiveIntegerField = CSV row number of the last committed row (1 = header)
+    last_row = models.PositiveIntegerField(default=1)
+    
+    # PositiveIntegerField = Summary counters up to the last committed row
+    rows = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    
+    # JSONField = First row error messages, as printed in the summary
+    errors = models.JSONField(default=list)
+    
+    # DateTimeField = When the whole file was imported (empty = stopped part way)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    
+    # DateTimeField = Auto-set timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Import Checkpoint"
+        verbose_name_plural = "Import Checkpoints"
+        ordering = ['-updated_at']
+        # One checkpoint per file contents per importer (also the lookup index)
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'file_hash'], name='import_checkpoint_file_uniq'),
+        ]
+    
+    def __str__(self):
+        # Shows "farmers farmers.csv row 800001" format
+        return f"{self.section} {self.file_name} row {self.last_row}"
+
+
+# MODEL 7: ImportJob - A CSV file uploaded through the API, imported by a background worker
+class ImportJob(models.Model):
+    # CharField with choices = Which importer runs the file
+    SECTION_CHOICES = [
+        ('crops', 'Crops'),
+        ('farmers', 'Farmers'),
+        ('tasks', 'Tasks'),
+    ]
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES)
+    
+    # CharField with choices = Where the job is (queued -> running -> completed or failed)
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),  # Uploaded, waiting for a worker
+        ('running', 'Running'),  # A worker is importing it
+        ('completed', 'Completed'),  # Whole file imported
+        ('failed', 'Failed'),  # Stopped with an error (see message)
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    
+    # CharField = Name the admin gave the upload, and where it is stored on disk until the job ends
+    file_name = models.CharField(max_length=255, blank=True)
+    file_path = models.CharField(max_length=500)
+    
+    # CSV options passed to the importer (like the import_csv_data options)
+    delimiter = models.CharField(max_length=1, default=',')
+    encoding = models.CharField(max_length=40, default='utf-8')
+    force = models.BooleanField(default=False)  # Import again even if this file was imported before
+    
+    # ForeignKey = Admin who uploaded the file
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs',
+    )
+    
+    # PositiveBigIntegerField = File size and how far the worker has read it (progress)
+    file_size = models.PositiveBigIntegerField(default=0)
+    byte_offset = models.PositiveBigIntegerField(default=0)
+    
+    # PositiveIntegerField = Summary counters so far (same as the import_csv_data summary)
+    rows = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    
+    # FloatField = Rows imported per second by the current (or last) run
+    rows_per_second = models.FloatField(default=0)
+    
+    # PositiveIntegerField = Times a worker picked the job up (more than 1 = resumed after a stopped worker)
+    attempts = models.PositiveIntegerField(default=0)
+    
+    # TextField = Why the job failed, or a note about how it ended
+    message = models.TextField(blank=True)
+    
+    # DateTimeField = Run timestamps; heartbeat_at moves with every chunk so stalled jobs can be taken over
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    # DateTimeField = Auto-set timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Import Job"
+        verbose_name_plural = "Import Jobs"
+        ordering = ['-created_at']
+        # Workers look for the oldest queued (or stalled running) job
+        indexes = [
+            models.Index(fields=['status', 'id'], name='import_job_status_idx'),
+        ]
+    
+    def __str__(self):
+        # Shows "Import job 3: farmers farmers.csv (running)" format
+        return f"Import job {self.pk}: {self.section} {self.file_name} ({self.status})"
+
+
+# MODEL 8: ImportJobError - One skipped row of an import job (all of them, paged by the API)
+class ImportJobError(models.Model):
+    # ForeignKey = The job the row belongs to
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='row_errors')
+    
+    # PositiveIntegerField = CSV row number (1 = header)
+    row_number = models.PositiveIntegerField()
+    
+    # TextField = Why the row was skipped
+    message = models.TextField()
+    
+    class Meta:
+        verbose_name = "Import Job Error"
+        verbose_name_plural = "Import Job Errors"
+        ordering = ['row_number']
+        # One error per row (a resumed job may report a row again) - also the paging index
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'row_number'], name='import_job_error_row_uniq'),
+        ]
+    
+    def __str__(self):
+        # Shows "Job 3 row 12: ..." format
+        return f"Job {self.job_id} row {self.row_number}: {self.message}"
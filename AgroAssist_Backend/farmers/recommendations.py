@@ -0,0 +1,132 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from AgroAssist_Backend.crops.catalog import get_catalog
+from AgroAssist_Backend.crops.suitability import crop_matrix, forecast_windows, rank_crops, with_catalog_crops
+
+from .models import Farmer, PrecomputedRecommendation
+
+DEFAULT_TOP = 20
+DEFAULT_DAYS = 7
+
+
+def stored_recommendations(farmer, catalog, limit, today=None):
+    """
+    Today's precomputed ranking for a farmer as a response body, or None
+    when live scoring is needed: no run today (new farmer, job not run),
+    the farmer or the catalog changed since, or more rows are asked for
+    than were stored.
+    """
+    today = today or timezone.localdate()
+    stored = PrecomputedRecommendation.objects.filter(farmer=farmer, run_date=today).first()
+    if stored is None or stored.catalog_version != catalog.version or stored.computed_at < farmer.updated_at:
+        return None
+    if limit > len(stored.results) and len(stored.results) < len(catalog.crops):
+        return None
+    return {'farmer': farmer.id, 'weather': stored.weather, 'results': with_catalog_crops(catalog, stored.results[:limit])}
+
+
+def _score_chunk(matrix, chunk, top):
+    # Runs in worker processes: pure NumPy, no database access.
+    return [
+        (farmer_id, weather, rank_crops(matrix, soil_type, land_area, weather, limit=top))
+        for farmer_id, soil_type, land_area, weather in chunk
+    ]
+
+
+def _farmer_chunks(windows, run_date, days, size, limit=None):
+    # Keyset over the primary key: no cursor stays open while chunks are written.
+    farmers = Farmer.objects.all()
+    if limit is not None:
+        farmers = unranked_farmers(run_date)
+    last_pk = 0
+    while True:
+        if limit is not None:
+            size = min(size, limit)
+            limit -= size
+        rows = list(
+            farmers.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'city', 'soil_type', 'land_area_hectares',
+            )[:size]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        # Farmers added mid-run may bring a new city.
+        missing = {city for _, city, _, _ in rows if city not in windows}
+        if missing:
+            windows.update(forecast_windows(missing, run_date, days))
+        yield [(farmer_id, soil_type, land_area, windows[city]) for farmer_id, city, soil_type, land_area in rows]
+
+
+def unranked_farmers(run_date):
+    """Farmers with no stored ranking for run_date yet."""
+    return Farmer.objects.exclude(
+        Exists(PrecomputedRecommendation.objects.filter(farmer=OuterRef('pk'), run_date=run_date)),
+    )
+
+
+def precompute_recommendations(run_date=None, top=DEFAULT_TOP, days=DEFAULT_DAYS, chunk_size=500, workers=1,
+                               keep_days=7, progress=None, limit=None):
+    """
+    Rank crops for every farmer and store the top rows for run_date.
+
+    Farmers are read in primary-key chunks and scored in `workers` processes
+    (1 = in this process); each chunk is written with one upserting
+    bulk_create in its own transaction, so reruns for the same date replace
+    rows. With `limit`, only up to that many farmers not yet ranked for
+    run_date are scored, so repeated calls finish a run in bounded steps.
+    Runs older than keep_days are deleted. Returns the farmer count.
+    """
+    run_date = run_date or timezone.localdate()
+    catalog = get_catalog()
+    matrix = crop_matrix(catalog)
+    computed_at = timezone.now()
+
+    cities = Farmer.objects.order_by().values_list('city', flat=True).distinct()
+    windows = forecast_windows(set(cities), run_date, days)
+    chunks = _farmer_chunks(windows, run_date, days, chunk_size, limit)
+    total = 0
+
+    def write(rows):
+        nonlocal total
+        with transaction.atomic():
+            PrecomputedRecommendation.objects.bulk_create(
+                [
+                    PrecomputedRecommendation(
+                        farmer_id=farmer_id, run_date=run_date, catalog_version=catalog.version,
+                        weather=weather, results=results, computed_at=computed_at,
+                    )
+                    for farmer_id, weather, results in rows
+                ],
+                update_conflicts=True,
+                unique_fields=['farmer', 'run_date'],
+                update_fields=['catalog_version', 'weather', 'results', 'computed_at'],
+            )
+        total += len(rows)
+        if progress:
+            progress(total)
+
+    if workers > 1:
+        # Workers only run NumPy, but unpickling the task imports Django models.
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            # A few chunks in flight per worker; results are written in farmer order.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_score_chunk, matrix, chunk, top))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    else:
+        for chunk in chunks:
+            write(_score_chunk(matrix, chunk, top))
+
+    PrecomputedRecommendation.objects.filter(run_date__lt=run_date - timedelta(days=keep_days)).delete()
+    return total
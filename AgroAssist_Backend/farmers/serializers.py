@@ -1,15 +1,19 @@
 ﻿# Import serializer classes from Django REST Framework
+from django.db.models import Value
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 # Import models to serialize
-from .models import Farmer, FarmerCrop, FarmerInventory
+from .models import Farmer, FarmerCrop, FarmerInventory, ImportJob, ImportJobError
 
 # Import serializers from related apps
 from AgroAssist_Backend.crops.serializers import CropSerializer
+from AgroAssist_Backend.fast_lists import request_today
+from AgroAssist_Backend.sparse_fields import SparseFieldsMixin
 
 
 # SERIALIZER 1: FarmerSerializer - Convert Farmer model to/from JSON
-class FarmerSerializer(serializers.ModelSerializer):
+class FarmerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Get full name by combining first and last name
     full_name = serializers.SerializerMethodField()  # Custom field for full name
     
@@ -21,6 +25,8 @@ class FarmerSerializer(serializers.ModelSerializer):
                   'farming_notes', 'contact_method', 'created_at', 'updated_at']
         
         read_only_fields = ['created_at', 'updated_at', 'full_name']  # These can't be edited by API
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'full_name': ('first_name', 'last_name')}
         
         # Add validation rules for fields
         extra_kwargs = {
@@ -36,7 +42,7 @@ class FarmerSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 2: FarmerCropSerializer - Convert FarmerCrop (farmer's crops) to/from JSON
-class FarmerCropSerializer(serializers.ModelSerializer):
+class FarmerCropSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields that call methods
     crop_name = serializers.SerializerMethodField()  # Show crop name, not just ID
     farmer_name = serializers.SerializerMethodField()  # Show farmer name  
@@ -52,6 +58,15 @@ class FarmerCropSerializer(serializers.ModelSerializer):
         
         read_only_fields = ['created_at', 'updated_at', 'farmer_name', 'crop_name', 
                            'days_since_planting', 'days_until_harvest']  # Can't edit these
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'crop_name': ('crop__name',),
+            'farmer_name': ('farmer__first_name', 'farmer__last_name'),
+            'days_since_planting': ('planting_date',),
+            'days_until_harvest': ('expected_harvest_date',),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'crop': ('crop', CropSerializer), 'farmer': ('farmer', FarmerSerializer)}
     
     def get_crop_name(self, obj):
         # Returns the crop name
@@ -63,8 +78,7 @@ class FarmerCropSerializer(serializers.ModelSerializer):
     
     def get_days_since_planting(self, obj):
         # Calculate how many days since farmer planted this crop
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         days = (today - obj.planting_date).days  # Calculate difference
         return max(0, days)  # Return 0 if negative (hasn't been planted yet)
     
@@ -73,14 +87,13 @@ class FarmerCropSerializer(serializers.ModelSerializer):
         if not obj.expected_harvest_date:  # If no harvest date set
             return None  # Return None (unknown)
         
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         days = (obj.expected_harvest_date - today).days  # Calculate difference
         return max(0, days)  # Return 0 if harvest date has passed
 
 
 # SERIALIZER 3: FarmerInventorySerializer - Convert inventory items to/from JSON
-class FarmerInventorySerializer(serializers.ModelSerializer):
+class FarmerInventorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     farmer_name = serializers.SerializerMethodField()  # Show farmer name
     days_until_expiry = serializers.SerializerMethodField()  # Calculate days until expiry
@@ -93,6 +106,14 @@ class FarmerInventorySerializer(serializers.ModelSerializer):
                   'notes', 'created_at']
         
         read_only_fields = ['created_at', 'farmer_name', 'days_until_expiry', 'is_expired']  # Can't edit
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'farmer_name': ('farmer__first_name', 'farmer__last_name'),
+            'days_until_expiry': ('expiry_date',),
+            'is_expired': ('expiry_date',),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'farmer': ('farmer', FarmerSerializer)}
     
     def get_farmer_name(self, obj):
         # Returns the farmer's name
@@ -103,8 +124,7 @@ class FarmerInventorySerializer(serializers.ModelSerializer):
         if not obj.expiry_date:  # If no expiry date
             return None  # Return None (doesn't expire)
         
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         days = (obj.expiry_date - today).days  # Calculate difference
         return days  # Can be negative if already expired
     
@@ -113,13 +133,12 @@ class FarmerInventorySerializer(serializers.ModelSerializer):
         if not obj.expiry_date:  # If no expiry date
             return False  # Not expired
         
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         return today > obj.expiry_date  # True if today is after expiry date
 
 
 # SERIALIZER 4: FarmerDetailSerializer - Show all farmer info with related data
-class FarmerDetailSerializer(serializers.ModelSerializer):
+class FarmerDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Nest related serializers to show all data together
     
     full_name = serializers.SerializerMethodField()  # Full name
@@ -163,7 +182,8 @@ class CreateFarmerSerializer(serializers.ModelSerializer):
     
     def validate_email(self, value):
         # Custom validation for email - check if already exists
-        if Farmer.objects.filter(email=value).exists():  # If email already in database
+        # Lower() on both sides = same comparison as the farmer_email_ci_unique index, so it is an index search
+        if Farmer.objects.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(value))).exists():  # If email already in database (any case)
             raise serializers.ValidationError("A farmer with this email already exists.")  # Error message
         return value  # Return email if valid
     
@@ -173,3 +193,28 @@ class CreateFarmerSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A farmer with this phone number already exists.")  # Error message
         return value  # Return phone if valid
 
+
+# SERIALIZER 6: ImportJobSerializer - Progress of a CSV import job (read-only, the worker fills it in)
+class ImportJobSerializer(serializers.ModelSerializer):
+    # Percent of the file read so far (by bytes, so it is known before the rows are counted)
+    progress_percent = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ImportJob
+        fields = ['id', 'section', 'status', 'file_name', 'delimiter', 'encoding', 'force', 'file_size',
+                  'byte_offset', 'progress_percent', 'rows', 'created', 'updated', 'unchanged', 'skipped',
+                  'rows_per_second', 'attempts', 'message', 'created_at', 'started_at', 'heartbeat_at',
+                  'finished_at']
+        read_only_fields = fields  # Jobs are created by uploading a file, never edited
+    
+    def get_progress_percent(self, obj):
+        if obj.status == 'completed':
+            return 100.0
+        return round(100 * obj.byte_offset / obj.file_size, 1) if obj.file_size else 0.0
+
+
+# SERIALIZER 7: ImportJobErrorSerializer - One skipped row of an import job
+class ImportJobErrorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJobError
+        fields = ['row_number', 'message']
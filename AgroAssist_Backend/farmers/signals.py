@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from AgroAssist_Backend.crops.models import Crop
+
+from .documents import invalidate_farmer_documents
+from .models import Farmer, FarmerCrop, FarmerInventory
+from .stateless_token_auth import invalidate_cached_user
+
+
+@receiver(pre_save, sender=Farmer, dispatch_uid='farmers_link_user_on_farmer_save')
+def link_user_on_farmer_save(sender, instance, raw=False, **kwargs):
+    # Farmers created by admins or imports are matched to an existing login once, on write.
+    if raw or instance.user_id or not instance.email:
+        return
+    User = get_user_model()
+    instance.user_id = (
+        User.objects.filter(email__iexact=instance.email, farmer_profile__isnull=True)
+        .order_by('id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if instance.user_id:
+        invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid='farmers_link_farmer_on_user_create')
+def link_farmer_on_user_create(sender, instance, created, raw=False, **kwargs):
+    if raw or not created or not instance.email:
+        return
+    # Lower() on both sides, like farmer_email_ci_unique, so the lookup searches that index.
+    farmer_id = (
+        Farmer.objects.alias(email_lower=Lower('email'))
+        .filter(email_lower=Lower(Value(instance.email)), user__isnull=True)
+        .order_by('id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if farmer_id:
+        Farmer.objects.filter(id=farmer_id).update(user=instance)
+
+
+@receiver(post_save, sender=Farmer, dispatch_uid='farmers_farmer_saved_invalidate_document')
+def invalidate_on_farmer_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_farmer_documents([instance.pk])
+
+
+def invalidate_on_farmer_child_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_farmer_documents([instance.farmer_id])
+
+
+for child_model in (FarmerCrop, FarmerInventory):
+    post_save.connect(invalidate_on_farmer_child_change, sender=child_model, dispatch_uid=f'farmers_{child_model.__name__}_saved')
+    post_delete.connect(invalidate_on_farmer_child_change, sender=child_model, dispatch_uid=f'farmers_{child_model.__name__}_deleted')
+
+
+@receiver(post_save, sender=Crop, dispatch_uid='farmers_crop_saved_invalidate_documents')
+def invalidate_growers_on_crop_change(sender, instance, raw=False, **kwargs):
+    # Farmer documents embed crop_name for every crop the farmer grows.
+    if not raw:
+        invalidate_farmer_documents(FarmerCrop.objects.filter(crop_id=instance.pk).values('farmer_id'))
@@ -1,16 +1,125 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import signing
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
+from django.utils.crypto import salted_hmac
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 
 _TOKEN_SALT = 'agroassist.auth.token.v1'
 _TOKEN_MAX_AGE_SECONDS = int(os.getenv('AUTH_TOKEN_MAX_AGE_SECONDS', '2592000'))
 
+# Verified users are kept in-process so most requests skip the users table.
+# Entries are re-checked against the DB once they are older than the TTL, which
+# bounds how long another worker can keep accepting a revoked token.
+_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', '1024'))
+_USER_CACHE_TTL_SECONDS = int(os.getenv('AUTH_USER_CACHE_TTL_SECONDS', '300'))
 
-def issue_auth_token(user):
-    return signing.dumps({'uid': user.id}, salt=_TOKEN_SALT)
+# Fields served from the cache without loading the User row.
+_CACHED_USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_superuser')
+
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def auth_version_for_user(user):
+    """Short digest that changes when the password, active flag or role changes."""
+    value = f'{user.pk}:{user.password}:{user.is_active}:{user.is_staff}:{user.is_superuser}'
+    return salted_hmac(_TOKEN_SALT, value).hexdigest()[:16]
+
+
+def issue_auth_token(user, farmer=None):
+    claims = {
+        'uid': user.id,
+        'av': auth_version_for_user(user),
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'farmer_id': farmer.id if farmer else None,
+    }
+    return signing.dumps(claims, salt=_TOKEN_SALT)
+
+
+def invalidate_cached_user(user_id):
+    with _user_cache_lock:
+        for key in [key for key in _user_cache if key[0] == user_id]:
+            del _user_cache[key]
+
+
+def clear_user_cache():
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+def _cache_get(key):
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry['verified_at'] > _USER_CACHE_TTL_SECONDS:
+            del _user_cache[key]
+            return None
+        _user_cache.move_to_end(key)
+        return entry['snapshot']
+
+
+def _cache_put(key, snapshot):
+    with _user_cache_lock:
+        _user_cache[key] = {'snapshot': snapshot, 'verified_at': time.monotonic()}
+        _user_cache.move_to_end(key)
+        while len(_user_cache) > _USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+
+
+class CachedTokenUser:
+    """
+    Stand-in for request.user built from cached token claims.
+
+    Identity and role fields are answered from the snapshot; any other
+    attribute loads the real User row once and delegates to it.
+    """
+
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, snapshot, user=None):
+        self._snapshot = snapshot
+        self._user = user
+
+    @property
+    def pk(self):
+        return self._snapshot['id']
+
+    def _load_user(self):
+        if self._user is None:
+            User = get_user_model()
+            self._user = User.objects.filter(id=self._snapshot['id'], is_active=True).first()
+            if self._user is None:
+                raise AuthenticationFailed('User not found or inactive.')
+        return self._user
+
+    def __getattr__(self, name):
+        snapshot = self.__dict__.get('_snapshot', {})
+        if name in snapshot:
+            return snapshot[name]
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._load_user(), name)
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.pk and getattr(other, 'is_authenticated', False)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return self._snapshot.get('username') or str(self.pk)
 
 
 def _resolve_user_from_token(token):
@@ -25,12 +134,42 @@ def _resolve_user_from_token(token):
     if not user_id:
         raise AuthenticationFailed('Invalid token payload.')
 
+    # Tokens issued before auth versions existed still work, via the DB.
+    auth_version = data.get('av')
+    cache_key = (user_id, auth_version)
+    if auth_version:
+        snapshot = _cache_get(cache_key)
+        if snapshot is not None:
+            return CachedTokenUser(snapshot)
+
     User = get_user_model()
-    user = User.objects.filter(id=user_id, is_active=True).first()
+    user = User.objects.filter(id=user_id, is_active=True).select_related('farmer_profile').first()
     if not user:
         raise AuthenticationFailed('User not found or inactive.')
 
-    return user
+    if not auth_version:
+        return user
+    if auth_version != auth_version_for_user(user):
+        raise AuthenticationFailed('Token has been revoked.')
+
+    # The DB link wins over the claim, so farmers linked after login are picked up.
+    try:
+        farmer_id = user.farmer_profile.id
+    except ObjectDoesNotExist:
+        farmer_id = None
+
+    snapshot = {field: getattr(user, field) for field in _CACHED_USER_FIELDS}
+    snapshot['farmer_id'] = farmer_id
+    _cache_put(cache_key, snapshot)
+    return CachedTokenUser(snapshot, user=user)
+
+
+def _evict_user_on_change(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+post_save.connect(_evict_user_on_change, sender=settings.AUTH_USER_MODEL, dispatch_uid='stateless_token_auth_user_saved')
+post_delete.connect(_evict_user_on_change, sender=settings.AUTH_USER_MODEL, dispatch_uid='stateless_token_auth_user_deleted')
 
 
 class StatelessTokenAuthentication(authentication.BaseAuthentication):
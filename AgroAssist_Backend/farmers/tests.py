@@ -1,3 +1,816 @@
-from django.test import TestCase
+import importlib
+import io
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+
+from AgroAssist_Backend.crops import catalog
+from AgroAssist_Backend.crops.models import CatalogVersion, Crop
+from AgroAssist_Backend.crops.suitability import forecast_windows
+from AgroAssist_Backend.farmers.csv_import import bulk_import
+from AgroAssist_Backend.farmers.digest import send_daily_digests
+from AgroAssist_Backend.farmers.import_jobs import CLAIM_TIMEOUT as IMPORT_CLAIM_TIMEOUT, claim_next_job, run_import_job
+from AgroAssist_Backend.farmers.models import (
+    Farmer,
+    FarmerCrop,
+    FarmerDetailDocument,
+    FarmerInventory,
+    ImportCheckpoint,
+    ImportJob,
+    PrecomputedRecommendation,
+)
+from AgroAssist_Backend.farmers import documents, stateless_token_auth
+from AgroAssist_Backend.farmers.recommendations import precompute_recommendations
+from AgroAssist_Backend.farmers.stateless_token_auth import (
+    CachedTokenUser,
+    StatelessTokenAuthentication,
+    clear_user_cache,
+    issue_auth_token,
+)
+from AgroAssist_Backend.tasks.dispatch import CLAIM_TIMEOUT, dispatch_due_reminders
+from AgroAssist_Backend.tasks.models import FarmerTask, TaskLog, TaskReminder
+from AgroAssist_Backend.testing import ROWS_PER_MODEL, seed_api_data
+from AgroAssist_Backend.urls import router
+from AgroAssist_Backend.weather.models import FarmersWeatherAlert
+
+
+def budgeted_requests(sample_params):
+    """Yield (label, url, params, budget) for every budgeted action in router.registry."""
+    for prefix, viewset, basename in router.registry:
+        budgets = getattr(viewset, 'query_budgets', {})
+        extra_actions = {action.__name__: action for action in viewset.get_extra_actions()}
+        for action_name, budget in budgets.items():
+            if action_name == 'list':
+                url = reverse(f'{basename}-list')
+            elif action_name == 'retrieve':
+                pk = viewset.queryset.model.objects.order_by('pk').values_list('pk', flat=True).first()
+                url = reverse(f'{basename}-detail', args=[pk])
+            else:
+                extra = extra_actions[action_name]
+                args = [viewset.queryset.model.objects.order_by('pk').values_list('pk', flat=True).first()] if extra.detail else []
+                url = reverse(f'{basename}-{extra.url_name}', args=args)
+            yield f'{prefix}:{action_name}', url, sample_params, budget
+
+
+class StatelessTokenAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.farmer = Farmer.objects.get()
+        cls.user = User.objects.create_user('token_farmer', 'token_farmer@example.com', 'pw', first_name='Asha')
+        Farmer.objects.filter(pk=cls.farmer.pk).update(user=cls.user)
+
+    def setUp(self):
+        clear_user_cache()
+        self.addCleanup(clear_user_cache)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token}')
+        return StatelessTokenAuthentication().authenticate(request)[0]
+
+    def test_claims_round_trip_through_the_cache(self):
+        token = issue_auth_token(self.user, farmer=self.farmer)
+        # First use verifies against the users table (user + farmer link in one query).
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertEqual((user.pk, user.username, user.is_staff, user.farmer_id),
+                         (self.user.pk, 'token_farmer', False, self.farmer.pk))
+        with self.assertNumQueries(0):
+            cached = self.authenticate(token)
+        self.assertIsInstance(cached, CachedTokenUser)
+        self.assertEqual(cached, self.user)
+
+        response = APIClient().get(reverse('auth-me'), HTTP_AUTHORIZATION=f'Token {token}')
+        self.assertEqual((response.status_code, response.data['farmer_id']), (200, self.farmer.pk))
+        with self.assertRaisesMessage(AuthenticationFailed, 'Invalid token.'):
+            self.authenticate(token + 'x')
+
+    def test_password_active_and_role_changes_revoke_tokens(self):
+        changes = {
+            'password': lambda user: user.set_password('new-pw'),
+            'is_active': lambda user: setattr(user, 'is_active', False),
+            'is_staff': lambda user: setattr(user, 'is_staff', True),
+            'is_superuser': lambda user: setattr(user, 'is_superuser', True),
+        }
+        for field, change in changes.items():
+            with self.subTest(field=field):
+                user = User.objects.create_user(f'revoke_{field}', f'revoke_{field}@example.com', 'pw')
+                token = issue_auth_token(user)
+                self.authenticate(token)
+                change(user)
+                user.save()
+                with self.assertRaises(AuthenticationFailed):
+                    self.authenticate(token)
+                # A fresh token for the changed account works.
+                if user.is_active:
+                    self.assertEqual(self.authenticate(issue_auth_token(user)).pk, user.pk)
+
+        # Without signals (queryset update) the auth version check alone rejects the token once the entry is gone.
+        token = issue_auth_token(self.user)
+        self.authenticate(token)
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        clear_user_cache()
+        with self.assertRaisesMessage(AuthenticationFailed, 'Token has been revoked.'):
+            self.authenticate(token)
+
+    def test_saving_or_deleting_the_user_evicts_its_entries(self):
+        user = User.objects.create_user('evicted', 'evicted@example.com', 'pw')
+        token = issue_auth_token(user)
+        self.authenticate(token)
+        user.first_name = 'Ravi'
+        user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate(token).first_name, 'Ravi')
+        user.delete()
+        with self.assertRaisesMessage(AuthenticationFailed, 'User not found or inactive.'):
+            self.authenticate(token)
+
+    def test_entries_expire_after_the_ttl_and_the_cache_is_bounded(self):
+        token = issue_auth_token(self.user)
+        with mock.patch.object(stateless_token_auth, '_USER_CACHE_TTL_SECONDS', -1):
+            for _ in range(2):
+                with self.assertNumQueries(1):
+                    self.authenticate(token)
+
+        others = [User.objects.create_user(f'lru{index}', f'lru{index}@example.com', 'pw') for index in range(2)]
+        first, second = (issue_auth_token(user) for user in others)
+        with mock.patch.object(stateless_token_auth, '_USER_CACHE_SIZE', 2):
+            self.authenticate(token)
+            self.authenticate(first)
+            self.authenticate(token)  # Most recently used again
+            self.authenticate(second)  # Evicts `first`, the least recently used
+            with self.assertNumQueries(0):
+                self.authenticate(token)
+            with self.assertNumQueries(1):
+                self.authenticate(first)
+
+    def test_cached_user_loads_the_row_only_for_other_attributes(self):
+        token = issue_auth_token(self.user)
+        self.authenticate(token)
+        user = self.authenticate(token)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.id, user.email, user.first_name, user.is_superuser),
+                             (self.user.pk, 'token_farmer@example.com', 'Asha', False))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.date_joined, self.user.date_joined)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.check_password('pw'))
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        stale = self.authenticate(token)
+        with self.assertRaisesMessage(AuthenticationFailed, 'User not found or inactive.'):
+            stale.last_login
+
+
+class FarmerUserLinkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=2)
+        cls.farmer, cls.other_farmer = Farmer.objects.order_by('pk')
+
+    def setUp(self):
+        clear_user_cache()
+        self.addCleanup(clear_user_cache)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token}')
+        return StatelessTokenAuthentication().authenticate(request)[0]
+
+    def test_backfill_links_farmers_to_users_by_email(self):
+        first = User.objects.create_user('backfill_first', 'FARMER0@example.com', 'pw')
+        User.objects.create_user('backfill_second', 'farmer0@EXAMPLE.com', 'pw')
+        Farmer.objects.update(user=None)
+        backfill = importlib.import_module('AgroAssist_Backend.farmers.migrations.0004_backfill_farmer_user')
+        backfill.link_farmers_to_users(apps, None)
+        # Case-insensitive match, the oldest account wins; farmers without an account stay unlinked.
+        self.assertEqual(
+            dict(Farmer.objects.values_list('pk', 'user')), {self.farmer.pk: first.pk, self.other_farmer.pk: None},
+        )
+
+    def test_saving_a_farmer_links_the_matching_user_and_evicts_its_cache(self):
+        user = User.objects.create_user('late_farmer', 'Late.Farmer@Example.com', 'pw')
+        token = issue_auth_token(user)
+        self.assertIsNone(self.authenticate(token).farmer_id)
+
+        farmer = Farmer.objects.create(
+            first_name='Late', last_name='Farmer', email='late.farmer@example.com', phone_number='9000000099',
+            address='Village Road', city='Pune', state='Maharashtra', postal_code=411001, land_area_hectares=1.0,
+        )
+        self.assertEqual(farmer.user_id, user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate(token).farmer_id, farmer.pk)
+
+    def test_creating_a_user_links_the_matching_farmer(self):
+        user = User.objects.create_user('farmer1_login', 'FARMER1@example.com', 'pw')
+        self.assertEqual(Farmer.objects.get(pk=self.other_farmer.pk).user_id, user.pk)
+        # A farmer already linked keeps its account.
+        User.objects.create_user('farmer1_again', 'farmer1@example.com', 'pw')
+        self.assertEqual(Farmer.objects.get(pk=self.other_farmer.pk).user_id, user.pk)
+
+    def test_farmers_only_see_their_own_rows(self):
+        user = User.objects.create_user('own_rows', 'farmer0@example.com', 'pw')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {issue_auth_token(user, farmer=self.farmer)}')
+        own_rows = {
+            'farmers-list': Farmer.objects.filter(pk=self.farmer.pk),
+            'farmer-crops-list': FarmerCrop.objects.filter(farmer=self.farmer),
+            'inventory-list': FarmerInventory.objects.filter(farmer=self.farmer),
+            'tasks-list': FarmerTask.objects.filter(farmer=self.farmer),
+            'task-reminders-list': TaskReminder.objects.filter(task__farmer=self.farmer),
+            'task-logs-list': TaskLog.objects.filter(task__farmer=self.farmer),
+            'weather-alerts-list': FarmersWeatherAlert.objects.filter(farmer=self.farmer),
+        }
+        for name, rows in own_rows.items():
+            with self.subTest(endpoint=name):
+                data = client.get(reverse(name)).data
+                results = data['results'] if isinstance(data, dict) else data
+                self.assertEqual({row['id'] for row in results}, set(rows.values_list('pk', flat=True)))
+                self.assertTrue(results)
+        other_crop = FarmerCrop.objects.filter(farmer=self.other_farmer).values_list('pk', flat=True).first()
+        self.assertEqual(client.get(reverse('farmer-crops-detail', args=[other_crop])).status_code, 404)
+        self.assertEqual(client.get(reverse('farmers-detail', args=[self.other_farmer.pk])).status_code, 404)
+
+
+class FarmerDetailDocumentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('document_admin', 'document_admin@example.com', 'pw', is_staff=True)
+        cls.farmer = Farmer.objects.get()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('farmers-detail', args=[self.farmer.pk])
+
+    def document(self):
+        return FarmerDetailDocument.objects.get(farmer=self.farmer)
+
+    def test_first_read_stores_the_document(self):
+        self.assertFalse(FarmerDetailDocument.objects.exists())
+        payload = self.client.get(self.url).data
+        document = self.document()
+        self.assertEqual((document.payload, document.built_on, document.version), (payload, timezone.localdate(), 0))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).data, payload)
+
+    def test_farmer_child_and_crop_writes_invalidate_the_document(self):
+        farmer_crop = FarmerCrop.objects.filter(farmer=self.farmer, status='Growing').get()
+        inventory = FarmerInventory.objects.filter(farmer=self.farmer, item_name='Urea').get()
+        farmer = Farmer.objects.get(pk=self.farmer.pk)
+        crop = farmer_crop.crop
+
+        def save(instance, **fields):
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            instance.save()
+
+        checks = [
+            ('farmer', lambda: save(farmer, first_name='Renamed'),
+             lambda payload: payload['first_name'] == 'Renamed'),
+            ('farmer crop', lambda: save(farmer_crop, status='Harvested'),
+             lambda payload: all(row['status'] == 'Harvested' for row in payload['farmer_crops'])),
+            ('inventory', lambda: save(inventory, quantity=9),
+             lambda payload: 9.0 in [row['quantity'] for row in payload['inventory_items']]),
+            ('inventory delete', lambda: inventory.delete(),
+             lambda payload: len(payload['inventory_items']) == 1),
+            ('crop', lambda: save(crop, name='Renamed crop'),
+             lambda payload: payload['farmer_crops'][0]['crop_name'] == 'Renamed crop'),
+        ]
+        for label, write, check in checks:
+            with self.subTest(write=label):
+                self.client.get(self.url)
+                version = self.document().version
+                write()
+                document = self.document()
+                self.assertIsNone(document.payload)
+                self.assertGreater(document.version, version)
+                self.assertTrue(check(self.client.get(self.url).data))
+
+    def test_documents_built_on_an_earlier_day_are_rebuilt(self):
+        payload = self.client.get(self.url).data
+        FarmerDetailDocument.objects.update(payload={'stale': True}, built_on=timezone.localdate() - timedelta(days=1))
+        self.assertEqual(self.client.get(self.url).data, payload)
+        self.assertEqual((self.document().payload, self.document().built_on), (payload, timezone.localdate()))
+
+    def test_write_during_the_first_build_is_not_stored_over(self):
+        build = documents.build_farmer_detail
+
+        def build_then_concurrent_write(farmer):
+            payload = build(farmer)
+            # Another request saves the farmer after this one has serialized it.
+            other = Farmer.objects.get(pk=farmer.pk)
+            other.first_name = 'Changed meanwhile'
+            other.save()
+            return payload
+
+        with mock.patch.object(documents, 'build_farmer_detail', build_then_concurrent_write):
+            self.assertEqual(self.client.get(self.url).data['first_name'], 'Farmer0')
+        self.assertIsNone(self.document().payload)
+        self.assertEqual(self.client.get(self.url).data['first_name'], 'Changed meanwhile')
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('budget_admin', 'budget_admin@example.com', 'pw', is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        # Budgets are for a warm catalog snapshot; building it is a one-off per version.
+        catalog.reset_catalog()
+        catalog.get_catalog()
+
+    def test_every_viewset_declares_list_and_retrieve_budgets(self):
+        for prefix, viewset, _basename in router.registry:
+            budgets = getattr(viewset, 'query_budgets', {})
+            self.assertIn('list', budgets, f'{prefix} has no list query budget')
+            self.assertIn('retrieve', budgets, f'{prefix} has no retrieve query budget')
+
+    def test_actions_stay_within_query_budget(self):
+        sample_params = {
+            'season': 'Kharif',
+            'soil_type': 'Loamy',
+            'soil': 'Loamy',
+            'level': 'Beginner',
+            'city': 'Pune',
+            'type': 'Seeds',
+            'crop_id': Crop.objects.order_by('pk').values_list('pk', flat=True).first(),
+        }
+        for label, url, params, budget in budgeted_requests(sample_params):
+            with self.subTest(label):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200, response.content)
+                self.assertLessEqual(
+                    len(queries),
+                    budget,
+                    f'{label} ran {len(queries)} queries (budget {budget}):\n'
+                    + '\n'.join(query['sql'] for query in queries.captured_queries),
+                )
+
+
+class FarmerRecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('suitability_admin', 'suitability_admin@example.com', 'pw', is_staff=True)
+        cls.farmer = Farmer.objects.order_by('pk').first()
+        cls.sandy_crop = Crop.objects.create(
+            name='Millet', season='Summer', soil_type='Sandy', growth_duration_days=90,
+            optimal_temperature=38.0, optimal_humidity=20.0, optimal_soil_moisture=10.0,
+            water_required_mm_per_week=60,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        catalog.reset_catalog()
+        self.url = reverse('farmers-recommendations', args=[self.farmer.pk])
+
+    def test_crops_are_ranked_with_breakdown(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['weather']['days'], ROWS_PER_MODEL)
+        results = response.data['results']
+        self.assertEqual(len(results), Crop.objects.count())
+        self.assertEqual(results[-1]['crop']['id'], self.sandy_crop.pk)
+        self.assertEqual(
+            set(results[0]['breakdown']), {'soil', 'temperature', 'humidity', 'soil_moisture', 'water'},
+        )
+        scores = [row['score'] for row in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        # 25 mm/week default need, no forecast rain, 2 hectares.
+        self.assertEqual(results[0]['irrigation_m3_per_week'], 500.0)
+
+    def test_season_and_limit(self):
+        response = self.client.get(self.url, {'season': 'Summer'})
+        self.assertEqual([row['crop']['id'] for row in response.data['results']], [self.sandy_crop.pk])
+        self.assertEqual(len(self.client.get(self.url, {'limit': 2}).data['results']), 2)
+        self.assertEqual(self.client.get(self.url, {'limit': 'x'}).status_code, 400)
+
+    def test_without_forecasts_only_soil_is_scored(self):
+        Farmer.objects.filter(pk=self.farmer.pk).update(city='Nagpur')
+        response = self.client.get(self.url)
+        self.assertIsNone(response.data['weather'])
+        self.assertEqual(set(response.data['results'][0]['breakdown']), {'soil'})
+        self.assertEqual(response.data['results'][0]['score'], 1.0)
+
+    def test_blank_and_partial_cities_get_no_weather(self):
+        windows = forecast_windows(['', 'Pun', 'pune'], timezone.localdate())
+        self.assertEqual((windows[''], windows['Pun'], windows['pune']['days']), (None, None, ROWS_PER_MODEL))
+        for city in ('', 'Pun'):
+            with self.subTest(city=city):
+                Farmer.objects.filter(pk=self.farmer.pk).update(city=city)
+                self.assertIsNone(self.client.get(self.url).data['weather'])
+
+    def test_precomputed_rankings_match_live_scoring(self):
+        live = self.client.get(self.url).data
+        self.assertEqual(precompute_recommendations(workers=1), Farmer.objects.count())
+        catalog.get_catalog()
+        with self.assertNumQueries(2):
+            stored = self.client.get(self.url).data
+        self.assertEqual(stored, live)
+
+        # Scoring in a process pool stores the same rows.
+        rows = list(PrecomputedRecommendation.objects.order_by('farmer').values_list('farmer', 'results'))
+        self.assertEqual(precompute_recommendations(workers=2, chunk_size=1), len(rows))
+        self.assertEqual(list(PrecomputedRecommendation.objects.order_by('farmer').values_list('farmer', 'results')), rows)
+
+    def test_farmers_changed_after_the_run_are_scored_live(self):
+        precompute_recommendations(workers=1, top=1)
+        self.assertEqual(len(self.client.get(self.url, {'limit': 2}).data['results']), 2)
+        Farmer.objects.get(pk=self.farmer.pk).save()
+        catalog.get_catalog()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'limit': 1})
+        self.assertEqual(len(response.data['results']), 1)
+
+    @override_settings(CRON_SECRET='nightly')
+    def test_cron_job_requires_the_secret(self):
+        url = reverse('job-precompute-recommendations')
+        self.assertEqual(APIClient().get(url).status_code, 403)
+        response = APIClient().get(url, HTTP_AUTHORIZATION='Bearer nightly')
+        self.assertEqual(response.data, {'farmers': Farmer.objects.count(), 'remaining': 0})
+
+    @override_settings(CRON_SECRET='nightly', CRON_RECOMMENDATION_BATCH=2)
+    def test_cron_job_scores_one_batch_per_call(self):
+        url = reverse('job-precompute-recommendations')
+        farmers = Farmer.objects.count()
+        self.assertGreater(farmers, 2)
+        calls = []
+        while not calls or calls[-1]['remaining']:
+            calls.append(APIClient().get(url, HTTP_AUTHORIZATION='Bearer nightly').data)
+        self.assertEqual([call['farmers'] for call in calls], [2] * (farmers // 2) + [farmers % 2] * (farmers % 2))
+        self.assertEqual(PrecomputedRecommendation.objects.count(), farmers)
+
+    @override_settings(CRON_SECRET='nightly', EPHEMERAL_DATABASE=True)
+    def test_cron_job_refuses_a_throwaway_database(self):
+        response = APIClient().get(reverse('job-precompute-recommendations'), HTTP_AUTHORIZATION='Bearer nightly')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(PrecomputedRecommendation.objects.exists())
+
+    def test_farmers_cannot_read_other_farmers(self):
+        user = User.objects.create_user('suitability_farmer', 'suitability_farmer@example.com', 'pw')
+        Farmer.objects.filter(pk=Farmer.objects.order_by('-pk').values('pk')[:1]).update(user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get(self.url).status_code, 404)
+
+
+class DailyDigestTests(TestCase):
+    LOG_CHANNELS = {name: {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender'}
+                    for name in ['SMS', 'WhatsApp', 'App', 'Email']}
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=2)
+        cls.today = timezone.localdate()
+        now = timezone.now()
+        Farmer.objects.filter(first_name='Farmer1').update(preferred_language='Marathi')
+        task = FarmerTask.objects.get(farmer__first_name='Farmer0', task_name='Irrigate')
+        TaskReminder.objects.create(task=task, reminder_channel='WhatsApp', reminder_date=cls.today,
+                                    reminder_message='Irrigate today')
+        TaskReminder.objects.create(task=task, reminder_channel='SMS', reminder_date=cls.today + timedelta(days=1),
+                                    reminder_message='Irrigate tomorrow')
+        for title, severity, expires_at in [('Frost', 'Critical', None), ('Old heat', 'High', now - timedelta(hours=1))]:
+            FarmersWeatherAlert.objects.create(
+                farmer=task.farmer, alert_title=title, alert_message=title, severity=severity, alert_type='Frost',
+                issued_at=now - timedelta(hours=2), expires_at=expires_at,
+            )
+
+    def send(self, **channel_options):
+        with tempfile.NamedTemporaryFile('r', suffix='.jsonl') as out:
+            channels = {name: {'BACKEND': 'AgroAssist_Backend.tasks.senders.FileSender',
+                               'OPTIONS': {'path': out.name}, **channel_options}
+                        for name in ['SMS', 'WhatsApp', 'App', 'Email']}
+            totals = send_daily_digests(self.today, channels=channels)
+            return totals, {line['to']: line for line in map(json.loads, out)}
+
+    def test_one_message_per_farmer_in_their_language(self):
+        with self.assertNumQueries(9):
+            totals, lines = self.send()
+        self.assertEqual(totals, {'digests': 2, 'reminders': 3, 'alerts': 3, 'failed': 0})
+        english = lines['9000000000']
+        self.assertEqual(english['channel'], 'WhatsApp')
+        self.assertEqual(english['text'].splitlines(), [
+            f'AgroAssist update for Farmer0 ({self.today.isoformat()})',
+            'Tasks due:',
+            f'- Irrigate (due {self.today.isoformat()})',
+            'Weather alerts:',
+            '- Frost [Critical]',
+            '- Rain [High]',
+        ])
+        self.assertTrue(lines['9000000001']['text'].startswith('Farmer1 साठी AgroAssist अपडेट'))
+
+        self.assertEqual(set(TaskReminder.objects.filter(is_sent=False).values_list('reminder_message', flat=True)),
+                         {'Irrigate tomorrow'})
+        self.assertEqual(set(FarmersWeatherAlert.objects.filter(notified_at__isnull=True).values_list(
+            'alert_title', flat=True)), {'Old heat'})
+        self.assertEqual(self.send()[0], {'digests': 0, 'reminders': 0, 'alerts': 0, 'failed': 0})
+
+    def test_failed_digest_leaves_its_rows_unsent(self):
+        totals, _ = self.send(BACKEND='AgroAssist_Backend.testing.FailingSender')
+        self.assertEqual(totals, {'digests': 0, 'reminders': 0, 'alerts': 0, 'failed': 2})
+        self.assertEqual(TaskReminder.objects.filter(attempts=1, is_sent=False).count(), 3)
+        self.assertFalse(FarmersWeatherAlert.objects.filter(notified_at__isnull=False).exists())
+
+    def test_dispatcher_leaves_todays_reminders_to_the_digest(self):
+        task = FarmerTask.objects.get(farmer__first_name='Farmer0', task_name='Irrigate')
+        TaskReminder.objects.create(task=task, reminder_channel='SMS', reminder_date=self.today - timedelta(days=1),
+                                    reminder_message='Irrigate yesterday')
+        # A dispatcher running before the digest only takes the earlier day's reminder.
+        self.assertEqual(dispatch_due_reminders(self.today, channels=self.LOG_CHANNELS), {'sent': 1, 'failed': 0})
+        self.assertEqual(self.send()[0]['reminders'], 3)
+        self.assertEqual(set(TaskReminder.objects.filter(is_sent=False).values_list('reminder_message', flat=True)),
+                         {'Irrigate tomorrow'})
+
+    def test_failed_digest_reminders_fall_back_to_the_dispatcher(self):
+        self.send(BACKEND='AgroAssist_Backend.testing.FailingSender')
+        TaskReminder.objects.update(claimed_at=timezone.now() - CLAIM_TIMEOUT - timedelta(seconds=1))
+        self.assertEqual(self.send()[0]['reminders'], 0)
+        self.assertEqual(dispatch_due_reminders(self.today, channels=self.LOG_CHANNELS), {'sent': 3, 'failed': 0})
+
+
+class BulkCSVImportTests(TestCase):
+    FARMER_HEADER = 'email,first_name,last_name,phone_number,address,city,state,postal_code,land_area_hectares,soil_type,experience_level\n'
+    TASK_HEADER = 'farmer_email,crop_name,crop_season,planting_date,task_name,due_date,status\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        Farmer.objects.create(
+            first_name='Asha', last_name='More', email='Asha.More@Example.com', phone_number='9111111111',
+            address='Ward 3', city='Nashik', state='Maharashtra', postal_code=422001, land_area_hectares=1.0,
+            soil_type='Clay', experience_level='Expert',
+        )
+        cls.login = User.objects.create_user('new_farmer', 'New.Farmer@example.com', 'pw')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def csv_file(self, name, text):
+        path = self.directory / name
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+
+    def test_farmers_upserted_in_chunks(self):
+        path = self.csv_file('farmers.csv', self.FARMER_HEADER + (
+            'new.farmer@example.com,New,Farmer,9222222222,Road 1,Pune,Maharashtra,411001,2.5,Loamy,Beginner\n'
+            'asha.more@example.com,Asha,Shinde,9111111112,Ward 3,Nashik,Maharashtra,422001,1.5,Clay,expert\n'
+            'copy@example.com,Copy,Cat,9222222222,Road 2,Pune,Maharashtra,411001,1,Loamy,Beginner\n'
+            '\n'
+            'bad@example.com,Bad,Row,9333333333,Road 3,Pune,Maharashtra,none,1,Loamy,Beginner\n'
+            'FARMER0@example.com,Ganesh,Patil,9000000000,Village Road,Pune,Maharashtra,411001,3,Loamy,Intermediate\n'
+        ))
+        result = bulk_import('farmers', path, chunk_size=2)
+
+        self.assertEqual({key: result[key] for key in ('rows', 'created', 'updated', 'skipped')},
+                         {'rows': 5, 'created': 1, 'updated': 2, 'skipped': 2})
+        # Blank lines are not rows; a chunk reports its invalid rows before the ones its writes rejected.
+        self.assertEqual(result['errors'], [
+            'farmers row 5: farmers.postal_code must be an integer (row 5).',
+            "farmers row 4: phone_number '9222222222' already belongs to new.farmer@example.com.",
+        ])
+        # Matched case-insensitively, like the email unique constraint.
+        asha = Farmer.objects.get(email='Asha.More@Example.com')
+        self.assertEqual((asha.last_name, asha.phone_number, asha.experience_level), ('Shinde', '9111111112', 'Expert'))
+        self.assertGreater(asha.updated_at, asha.created_at)
+        self.assertEqual(Farmer.objects.get(email='farmer0@example.com').first_name, 'Ganesh')
+        new_farmer = Farmer.objects.get(email='new.farmer@example.com')
+        self.assertEqual((new_farmer.contact_method, new_farmer.user_id), ('WhatsApp', self.login.pk))
+
+    def test_tasks_create_plantings_with_care_tasks(self):
+        crops = self.csv_file('crops.csv', (
+            'name,season,soil_type,growth_duration_days,optimal_temperature,optimal_humidity,optimal_soil_moisture\n'
+            'Crop 0,Kharif,Clay,100,26,65,45\n'
+            'Jowar,Rabi,Mixed,110,24,50,35\n'
+        ))
+        version = CatalogVersion.objects.get(pk=1).version
+        self.assertEqual(bulk_import('crops', crops)['created'], 1)
+        self.assertEqual(Crop.objects.get(name='Crop 0').growth_duration_days, 100)
+        self.assertEqual(CatalogVersion.objects.get(pk=1).version, version + 1)
+
+        tasks = self.csv_file('tasks.csv', self.TASK_HEADER + (
+            'farmer0@example.com,Crop 0,Kharif,2026-06-01,Spray,2026-06-20,Pending\n'
+            'farmer0@example.com,Crop 0,,2026-06-01,Spray,2026-06-20,Completed\n'
+            'farmer0@example.com,Jowar,Kharif,2026-06-01,Spray,2026-06-20,Pending\n'
+            'nobody@example.com,Crop 0,,2026-06-01,Spray,2026-06-20,Pending\n'
+        ))
+        result = bulk_import('tasks', tasks)
+        self.assertEqual((result['created'], result['updated'], result['skipped']), (1, 1, 2))
+        self.assertEqual(result['errors'], [
+            "tasks row 4: crop 'Jowar' with season 'Kharif' not found.",
+            "tasks row 5: farmer 'nobody@example.com' not found. Import farmers first.",
+        ])
+        planting = FarmerCrop.objects.get(farmer__email='farmer0@example.com', planting_date='2026-06-01')
+        self.assertEqual(
+            sorted(planting.tasks.values_list('task_name', 'status', 'is_completed')),
+            [('Spray', 'Completed', True), ('Weed', 'Pending', False)],
+        )
+
+        # Re-running updates the same task instead of adding one.
+        result = bulk_import('tasks', tasks, force=True)
+        self.assertEqual((result['created'], result['updated']), (0, 2))
+        self.assertEqual(planting.tasks.count(), 2)
+
+    def test_checkpoint_resume_and_unchanged_skip(self):
+        lines = [
+            f'resume{index}@example.com,Re,Sume,95000000{index:02d},Road,Pune,Maharashtra,411001,1,Loamy,Beginner\n'
+            for index in range(5)
+        ]
+        path = self.csv_file('farmers.csv', self.FARMER_HEADER + ''.join(lines))
+
+        class Stopped(Exception):
+            pass
+
+        def stop_after_two_chunks(section, result):
+            if result['rows'] == 4:
+                raise Stopped
+
+        with self.assertRaises(Stopped):
+            bulk_import('farmers', path, chunk_size=2, progress=stop_after_two_chunks)
+        checkpoint = ImportCheckpoint.objects.get(section='farmers')
+        self.assertEqual((checkpoint.last_row, checkpoint.rows, checkpoint.created), (5, 4, 4))
+        self.assertEqual(checkpoint.byte_offset, len((self.FARMER_HEADER + ''.join(lines[:4])).encode()))
+        self.assertIsNone(checkpoint.completed_at)
+
+        # Drop a committed row: resuming must not read it again.
+        Farmer.objects.filter(email='resume0@example.com').delete()
+        result = bulk_import('farmers', path, chunk_size=2, resume=True)
+        self.assertEqual((result['status'], result['resumed_rows'], result['rows'], result['created']),
+                         ('resumed', 4, 5, 5))
+        self.assertEqual(Farmer.objects.filter(email__startswith='resume').count(), 4)
+
+        self.assertEqual(bulk_import('farmers', path, resume=True)['status'], 'unchanged')
+        out = io.StringIO()
+        call_command('import_csv_data', '--farmers', path, '--bulk', stdout=out)
+        self.assertIn('already imported unchanged', out.getvalue())
+        self.assertIn('Farmers: created=0, updated=0, unchanged=0, skipped=0', out.getvalue())
+
+        # force=True starts from the top; the rows still stored as in the file are not written again.
+        result = bulk_import('farmers', path, force=True)
+        self.assertEqual((result['status'], result['rows'], result['created'], result['updated'], result['unchanged']),
+                         ('imported', 5, 1, 0, 4))
+        self.assertTrue(Farmer.objects.filter(email='resume0@example.com').exists())
+        self.assertEqual(ImportCheckpoint.objects.count(), 1)
+
+    def test_unchanged_rows_are_not_written(self):
+        crops = self.csv_file('crops.csv', (
+            'name,season,soil_type,growth_duration_days,optimal_temperature,optimal_humidity,optimal_soil_moisture,'
+            'expected_yield_per_hectare\n'
+            'Sorghum,Rabi,Mixed,110,24,50,35,2500.5\n'
+        ))
+        self.assertEqual(bulk_import('crops', crops)['created'], 1)
+        version = CatalogVersion.objects.get(pk=1).version
+        # The stored Decimal('2500.50') matches the CSV's 2500.5: nothing is written, the catalog stays current.
+        result = bulk_import('crops', crops, force=True)
+        self.assertEqual((result['created'], result['updated'], result['unchanged']), (0, 0, 1))
+        self.assertEqual(CatalogVersion.objects.get(pk=1).version, version)
+
+        path = self.csv_file('farmers.csv', self.FARMER_HEADER + (
+            'same@example.com,Sa,Me,9555555555,Road 5,Pune,Maharashtra,411001,2,Loamy,Beginner\n'
+        ))
+        out = io.StringIO()
+        call_command('import_csv_data', '--farmers', path, stdout=out)
+        updated_at = Farmer.objects.get(email='same@example.com').updated_at
+        call_command('import_csv_data', '--farmers', path, stdout=out)
+        self.assertIn('Farmers: created=0, updated=0, unchanged=1, skipped=0', out.getvalue())
+        self.assertEqual(Farmer.objects.get(email='same@example.com').updated_at, updated_at)
+
+        # An edit made since the import is not in the fingerprint: the row is written back.
+        Farmer.objects.filter(email='same@example.com').update(city='Nashik')
+        result = bulk_import('farmers', path)
+        self.assertEqual((result['updated'], result['unchanged']), (1, 0))
+        self.assertEqual(Farmer.objects.get(email='same@example.com').city, 'Pune')
+
+    def test_worker_pool_writes_in_file_order(self):
+        lines = [
+            f'pool{index}@example.com,Po,Ol,96000000{index:02d},Road,Pune,Maharashtra,'
+            f'{"bad" if index % 3 == 0 else 411001},1,Loamy,Beginner\n'
+            for index in range(9)
+        ]
+        path = self.csv_file('farmers.csv', self.FARMER_HEADER + ''.join(lines))
+        committed = []
+        result = bulk_import('farmers', path, chunk_size=2, workers=2,
+                             progress=lambda section, result: committed.append(result['rows']))
+
+        self.assertEqual((result['rows'], result['created'], result['skipped']), (9, 6, 3))
+        self.assertEqual([error.split(':')[0] for error in result['errors']],
+                         ['farmers row 2', 'farmers row 5', 'farmers row 8'])
+        self.assertEqual(committed, [2, 4, 6, 8, 9, 9])
+        self.assertEqual(set(result['seconds']), {'read', 'validate', 'write'})
+        self.assertEqual(ImportCheckpoint.objects.get(section='farmers').last_row, 10)
+
+    def test_command_dry_run_rolls_back(self):
+        path = self.csv_file('farmers.csv', self.FARMER_HEADER + (
+            'dry.run@example.com,Dry,Run,9444444444,Road 4,Pune,Maharashtra,411001,2,Loamy,Beginner\n'
+        ))
+        out = io.StringIO()
+        call_command('import_csv_data', '--farmers', path, '--bulk', '--dry-run', stdout=out)
+        self.assertIn('Farmers: created=1, updated=0, unchanged=0, skipped=0', out.getvalue())
+        self.assertFalse(Farmer.objects.filter(email='dry.run@example.com').exists())
+
+        call_command('import_csv_data', '--farmers', path, '--bulk', '--chunk-size', '1', stdout=out)
+        self.assertTrue(Farmer.objects.filter(email='dry.run@example.com').exists())
+
+
+class ImportJobTests(TestCase):
+    FARMER_HEADER = BulkCSVImportTests.FARMER_HEADER
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('import_admin', 'import_admin@example.com', 'pw', is_staff=True)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.upload_dir = Path(directory.name)
+        settings_override = override_settings(IMPORT_UPLOAD_DIR=self.upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, body, **params):
+        url = reverse('import-jobs-list') + '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.generic('POST', url, body.encode(), content_type='text/csv')
+
+    def test_upload_is_queued_and_worker_reports_progress(self):
+        lines = [
+            f'job{index}@example.com,Jo,B,97000000{index:02d},Road,Pune,Maharashtra,'
+            f'{"bad" if index in (1, 4) else 411001},1,Loamy,Beginner\n'
+            for index in range(5)
+        ]
+        body = self.FARMER_HEADER + ''.join(lines)
+        response = self.upload(body, section='farmers', name='farmers.csv')
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual((response.data['status'], response.data['file_size']), ('queued', len(body)))
+        self.assertTrue(response['Location'].endswith(reverse('import-jobs-detail', args=[response.data['id']])))
+        # Nothing is imported until a worker picks the job up.
+        self.assertFalse(Farmer.objects.filter(email__startswith='job').exists())
+        self.assertEqual(len(list(self.upload_dir.iterdir())), 1)
+
+        out = io.StringIO()
+        call_command('run_import_jobs', '--chunk-size', '2', stdout=out)
+        self.assertIn('completed: 5 rows, created=3', out.getvalue())
+        self.assertEqual(Farmer.objects.filter(email__startswith='job').count(), 3)
+        self.assertEqual(list(self.upload_dir.iterdir()), [])
+
+        job = self.client.get(response['Location']).data
+        self.assertEqual(
+            {key: job[key] for key in ('status', 'rows', 'created', 'skipped', 'byte_offset', 'progress_percent')},
+            {'status': 'completed', 'rows': 5, 'created': 3, 'skipped': 2, 'byte_offset': len(body),
+             'progress_percent': 100.0},
+        )
+        self.assertGreater(job['rows_per_second'], 0)
+
+        errors_url = reverse('import-jobs-errors', args=[job['id']])
+        page = self.client.get(errors_url, {'page_size': 1}).data
+        self.assertEqual((page['count'], page['results'][0]['row_number']), (2, 3))
+        page = self.client.get(errors_url, {'page_size': 1, 'page': 2}).data
+        self.assertEqual(page['results'], [{'row_number': 6, 'message': 'farmers.postal_code must be an integer (row 6).'}])
+
+    def test_upload_is_validated_and_admin_only(self):
+        self.assertEqual(self.upload(self.FARMER_HEADER, section='weather').status_code, 400)
+        self.assertEqual(self.upload(self.FARMER_HEADER, section='farmers', encoding='nope').status_code, 400)
+        self.assertEqual(self.upload('', section='farmers').status_code, 400)
+        self.assertFalse(ImportJob.objects.exists())
+
+        farmer_user = User.objects.create_user('plain_user', 'plain_user@example.com', 'pw')
+        self.client.force_authenticate(farmer_user)
+        self.assertEqual(self.upload(self.FARMER_HEADER, section='farmers').status_code, 403)
+
+    def test_stalled_job_is_taken_over_and_bad_file_fails(self):
+        response = self.upload('name,season\nRice,Kharif\n', section='crops')
+        job = claim_next_job()
+        self.assertEqual((job.pk, job.status, job.attempts), (response.data['id'], 'running', 1))
+        # A second worker leaves a job alone while its worker reports progress...
+        self.assertIsNone(claim_next_job())
+        # ...and takes it over once the worker went quiet.
+        job = claim_next_job(timezone.now() + IMPORT_CLAIM_TIMEOUT + timedelta(minutes=1))
+        self.assertEqual(job.attempts, 2)
+
+        job = run_import_job(job)
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('missing required columns', job.message)
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(Path(job.file_path).exists())
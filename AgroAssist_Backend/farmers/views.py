@@ -1,19 +1,30 @@
 # Import ViewSet and filtering tools from Django REST Framework
+import codecs
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.urls import reverse
+from django.utils import timezone
 
 # Import models and serializers
-from .models import Farmer, FarmerCrop, FarmerInventory
+from .csv_validation import SECTIONS
+from .documents import farmer_detail_document
+from .import_jobs import enqueue_import
+from .mixins import LinkedFarmerMixin
+from .models import Farmer, FarmerCrop, FarmerInventory, ImportJob
+from .recommendations import DEFAULT_DAYS, stored_recommendations
 from .serializers import (FarmerSerializer, FarmerCropSerializer, FarmerInventorySerializer,
-                         FarmerDetailSerializer, CreateFarmerSerializer)
-
-
-def _linked_farmer_for_user(user):
-    return Farmer.objects.filter(email__iexact=user.email).first()
+                         FarmerDetailSerializer, CreateFarmerSerializer, ImportJobSerializer,
+                         ImportJobErrorSerializer)
+from AgroAssist_Backend.crops.catalog import get_catalog
+from AgroAssist_Backend.crops.suitability import forecast_window, recommend_crops
+from AgroAssist_Backend.fast_lists import FastListMixin
+from AgroAssist_Backend.pagination import KeysetPagination
+from AgroAssist_Backend.sparse_fields import SparseQuerysetMixin, apply_sparse_fields
 
 
 # PAGINATION CLASS - Show 20 results per page
@@ -24,7 +35,7 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 
 # VIEWSET 1: FarmerViewSet - API for farmer accounts
-class FarmerViewSet(viewsets.ModelViewSet):
+class FarmerViewSet(LinkedFarmerMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     # ModelViewSet = Full CRUD (Create, Read, Update, Delete)
     
     queryset = Farmer.objects.all()  # All farmers
@@ -34,6 +45,11 @@ class FarmerViewSet(viewsets.ModelViewSet):
     ordering_fields = ['first_name', 'city', 'created_at', 'experience_level']  # Sort by these
     ordering = ['-created_at']  # Newest farmers first
     permission_classes = [IsAuthenticated]
+    sparse_queryset_actions = ('list',)  # retrieve reads the stored document (needs detail_document), not the serializer
+    # retrieve budget = a document's first build (row + insert + 2 prefetches + update); later reads take 1
+    query_budgets = {
+        'list': 2, 'retrieve': 5, 'by_experience': 2, 'by_soil': 2, 'by_city': 2, 'recommendations': 3,
+    }
 
     def get_permissions(self):
         if self.action in [
@@ -50,13 +66,19 @@ class FarmerViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        queryset = Farmer.objects.all()
+
+        # retrieve is served from the precomputed document (rebuilt with prefetches when stale)
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('detail_document')
+
         if user.is_staff or user.is_superuser:
-            return Farmer.objects.all()
+            return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if farmer:
-            return Farmer.objects.filter(id=farmer.id)
-        return Farmer.objects.none()
+        farmer_id = self.get_linked_farmer_id()
+        if farmer_id:
+            return queryset.filter(id=farmer_id)
+        return queryset.none()
     
     def get_serializer_class(self):
         # Use different serializer based on action (GET uses detailed, POST uses create)
@@ -72,6 +94,48 @@ class FarmerViewSet(viewsets.ModelViewSet):
         # For list/update/delete, use regular serializer
         return FarmerSerializer  # Standard serializer
     
+    def retrieve(self, request, *args, **kwargs):
+        # Full profile comes from the stored FarmerDetailSerializer document
+        farmer = self.get_object()
+        return Response(apply_sparse_fields(farmer_detail_document(farmer), request))
+    
+    # ACTION: Rank every crop for this farmer's soil, land and local forecast
+    @action(detail=True, methods=['get'])  # GET at /farmers/{id}/recommendations/
+    def recommendations(self, request, pk=None):
+        # Optional parameters: ?season=Rabi, ?limit=10 (max 100), ?days=7 (forecast window, max 16)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+            days = min(max(int(request.query_params.get('days', DEFAULT_DAYS)), 1), 16)
+        except ValueError:
+            return Response(
+                {'error': 'limit and days must be whole numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        farmer = self.get_object()  # Only the farmer's own profile unless admin
+        catalog = get_catalog()
+        season = request.query_params.get('season')
+        
+        # Default requests are served from tonight's precompute run (one indexed lookup)
+        if not season and days == DEFAULT_DAYS:
+            stored = stored_recommendations(farmer, catalog, limit)
+            if stored is not None:
+                return Response(stored)
+        
+        # Live scoring: one grouped query over the forecasts, matched to the farmer's city by whole words
+        weather = forecast_window(farmer.city, timezone.localdate(), days)
+        
+        # Every crop is scored at once from the in-memory catalog
+        results = recommend_crops(
+            catalog,
+            farmer.soil_type,
+            farmer.land_area_hectares,
+            weather=weather,
+            season=season,
+            limit=limit,
+        )
+        return Response({'farmer': farmer.id, 'weather': weather, 'results': results})
+    
     # ACTION: Get farmer by experience level
     @action(detail=False, methods=['get'])  # GET at /farmers/by_experience/
     def by_experience(self, request):
@@ -144,7 +208,7 @@ class FarmerViewSet(viewsets.ModelViewSet):
 
 
 # VIEWSET 2: FarmerCropViewSet - API for farmer's crops
-class FarmerCropViewSet(viewsets.ModelViewSet):
+class FarmerCropViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     # ModelViewSet = Full CRUD
     
     queryset = FarmerCrop.objects.all()  # All farmer crop records
@@ -154,6 +218,7 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
     search_fields = ['farmer__first_name', 'crop__name']  # Search by farmer/crop name
     ordering = ['-planting_date']  # Newest plantings first
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 2, 'retrieve': 1, 'current': 2, 'harvested': 2, 'by_season': 2}
 
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy', 'by_season']:
@@ -162,7 +227,7 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = FarmerCrop.objects.all()
+        queryset = FarmerCrop.objects.select_related('farmer', 'crop')
 
         if user.is_staff or user.is_superuser:
             farmer_id = self.request.query_params.get('farmer')
@@ -170,11 +235,11 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(farmer_id=farmer_id)
             return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if not farmer:
+        farmer_id = self.get_linked_farmer_id()
+        if not farmer_id:
             return queryset.none()
 
-        return queryset.filter(farmer=farmer)
+        return queryset.filter(farmer_id=farmer_id)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -182,7 +247,7 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
             serializer.save()
             return
 
-        farmer = _linked_farmer_for_user(user)
+        farmer = self.get_linked_farmer()
         if not farmer:
             raise PermissionDenied('No farmer profile linked to this user.')
         serializer.save(farmer=farmer)
@@ -226,7 +291,7 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
             )
         
         # Get crops of this season
-        crops = FarmerCrop.objects.filter(crop__season=season)
+        crops = FarmerCrop.objects.select_related('farmer', 'crop').filter(crop__season=season)
         
         page = self.paginate_queryset(crops)
         if page is not None:
@@ -238,7 +303,7 @@ class FarmerCropViewSet(viewsets.ModelViewSet):
 
 
 # VIEWSET 3: FarmerInventoryViewSet - API for inventory management
-class FarmerInventoryViewSet(viewsets.ModelViewSet):
+class FarmerInventoryViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     # ModelViewSet = Full CRUD
     
     queryset = FarmerInventory.objects.all()
@@ -248,6 +313,9 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
     search_fields = ['item_name', 'farmer__first_name']  # Search by item/farmer name
     ordering = ['-created_at']  # Newest items first
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': 2, 'retrieve': 1, 'for_farmer': 2, 'by_type': 2, 'expired': 2, 'expiring_soon': 2,
+    }
 
     def get_permissions(self):
         if self.action in [
@@ -262,7 +330,7 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = FarmerInventory.objects.all()
+        queryset = FarmerInventory.objects.select_related('farmer')
 
         if user.is_staff or user.is_superuser:
             farmer_id = self.request.query_params.get('farmer')
@@ -270,10 +338,10 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(farmer_id=farmer_id)
             return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if not farmer:
+        farmer_id = self.get_linked_farmer_id()
+        if not farmer_id:
             return queryset.none()
-        return queryset.filter(farmer=farmer)
+        return queryset.filter(farmer_id=farmer_id)
     
     # ACTION: Get inventory for a specific farmer
     @action(detail=False, methods=['get'])  # GET at /inventory/for_farmer/
@@ -301,7 +369,7 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
             )
         
         # Get items of this type
-        items = FarmerInventory.objects.filter(item_type=item_type)
+        items = FarmerInventory.objects.select_related('farmer').filter(item_type=item_type)
         
         page = self.paginate_queryset(items)
         if page is not None:
@@ -349,3 +417,77 @@ class FarmerInventoryViewSet(viewsets.ModelViewSet):
         
         serializer = FarmerInventorySerializer(items, many=True)
         return Response(serializer.data)
+
+
+# PAGINATION CLASS - Import jobs and their row errors (add ?cursor= for keyset paging through long error lists)
+class ImportJobPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'  # Allow ?page_size=100
+    max_page_size = 500  # Never give more than 500
+
+
+# VIEWSET 4: ImportJobViewSet - Upload CSV files to import in the background, then poll their progress
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    # ReadOnlyModelViewSet = list and detail; create (upload) is added below
+    
+    queryset = ImportJob.objects.all()  # All import jobs
+    serializer_class = ImportJobSerializer  # Progress counters as JSON
+    pagination_class = ImportJobPagination  # Paginate
+    filter_backends = [filters.OrderingFilter]  # Sort only
+    ordering = ['-created_at']  # Newest uploads first
+    permission_classes = [IsAdminUser]  # Only admins can import data
+    query_budgets = {'list': 2, 'retrieve': 1, 'errors': 3}
+    
+    @property
+    def cursor_ordering(self):
+        # ?cursor= paging order: a job's errors by row, jobs newest first (id breaks ties)
+        return ('row_number', 'id') if self.action == 'errors' else ('-created_at', 'id')
+    
+    def create(self, request):
+        # POST the CSV file itself as the body (Content-Type: text/csv) at /import-jobs/?section=farmers
+        # Optional: ?name=farmers.csv, ?delimiter=;, ?encoding=utf-8, ?force=true (import an unchanged file again)
+        # The body is written to disk as it streams in and a worker (run_import_jobs) imports it,
+        # so this returns 202 right away; poll the Location URL for progress.
+        params = request.query_params
+        section = params.get('section', '')
+        if section not in SECTIONS:
+            raise ValidationError({'section': f"Must be one of: {', '.join(SECTIONS)}."})
+        delimiter = params.get('delimiter', ',')
+        if len(delimiter) != 1:
+            raise ValidationError({'delimiter': 'Must be a single character.'})
+        encoding = params.get('encoding', 'utf-8')
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            raise ValidationError({'encoding': f"Unknown encoding '{encoding}'."})
+        if request.content_type.split(';')[0].strip() == 'multipart/form-data':
+            raise ValidationError('Send the CSV file as the request body (Content-Type: text/csv), not as a form.')
+        if request.stream is None:
+            raise ValidationError('Request body is empty.')
+        
+        try:
+            job = enqueue_import(
+                request.stream,
+                section,
+                file_name=params.get('name', f'{section}.csv'),
+                delimiter=delimiter,
+                encoding=encoding,
+                force=params.get('force', '').lower() in ('1', 'true', 'yes'),
+                requested_by_id=request.user.pk,  # Token users are cached snapshots, not User rows
+            )
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+        
+        serializer = self.get_serializer(job)
+        location = request.build_absolute_uri(reverse('import-jobs-detail', args=[job.pk]))
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+    
+    # ACTION: Every skipped row of a job with its reason, paged
+    @action(detail=True, methods=['get'])  # GET at /import-jobs/{id}/errors/
+    def errors(self, request, pk=None):
+        job = self.get_object()
+        row_errors = job.row_errors.order_by('row_number', 'id')
+        
+        page = self.paginate_queryset(row_errors)
+        serializer = ImportJobErrorSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,140 @@
+from datetime import datetime
+
+from django.utils import timezone
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ManyRelatedField, SerializerMethodField
+
+
+def request_today(context):
+    """Today's date, computed once per request instead of once per row and field."""
+    request = context.get('request')
+    if request is None:
+        return datetime.now().date()
+    if not hasattr(request, 'today'):
+        request.today = datetime.now().date()
+    return request.today
+
+
+def request_now(context):
+    """timezone.now(), computed once per request."""
+    request = context.get('request')
+    if request is None:
+        return timezone.now()
+    if not hasattr(request, 'now'):
+        request.now = timezone.now()
+    return request.now
+
+
+class _RowView:
+    """
+    Attribute access over a .values() dict, so get_<field> methods written
+    for model instances (obj.farmer.first_name) read 'farmer__first_name'.
+    """
+
+    __slots__ = ('_values', '_prefix', '_relations')
+
+    def __init__(self, values, relations, prefix=''):
+        self._values = values
+        self._relations = relations
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        key = self._prefix + name
+        if key in self._relations:
+            return _RowView(self._values, self._relations, key + '__')
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class ListPlan:
+    """Precomputed (name, values key, converter) accessors for one serializer's readable fields."""
+
+    def __init__(self, accessors, methods, paths, relations):
+        self.accessors = accessors
+        self.methods = methods
+        self.paths = paths
+        self.relations = relations
+
+    def represent(self, rows):
+        accessors = self.accessors
+        methods = self.methods
+        relations = self.relations
+        data = []
+        for values in rows:
+            row_view = _RowView(values, relations) if methods else None
+            item = {}
+            for name, key, convert in accessors:
+                if key is None:
+                    item[name] = methods[name](row_view)
+                    continue
+                value = values[key]
+                # Same None short-circuit as Serializer.to_representation.
+                item[name] = None if value is None else convert(value)
+            data.append(item)
+        return data
+
+
+def _identity(value):
+    return value
+
+
+def compile_list_plan(serializer, extra_paths=()):
+    """
+    ListPlan for a (possibly ?fields=-trimmed) model serializer, or None when
+    a field cannot be read from .values() and the regular serializer must run.
+    """
+    dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+    accessors = []
+    methods = {}
+    paths = list(extra_paths)
+    for field in serializer._readable_fields:
+        name = field.field_name
+        if isinstance(field, SerializerMethodField):
+            if name not in dependencies:
+                return None
+            methods[name] = getattr(serializer, field.method_name)
+            paths.extend(dependencies[name])
+            accessors.append((name, None, None))
+        elif isinstance(field, (BaseSerializer, ManyRelatedField)) or field.source == '*' or '.' in field.source:
+            return None
+        elif isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+            # values('farmer') already yields the id the related field would render.
+            paths.append(field.source)
+            accessors.append((name, field.source, _identity))
+        elif isinstance(field, RelatedField):
+            return None
+        else:
+            paths.append(field.source)
+            accessors.append((name, field.source, field.to_representation))
+
+    paths = list(dict.fromkeys(paths))
+    relations = set()
+    for path in paths:
+        parts = path.split('__')
+        for depth in range(1, len(parts)):
+            relations.add('__'.join(parts[:depth]))
+    return ListPlan(accessors, methods, paths, relations)
+
+
+class FastListMixin:
+    """
+    Viewset mixin that serves the list action from .values() rows through a
+    ListPlan, skipping model instances and per-row serializer machinery. The
+    JSON is identical to the regular serializer's; views fall back to it
+    whenever the serializer has fields the plan cannot compile (e.g. ?expand=).
+    """
+
+    def list(self, request, *args, **kwargs):
+        cursor_fields = [name.lstrip('-') for name in getattr(self, 'cursor_ordering', ())]
+        plan = compile_list_plan(self.get_serializer(), extra_paths=cursor_fields)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*plan.paths)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.represent(page))
+        return Response(plan.represent(queryset))
@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    Views that declare cursor_ordering (e.g. ('-timestamp', 'id')) switch to
+    keyset paging when the request carries ?cursor= (empty for the first page).
+    Each page is a single "WHERE key past last row ORDER BY key LIMIT n" query,
+    so deep pages cost the same as page one and no COUNT(*) is run. The last
+    ordering field must be unique so rows with equal keys are never skipped.
+    """
+
+    page_size = 20
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = getattr(view, 'cursor_ordering', None)
+        self.use_cursor = bool(self.cursor_ordering) and self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._ordering(reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, ordering))
+
+        # One extra row tells us whether another page exists in this direction.
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page_rows = rows
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.page_rows:
+            # Stepped back past the first row: the previous page is page one.
+            return replace_query_param(self._base_url(), self.cursor_query_param, '')
+        return self._link(self.page_rows[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values = data['p']
+            if len(values) != len(self.cursor_ordering):
+                raise ValueError
+            position = [
+                self._field(name).to_python(value)
+                for name, value in zip(self.cursor_ordering, values)
+            ]
+            return position, bool(data.get('r'))
+        except (TypeError, KeyError, ValueError, UnicodeError, binascii.Error, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, position, reverse):
+        data = {'p': position}
+        if reverse:
+            data['r'] = 1
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def _field(self, name):
+        return self.model._meta.get_field(name.lstrip('-'))
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return list(self.cursor_ordering)
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.cursor_ordering]
+
+    def _after(self, position, ordering):
+        # (a, b) > (x, y) written out as a > x OR (a = x AND b > y), per direction.
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, position):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        # The redundant a >= x bound lets the database seek the index instead of scanning from the top.
+        first = ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': position[0]}) & condition
+
+    def _link(self, row, reverse):
+        position = []
+        for name in self.cursor_ordering:
+            field = self._field(name)
+            # Rows are model instances, or dicts when the view pages a .values() queryset.
+            value = row[field.name] if isinstance(row, dict) else field.value_from_object(row)
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        cursor = self.encode_cursor(position, reverse)
+        return replace_query_param(self._base_url(), self.cursor_query_param, cursor)
+
+    def _base_url(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
@@ -85,7 +85,11 @@ WSGI_APPLICATION = 'AgroAssist_Backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-if os.getenv('VERCEL') == '1':
+# On Vercel every instance works on its own /tmp copy of the bundled database:
+# writes last until the instance is recycled and other instances never see them.
+EPHEMERAL_DATABASE = os.getenv('VERCEL') == '1'
+
+if EPHEMERAL_DATABASE:
     source_db = BASE_DIR / 'db.sqlite3'
     runtime_db = Path('/tmp/db.sqlite3')
     if source_db.exists() and not runtime_db.exists():
@@ -220,3 +224,41 @@ REST_FRAMEWORK = {
 }
 
 
+
+# ==================== SCHEDULED JOBS ====================
+# The nightly jobs are management commands run by a scheduler (cron, Task
+# Scheduler) next to the real database; see "Scheduled Jobs" in README.md.
+# A scheduler that can only make HTTP calls may use /api/jobs/... with
+# "Authorization: Bearer <CRON_SECRET>" instead. Jobs are disabled while it is
+# unset, and refuse to run (503) on an EPHEMERAL_DATABASE, so vercel.json
+# declares no crons.
+CRON_SECRET = os.getenv('CRON_SECRET', '')
+# Farmers ranked per precompute-recommendations call; the scheduler calls it
+# again until "remaining" is 0.
+CRON_RECOMMENDATION_BATCH = int(os.getenv('CRON_RECOMMENDATION_BATCH', '2000'))
+
+# ==================== TASK REMINDERS ====================
+# Senders used by the dispatch_reminders command, per TaskReminder channel.
+# BACKEND = class from tasks/senders.py (or your own gateway sender),
+# CONCURRENCY = parallel sends, RATE_PER_SECOND = gateway limit (0 = none).
+REMINDER_CHANNELS = {
+    'SMS': {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender', 'CONCURRENCY': 4, 'RATE_PER_SECOND': 10},
+    'WhatsApp': {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender', 'CONCURRENCY': 8, 'RATE_PER_SECOND': 20},
+    'App': {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender', 'CONCURRENCY': 8, 'RATE_PER_SECOND': 0},
+    'Email': {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender', 'CONCURRENCY': 4, 'RATE_PER_SECOND': 14},
+}
+
+# DAILY_DIGESTS = send_daily_digests delivers the reminders due today (one
+# message per farmer) and dispatch_reminders only sends earlier days' reminders
+# and retries. False = dispatch_reminders sends every due reminder itself.
+DAILY_DIGESTS = True
+
+# plan_reminders creates reminders for pending tasks due within
+# REMINDER_PLAN_DAYS, this many days before due_date (0 = on the day).
+REMINDER_PLAN_DAYS = 7
+REMINDER_OFFSETS_DAYS = [1, 0]
+
+# ==================== CSV IMPORT JOBS ====================
+# CSV files uploaded to /api/import-jobs/ are stored here until the
+# run_import_jobs worker has imported them (the worker needs the same disk).
+IMPORT_UPLOAD_DIR = Path(os.getenv('IMPORT_UPLOAD_DIR', BASE_DIR / 'import_uploads'))
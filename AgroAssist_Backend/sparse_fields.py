@@ -0,0 +1,122 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListField, ManyRelatedField, SerializerMethodField
+
+
+def _split_param(request, name):
+    value = request.query_params.get(name, '')
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def sparse_field_params(request):
+    """(fields, omit, expand) from ?fields=a,b&omit=c&expand=d; fields is None when not given."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set(), set()
+    fields = _split_param(request, 'fields') if 'fields' in request.query_params else None
+    return fields, _split_param(request, 'omit'), _split_param(request, 'expand')
+
+
+def apply_sparse_fields(data, request):
+    """Apply ?fields= / ?omit= to an already-built payload dict (precomputed documents)."""
+    fields, omit, _expand = sparse_field_params(request)
+    if fields is None and not omit:
+        return data
+    return {key: value for key, value in data.items() if (fields is None or key in fields) and key not in omit}
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ?fields=, ?omit= and ?expand= on GET requests.
+
+    Dropped fields are removed before serialization, so their get_<field>
+    methods never run. Meta.expandable_fields maps a name to (source,
+    serializer class) for related rows the view already select_related()s;
+    expanding replaces the id with the nested object. Meta.field_dependencies
+    lists the model paths each method field reads, which lets the view trim
+    the SQL column list (see SparseQuerysetMixin).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit, expand = sparse_field_params(self._context.get('request'))
+        self._expanded = set()
+        if fields is None and not omit and not expand:
+            return
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in sorted(expand & set(expandable)):
+            source, serializer_class = expandable[name]
+            options = {'read_only': True}
+            if source != name:
+                options['source'] = source
+            self.fields[name] = serializer_class(**options)
+            self._expanded.add(name)
+
+        for name in list(self.fields):
+            if name in self._expanded:
+                continue
+            if (fields is not None and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+    def get_queryset_columns(self):
+        """
+        (only_paths, relations) covering the remaining fields, or None when
+        some field's inputs are unknown and the full row must be loaded.
+        """
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        expanded_paths = {expandable[name][0].replace('.', '__') for name in self._expanded}
+        # Nested rows are serialized in full, so the whole related model is loaded.
+        paths = set(expanded_paths)
+        for name, field in self.fields.items():
+            if name in self._expanded:
+                continue
+            if isinstance(field, SerializerMethodField):
+                if name not in dependencies:
+                    return None
+                paths.update(dependencies[name])
+            elif field.source == '*' or isinstance(field, (BaseSerializer, ListField, ManyRelatedField)):
+                return None
+            else:
+                paths.add(field.source.replace('.', '__'))
+
+        relations = set(expanded_paths)
+        for path in paths:
+            parts = path.split('__')
+            for depth in range(1, len(parts)):
+                relations.add('__'.join(parts[:depth]))
+        return paths, relations
+
+
+class SparseQuerysetMixin:
+    """
+    Viewset mixin that narrows the queryset to the columns and joins the
+    sparse serializer will actually read when ?fields= or ?omit= is given.
+    Actions missing from sparse_queryset_actions (custom actions, or a
+    retrieve that builds its payload without the serializer) are left alone.
+    """
+
+    sparse_queryset_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, omit, _expand = sparse_field_params(self.request)
+        if (fields is None and not omit) or self.action not in self.sparse_queryset_actions:
+            return queryset
+
+        serializer = self.get_serializer()
+        if not hasattr(serializer, 'get_queryset_columns'):
+            return queryset
+        columns = serializer.get_queryset_columns()
+        if columns is None:
+            return queryset
+        paths, relations = columns
+
+        model = queryset.model
+        paths.add(model._meta.pk.name)
+        # Keyset pagination reads the cursor fields off the last row.
+        paths.update(name.lstrip('-') for name in getattr(self, 'cursor_ordering', ()))
+
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        return queryset.only(*sorted(paths))
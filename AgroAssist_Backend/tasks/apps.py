@@ -4,3 +4,6 @@
 class TasksConfig(AppConfig):
     name = 'AgroAssist_Backend.tasks'
 
+    def ready(self):
+        # Connects care-task generation for new and re-planted farmer crops.
+        from . import signals  # noqa: F401
@@ -0,0 +1,222 @@
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import FarmerTask, TaskReminder
+
+# Failed sends are retried on later runs until a reminder has failed this often.
+MAX_SEND_ATTEMPTS = 3
+# Claims older than this belong to a crashed run and are taken over; failed sends wait as long before a retry.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+DEFAULT_CHANNEL = {'BACKEND': 'AgroAssist_Backend.tasks.senders.LogSender', 'OPTIONS': {}, 'CONCURRENCY': 4,
+                   'RATE_PER_SECOND': 0}
+
+# What dispatcher threads get: plain values, so senders never touch the database.
+ReminderMessage = namedtuple('ReminderMessage', 'id channel recipient text')
+
+
+class RateLimiter:
+    """Spaces calls from any number of threads at least 1/rate seconds apart (rate 0 = no limit)."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            slot = max(time.monotonic(), self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Channel:
+    """A channel's sender with its thread pool (CONCURRENCY) and RateLimiter (RATE_PER_SECOND)."""
+
+    def __init__(self, name, config):
+        config = {**DEFAULT_CHANNEL, **config}
+        self.sender = import_string(config['BACKEND'])(name, **config['OPTIONS'])
+        self.limiter = RateLimiter(config['RATE_PER_SECOND'])
+        self.executor = ThreadPoolExecutor(max_workers=config['CONCURRENCY'], thread_name_prefix=f'reminders-{name}')
+
+    def submit(self, message):
+        return self.executor.submit(self._deliver, message)
+
+    def _deliver(self, message):
+        self.limiter.wait()
+        self.sender.send(message)
+
+    def close(self):
+        self.executor.shutdown()
+        self.sender.close()
+
+
+class ChannelPool:
+    """Channels opened on first use from their config, shared by every batch of a run."""
+
+    def __init__(self, configs):
+        self.configs = configs
+        self.channels = {}
+
+    def send(self, messages):
+        """Send messages across the channel pools; {message.id: error text or None}."""
+        futures = {}
+        for message in messages:
+            if message.channel not in self.channels:
+                self.channels[message.channel] = Channel(message.channel, self.configs.get(message.channel, {}))
+            futures[self.channels[message.channel].submit(message)] = message.id
+        errors = {}
+        for future in as_completed(futures):
+            exc = future.exception()
+            errors[futures[future]] = None if exc is None else str(exc) or exc.__class__.__name__
+        return errors
+
+    def close(self):
+        for channel in self.channels.values():
+            channel.close()
+
+
+def file_channels(path, latency_ms=0):
+    """settings.REMINDER_CHANNELS with every sender swapped for a FileSender on `path` (benchmarks, dry runs)."""
+    return {
+        name: {**config, 'BACKEND': 'AgroAssist_Backend.tasks.senders.FileSender',
+               'OPTIONS': {'path': path, 'latency_ms': latency_ms}}
+        for name, config in settings.REMINDER_CHANNELS.items()
+    }
+
+
+def recipient(channel, farmer_id, email, phone_number):
+    if channel in ('SMS', 'WhatsApp'):
+        return phone_number
+    if channel == 'Email':
+        return email
+    return f'farmer:{farmer_id}'
+
+
+def claimable_reminders(today, now):
+    """Due, unsent reminders no live run has claimed and that have retries left."""
+    return TaskReminder.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_TIMEOUT),
+        is_sent=False,
+        reminder_date__lte=today,
+        attempts__lt=MAX_SEND_ATTEMPTS,
+    )
+
+
+def digest_reminders(today):
+    """Reminders a daily digest delivers: due today and not tried yet (failed ones fall back to dispatch)."""
+    return Q(reminder_date=today, attempts=0)
+
+
+def claim(reminders, now):
+    """
+    Claim the reminders in a claimable_reminders() queryset with one UPDATE
+    that repeats the claim conditions, so concurrent runs never claim the
+    same row. Returns the claim token, or None when nothing was claimed.
+    """
+    token = uuid.uuid4().hex
+    return token if reminders.update(claimed_at=now, claim_token=token) else None
+
+
+def claim_reminders(today, batch_size, now, skip_digest=False):
+    """
+    Claim up to batch_size due reminders for this run with one
+    UPDATE ... WHERE id IN (SELECT ... LIMIT n), leaving digest_reminders()
+    to send_daily_digests when skip_digest is set. Returns them as
+    ReminderMessages (id order of the claim).
+    """
+    claimable = claimable_reminders(today, now)
+    if skip_digest:
+        claimable = claimable.exclude(digest_reminders(today))
+    next_ids = claimable.order_by('reminder_date', 'pk').values('pk')[:batch_size]
+    token = claim(claimable.filter(pk__in=Subquery(next_ids)), now)
+    if token is None:
+        return []
+    rows = TaskReminder.objects.filter(claim_token=token).order_by().values_list(
+        'pk', 'task_id', 'reminder_channel', 'reminder_message',
+        'task__farmer_id', 'task__farmer__email', 'task__farmer__phone_number',
+    )
+    return [
+        (task_id, ReminderMessage(pk, channel, recipient(channel, farmer_id, email, phone), text))
+        for pk, task_id, channel, text, farmer_id, email, phone in rows
+    ]
+
+
+def record_sends(outcomes):
+    """
+    Record sent and failed reminders, given as (reminder id, task id, error
+    or None), with set-based UPDATEs (bulk_update's per-row CASE
+    expressions cost more than the sends): one for the sent rows, one per
+    distinct error, one for FarmerTask.reminder_sent_at. Call inside a
+    transaction. Returns the number sent.
+    """
+    now = timezone.now()
+    sent_ids = []
+    sent_task_ids = set()
+    failed_ids = {}
+    for reminder_id, task_id, error in outcomes:
+        if error is None:
+            sent_ids.append(reminder_id)
+            sent_task_ids.add(task_id)
+        else:
+            failed_ids.setdefault(error[:500], []).append(reminder_id)
+
+    TaskReminder.objects.filter(pk__in=sent_ids).update(
+        is_sent=True, sent_at=now, last_error='', claimed_at=None, claim_token='',
+    )
+    for error, ids in failed_ids.items():
+        # Left claimed (without a token) so the retry waits for CLAIM_TIMEOUT.
+        TaskReminder.objects.filter(pk__in=ids).update(
+            attempts=F('attempts') + 1, last_error=error, claimed_at=now, claim_token='',
+        )
+    FarmerTask.objects.filter(pk__in=sent_task_ids).update(reminder_sent_at=now, updated_at=now)
+    return len(sent_ids)
+
+
+def dispatch_due_reminders(today=None, batch_size=500, max_batches=None, channels=None, progress=None):
+    """
+    Send every due, unsent reminder: claim a batch, fan it out to the
+    per-channel thread pools, then mark the batch sent (or failed, for a
+    later retry) in bulk, until nothing is left or max_batches ran. With
+    settings.DAILY_DIGESTS on, today's untried reminders are left to
+    send_daily_digests, so the two never compete for a row.
+
+    `channels` maps channel name to {'BACKEND', 'OPTIONS', 'CONCURRENCY',
+    'RATE_PER_SECOND'} and defaults to settings.REMINDER_CHANNELS; channels
+    without an entry use the LogSender. Returns {'sent': n, 'failed': n}.
+    """
+    today = today or timezone.localdate()
+    pool = ChannelPool(settings.REMINDER_CHANNELS if channels is None else channels)
+    totals = {'sent': 0, 'failed': 0}
+    try:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            claimed = claim_reminders(today, batch_size, timezone.now(), skip_digest=settings.DAILY_DIGESTS)
+            if not claimed:
+                break
+            batches += 1
+
+            errors = pool.send(message for _, message in claimed)
+            with transaction.atomic():
+                sent = record_sends((message.id, task_id, errors[message.id]) for task_id, message in claimed)
+            totals['sent'] += sent
+            totals['failed'] += len(claimed) - sent
+            if progress:
+                progress(totals)
+    finally:
+        pool.close()
+    return totals
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from AgroAssist_Backend.crops.models import CropCareTask
+from AgroAssist_Backend.farmers.models import FarmerCrop
+
+from .models import FarmerTask, TaskLog
+from .recurrence import frequency_interval
+
+# Farmer crops in these states get no new tasks (historical records, imports).
+CLOSED_CROP_STATUSES = ('Harvested', 'Completed')
+
+
+def care_templates_by_crop(crop_ids=None):
+    """{crop_id: [CropCareTask, ...]} in recommended_dap order, from one query."""
+    templates = CropCareTask.objects.select_related('crop').order_by('crop_id', 'recommended_dap', 'id')
+    if crop_ids is not None:
+        templates = templates.filter(crop_id__in=set(crop_ids))
+    grouped = {}
+    for template in templates:
+        grouped.setdefault(template.crop_id, []).append(template)
+    return grouped
+
+
+def _repeat_until(farmer_crop, template):
+    # Repeating care stops at harvest.
+    if farmer_crop.expected_harvest_date:
+        return farmer_crop.expected_harvest_date
+    return farmer_crop.planting_date + timedelta(days=template.crop.growth_duration_days)
+
+
+def _task_description(template):
+    if template.instructions:
+        return f"{template.description}\n\n{template.instructions}"
+    return template.description
+
+
+def generate_care_tasks(farmer_crops, templates=None, reschedule=False):
+    """
+    Create the FarmerTask for every care-task template of each farmer crop
+    that does not have one yet, plus a 'Created' TaskLog per new task.
+    Templates with a repeating frequency become one task carrying the
+    recurrence rule (repeats are expanded virtually, see recurrence.py).
+    With reschedule=True (planting date changed) open generated tasks are
+    also moved to planting_date + recommended_dap, with an 'Updated' TaskLog.
+
+    Runs a fixed number of queries per call whatever the batch size: one
+    for templates (unless passed in), one for the existing generated tasks,
+    then bulk_create/bulk_update. Safe to re-run; the
+    (farmer_crop, care_task_template) unique constraint backs that up.
+    Returns (created, rescheduled).
+    """
+    farmer_crops = [fc for fc in farmer_crops if fc.status not in CLOSED_CROP_STATUSES]
+    if not farmer_crops:
+        return 0, 0
+    if templates is None:
+        templates = care_templates_by_crop(fc.crop_id for fc in farmer_crops)
+
+    try:
+        with transaction.atomic():
+            return _generate(farmer_crops, templates, reschedule)
+    except IntegrityError:
+        # A concurrent run inserted some of the same tasks; the retry sees them.
+        with transaction.atomic():
+            return _generate(farmer_crops, templates, reschedule)
+
+
+def _generate(farmer_crops, templates, reschedule):
+    existing = {}
+    for task in FarmerTask.objects.filter(
+        farmer_crop__in=[fc.pk for fc in farmer_crops],
+        care_task_template__isnull=False,
+        series__isnull=True,
+    ).only('id', 'farmer_crop_id', 'care_task_template_id', 'due_date', 'status', 'is_completed', 'repeat_until'):
+        existing[task.farmer_crop_id, task.care_task_template_id] = task
+
+    now = timezone.now()
+    new_tasks = []
+    moved_tasks = []
+    for farmer_crop in farmer_crops:
+        for template in templates.get(farmer_crop.crop_id, ()):
+            due_date = farmer_crop.planting_date + timedelta(days=template.recommended_dap)
+            repeat_every_days = frequency_interval(template.frequency)
+            repeat_until = _repeat_until(farmer_crop, template) if repeat_every_days else None
+            task = existing.get((farmer_crop.pk, template.pk))
+            if task is None:
+                new_tasks.append(FarmerTask(
+                    farmer_id=farmer_crop.farmer_id,
+                    farmer_crop=farmer_crop,
+                    care_task_template=template,
+                    task_name=template.task_name,
+                    task_description=_task_description(template),
+                    due_date=due_date,
+                    repeat_every_days=repeat_every_days,
+                    repeat_until=repeat_until,
+                ))
+            elif (reschedule and not task.is_completed and task.status in ('Pending', 'Overdue')
+                  and task.due_date != due_date):
+                # Planting date moved: keep open generated tasks on schedule.
+                task.due_date = due_date
+                task.repeat_until = repeat_until
+                task.status = 'Pending'
+                task.updated_at = now
+                moved_tasks.append(task)
+
+    # SQLite and PostgreSQL return primary keys from bulk_create, so logs can point at the new rows.
+    FarmerTask.objects.bulk_create(new_tasks, batch_size=1000)
+    FarmerTask.objects.bulk_update(moved_tasks, ['due_date', 'repeat_until', 'status', 'updated_at'], batch_size=1000)
+
+    logs = [
+        TaskLog(task=task, action='Created', description='Generated from crop care template',
+                metadata=f'template={task.care_task_template_id}')
+        for task in new_tasks
+    ] + [
+        TaskLog(task=task, action='Updated', description='Rescheduled after planting date change',
+                metadata=f'due_date={task.due_date.isoformat()}')
+        for task in moved_tasks
+    ]
+    TaskLog.objects.bulk_create(logs, batch_size=1000)
+    return len(new_tasks), len(moved_tasks)
+
+
+def generate_all_care_tasks(queryset=None, chunk_size=1000, reschedule=False, progress=None):
+    """
+    generate_care_tasks() over farmer crops in primary-key chunks (one
+    transaction each), for seasonal bulk runs. Returns (created, rescheduled).
+    """
+    queryset = (queryset if queryset is not None else FarmerCrop.objects.all()).exclude(
+        status__in=CLOSED_CROP_STATUSES,
+    ).only('id', 'farmer_id', 'crop_id', 'planting_date', 'expected_harvest_date', 'status')
+    templates = care_templates_by_crop()
+    created = rescheduled = 0
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+        if not chunk:
+            return created, rescheduled
+        last_pk = chunk[-1].pk
+        chunk_created, chunk_rescheduled = generate_care_tasks(chunk, templates, reschedule)
+        created += chunk_created
+        rescheduled += chunk_rescheduled
+        if progress:
+            progress(last_pk, created, rescheduled)
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0003_hot_path_indexes'),
+        ('farmers', '0006_hot_path_indexes'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmertask',
+            index=models.Index(fields=['farmer', 'due_date'], name='task_farmer_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmertask',
+            index=models.Index(fields=['due_date'], name='task_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmertask',
+            index=models.Index(fields=['status'], name='task_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmertask',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklog',
+            index=models.Index(fields=['-timestamp'], name='tasklog_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklog',
+            index=models.Index(fields=['task', '-timestamp'], name='tasklog_task_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(fields=['is_sent', 'reminder_date'], name='reminder_sent_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(fields=['reminder_date'], name='reminder_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(condition=models.Q(('is_sent', False)), fields=['reminder_date'], name='reminder_unsent_date_idx'),
+        ),
+    ]
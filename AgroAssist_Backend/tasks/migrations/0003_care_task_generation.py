@@ -0,0 +1,36 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:46
+
+from django.db import migrations, models
+
+
+def unlink_duplicate_template_tasks(apps, schema_editor):
+    FarmerTask = apps.get_model('tasks', 'FarmerTask')
+
+    # Keep the oldest task per (farmer_crop, care_task_template); later copies stay as plain tasks.
+    seen = set()
+    duplicate_ids = []
+    rows = FarmerTask.objects.filter(care_task_template__isnull=False).order_by('id')
+    for task_id, farmer_crop_id, template_id in rows.values_list('id', 'farmer_crop_id', 'care_task_template_id'):
+        if (farmer_crop_id, template_id) in seen:
+            duplicate_ids.append(task_id)
+        else:
+            seen.add((farmer_crop_id, template_id))
+
+    for start in range(0, len(duplicate_ids), 500):
+        FarmerTask.objects.filter(id__in=duplicate_ids[start:start + 500]).update(care_task_template=None)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0004_catalog_version'),
+        ('farmers', '0007_precomputed_recommendations'),
+        ('tasks', '0002_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(unlink_duplicate_template_tasks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='farmertask',
+            constraint=models.UniqueConstraint(condition=models.Q(('care_task_template__isnull', False)), fields=('farmer_crop', 'care_task_template'), name='task_crop_template_uniq'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crops', '0004_catalog_version'),
+        ('farmers', '0007_precomputed_recommendations'),
+        ('tasks', '0003_care_task_generation'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='farmertask',
+            name='task_crop_template_uniq',
+        ),
+        migrations.AddField(
+            model_name='farmertask',
+            name='occurrence_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmertask',
+            name='repeat_every_days',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmertask',
+            name='repeat_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='farmertask',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='tasks.farmertask'),
+        ),
+        migrations.AddIndex(
+            model_name='farmertask',
+            index=models.Index(condition=models.Q(('repeat_every_days__isnull', False)), fields=['due_date'], name='task_repeating_due_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='farmertask',
+            constraint=models.UniqueConstraint(condition=models.Q(('care_task_template__isnull', False), ('series__isnull', True)), fields=('farmer_crop', 'care_task_template'), name='task_crop_template_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='farmertask',
+            constraint=models.UniqueConstraint(condition=models.Q(('series__isnull', False)), fields=('series', 'occurrence_date'), name='task_series_occurrence_uniq'),
+        ),
+    ]
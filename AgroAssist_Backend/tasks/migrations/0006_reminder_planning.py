@@ -0,0 +1,17 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_reminder_dispatch_claims'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(fields=['task', 'reminder_channel', 'reminder_date'], name='reminder_task_channel_date_idx'),
+        ),
+    ]
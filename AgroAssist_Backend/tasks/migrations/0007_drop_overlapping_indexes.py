@@ -0,0 +1,17 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:49
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_reminder_planning'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskreminder',
+            name='reminder_sent_date_idx',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.3 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_drop_overlapping_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='taskreminder',
+            name='reminder_claim_token_idx',
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(fields=['claim_token'], name='reminder_claim_token_idx'),
+        ),
+    ]
@@ -63,6 +63,19 @@ class FarmerTask(models.Model):
     # IntegerField = Photos/evidence of task completion (number of photos)
     photo_count = models.IntegerField(default=0)  # How many proof photos farmer uploaded
     
+    # PositiveSmallIntegerField = Recurrence rule: repeat every N days after due_date (empty = one-off task)
+    repeat_every_days = models.PositiveSmallIntegerField(blank=True, null=True)  # e.g. 7 for a weekly care task
+    
+    # DateField = Last day the task can repeat on (usually the expected harvest)
+    repeat_until = models.DateField(blank=True, null=True)  # Empty = no end date
+    
+    # ForeignKey = For a repeat the farmer acted on: the repeating task it belongs to
+    # Repeats stay virtual (computed at query time) until a farmer starts or completes one
+    series = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='occurrences')  # Parent repeating task
+    
+    # DateField = Which repeat of the series this row is (due_date may be moved later)
+    occurrence_date = models.DateField(blank=True, null=True)
+    
     # DateTimeField = Auto-set when task created
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -74,6 +87,30 @@ class FarmerTask(models.Model):
         verbose_name = "Farmer Task"  # Display name (singular)
         verbose_name_plural = "Farmer Tasks"  # Display name (plural)
         ordering = ['due_date', '-importance']  # Sort by due date, then by importance
+        # indexes = Match the farmer-scoped list, status filters and open-task sweeps
+        indexes = [
+            models.Index(fields=['farmer', 'due_date'], name='task_farmer_due_idx'),
+            models.Index(fields=['due_date'], name='task_due_idx'),
+            models.Index(fields=['status'], name='task_status_idx'),
+            # Partial index = Only incomplete tasks (what overdue checks and reminders look at)
+            models.Index(fields=['due_date'], condition=models.Q(is_completed=False), name='task_open_due_idx'),
+            # Partial index = Only repeating tasks (what calendar windows expand)
+            models.Index(fields=['due_date'], condition=models.Q(repeat_every_days__isnull=False), name='task_repeating_due_idx'),
+        ]
+        # One generated task per care template per planting (keeps task generation idempotent),
+        # and one row per acted-on repeat of a series
+        constraints = [
+            models.UniqueConstraint(
+                fields=['farmer_crop', 'care_task_template'],
+                condition=models.Q(care_task_template__isnull=False, series__isnull=True),
+                name='task_crop_template_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['series', 'occurrence_date'],
+                condition=models.Q(series__isnull=False),
+                name='task_series_occurrence_uniq',
+            ),
+        ]
     
     def __str__(self):
         # Shows "Rajesh Patil - Apply Fertilizer (Pending)" when displaying
@@ -103,6 +140,17 @@ class TaskReminder(models.Model):
     # BooleanField = Has reminder been sent?
     is_sent = models.BooleanField(default=False)  # True = sent, False = not sent yet
     
+    # DateTimeField + CharField = Which dispatcher run is sending this reminder right now
+    # (stale claims are picked up again, so a crashed worker does not lose reminders)
+    claimed_at = models.DateTimeField(blank=True, null=True)  # When a dispatcher claimed it
+    claim_token = models.CharField(max_length=32, blank=True)  # Random id of the claiming run
+    
+    # PositiveSmallIntegerField = Failed send attempts (retried until MAX_SEND_ATTEMPTS)
+    attempts = models.PositiveSmallIntegerField(default=0)  # How many sends failed
+    
+    # CharField = Error from the last failed send (empty = no failure)
+    last_error = models.CharField(max_length=500, blank=True)  # e.g. "Gateway timeout"
+    
     # TextField = Message content for reminder
     reminder_message = models.TextField()  # Exact message text sent to farmer
     
@@ -114,6 +162,16 @@ class TaskReminder(models.Model):
         verbose_name = "Task Reminder"  # Display name (singular)
         verbose_name_plural = "Task Reminders"  # Display name (plural)
         ordering = ['reminder_date']  # Show reminders in chronological order
+        indexes = [
+            models.Index(fields=['reminder_date'], name='reminder_date_idx'),  # Default list ordering
+            # Partial index = Only reminders still waiting to be sent (the dispatcher's due query)
+            models.Index(fields=['reminder_date'], condition=models.Q(is_sent=False), name='reminder_unsent_date_idx'),
+            # Matches the planner's duplicate check (is there already a reminder for this task, channel and day?)
+            models.Index(fields=['task', 'reminder_channel', 'reminder_date'], name='reminder_task_channel_date_idx'),
+            # Reminders a dispatcher run has claimed (looked up by token). Not partial: SQLite can't tell
+            # that claim_token = <token> rules out '' and would scan the table instead.
+            models.Index(fields=['claim_token'], name='reminder_claim_token_idx'),
+        ]
     
     def __str__(self):
         # Shows "Rajesh Patil - Apply Fertilizer - 2025-03-09 (Sent)" when displaying
@@ -155,6 +213,10 @@ class TaskLog(models.Model):
         verbose_name = "Task Log"  # Display name (singular)
         verbose_name_plural = "Task Logs"  # Display name (plural)
         ordering = ['-timestamp']  # Show most recent logs first
+        indexes = [
+            models.Index(fields=['-timestamp'], name='tasklog_timestamp_idx'),
+            models.Index(fields=['task', '-timestamp'], name='tasklog_task_timestamp_idx'),
+        ]
     
     def __str__(self):
         # Shows "2025-02-22 - Rajesh Patil - Apply Fertilizer - Completed" when displaying
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import FarmerTask, TaskLog
+
+# Open statuses the sweeper moves to 'Overdue' once due_date has passed.
+OPEN_STATUSES = ('Pending', 'In Progress')
+
+
+def overdue_candidates(today):
+    """Tasks whose due date passed without completion and that are not marked 'Overdue' yet."""
+    return FarmerTask.objects.filter(due_date__lt=today, is_completed=False, status__in=OPEN_STATUSES)
+
+
+def mark_overdue_tasks(today=None, batch_size=10000, progress=None):
+    """
+    Set status='Overdue' on every open task due before today, with an
+    'Updated' TaskLog per changed task.
+
+    The table is walked in fixed primary-key ranges of batch_size ids, so
+    each step is one indexed range scan whatever the table size. Per range,
+    in one transaction: lock and read the matching (id, status) pairs for
+    the logs, one set-based UPDATE, one bulk_create of logs. Safe to re-run:
+    marked tasks no longer match. Returns the number of tasks changed.
+    """
+    today = today or timezone.localdate()
+    bounds = FarmerTask.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    if bounds['first'] is None:
+        return 0
+
+    now = timezone.now()
+    changed = 0
+    for low in range(bounds['first'], bounds['last'] + 1, batch_size):
+        window = overdue_candidates(today).filter(pk__gte=low, pk__lt=low + batch_size)
+        with transaction.atomic():
+            # Locked rows keep their status until the UPDATE below, so the logs match the rows it changes.
+            previous = list(window.select_for_update().order_by().values_list('pk', 'status'))
+            if previous:
+                # update() skips auto_now, so updated_at is set explicitly.
+                changed += window.update(status='Overdue', updated_at=now)
+                TaskLog.objects.bulk_create(
+                    [
+                        TaskLog(task_id=task_id, action='Updated', description='Marked overdue',
+                                metadata=f'status={status}->Overdue')
+                        for task_id, status in previous
+                    ],
+                    batch_size=1000,
+                )
+        if progress:
+            progress(low + batch_size - 1, changed)
+    return changed
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import FarmerTask, TaskReminder
+
+_CHANNELS = {value.lower(): value for value, _ in TaskReminder.REMINDER_CHANNEL_CHOICES}
+
+
+def reminder_channel(contact_method):
+    """TaskReminder channel for a Farmer.contact_method (free text); in-app when it names no channel."""
+    return _CHANNELS.get((contact_method or '').strip().lower(), 'App')
+
+
+def plan_reminders(today=None, days=None, offsets=None, chunk_size=1000, progress=None):
+    """
+    Create a TaskReminder on the farmer's contact channel for every pending
+    task due in [today, today + days], `offset` days before due_date for
+    each offset. Offsets already in the past give one reminder today, and
+    only to a task with no reminder yet, so a task planned on an earlier
+    night keeps its dates. Defaults come from settings.REMINDER_PLAN_DAYS
+    and REMINDER_OFFSETS_DAYS.
+
+    Tasks are read in primary-key chunks; per chunk, one query finds the
+    task's existing reminders on any date (served by
+    reminder_task_channel_date_idx) and one bulk_create writes the rest, so
+    re-running, the same night or the next, creates nothing twice. Repeats
+    of a recurring task get reminders once they are materialized. Returns
+    the number created.
+    """
+    today = today or timezone.localdate()
+    days = settings.REMINDER_PLAN_DAYS if days is None else days
+    offsets = sorted(set(settings.REMINDER_OFFSETS_DAYS if offsets is None else offsets), reverse=True)
+    tasks = FarmerTask.objects.filter(
+        status='Pending', is_completed=False, due_date__range=(today, today + timedelta(days=days)),
+    ).values_list('pk', 'task_name', 'due_date', 'farmer__contact_method')
+
+    created = 0
+    last_pk = 0
+    while True:
+        chunk = list(tasks.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+        if not chunk:
+            return created
+        last_pk = chunk[-1][0]
+
+        existing = set(
+            TaskReminder.objects.filter(task__in=[row[0] for row in chunk])
+            .order_by().values_list('task_id', 'reminder_channel', 'reminder_date')
+        )
+        reminded = {task_id for task_id, _, _ in existing}
+        reminders = []
+        for task_id, task_name, due_date, contact_method in chunk:
+            channel = reminder_channel(contact_method)
+            for offset in offsets:
+                reminder_date = due_date - timedelta(days=offset)
+                if reminder_date < today:
+                    # A missed offset only matters to a task nobody has reminded yet.
+                    if task_id in reminded:
+                        continue
+                    reminder_date = today
+                key = (task_id, channel, reminder_date)
+                reminded.add(task_id)
+                if key in existing:
+                    continue
+                existing.add(key)
+                reminders.append(TaskReminder(
+                    task_id=task_id, reminder_channel=channel, reminder_date=key[2],
+                    reminder_message=f'Reminder: {task_name} is due on {due_date}.',
+                ))
+        if reminders:
+            with transaction.atomic():
+                TaskReminder.objects.bulk_create(reminders, batch_size=1000)
+            created += len(reminders)
+        if progress:
+            progress(last_pk, created)
@@ -0,0 +1,137 @@
+import heapq
+import re
+from datetime import timedelta
+
+from django.db.models import Q
+
+from .models import FarmerTask
+
+# CropCareTask.frequency values and the repeat interval they stand for.
+FREQUENCY_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+    'bi-weekly': 14,
+    'biweekly': 14,
+    'fortnightly': 14,
+    'monthly': 30,
+}
+_EVERY_N_DAYS_RE = re.compile(r'^every\s+(\d+)\s+days?$', re.IGNORECASE)
+
+# Longest window a list or calendar request may expand.
+MAX_WINDOW_DAYS = 366
+
+
+def frequency_interval(frequency):
+    """Repeat interval in days for a frequency string ('Weekly', 'Every 10 days'), or None for one-off tasks."""
+    frequency = (frequency or '').strip()
+    match = _EVERY_N_DAYS_RE.match(frequency)
+    if match:
+        return int(match.group(1)) or None
+    return FREQUENCY_DAYS.get(frequency.lower())
+
+
+def occurrence_dates(first_due, every, until, start, end):
+    """Repeat dates of a series within [start, end], not counting its first due date."""
+    return list(iter_occurrence_dates(first_due, every, until, start, end))
+
+
+def iter_occurrence_dates(first_due, every, until, start, end):
+    """occurrence_dates, yielded one at a time."""
+    if not every:
+        return
+    last = min(end, until) if until else end
+    # Jump straight to the first repeat on or after start; repeats begin one interval after first_due.
+    step = max(1, -(-(start - first_due).days // every))
+    day = first_due + timedelta(days=step * every)
+    while day <= last:
+        yield day
+        day += timedelta(days=every)
+
+
+def virtual_occurrences(queryset, start, end, after=None):
+    """
+    (series task, date) for every repeat of the repeating tasks in queryset
+    that falls in [start, end] and has not been materialized as a row,
+    yielded lazily in (date, series id) order, past `after` (a (date, id)
+    position) when given. Two queries on the first step: the series, then
+    the materialized repeats in the window.
+    """
+    series_tasks = list(
+        queryset.defer(None).filter(
+            Q(repeat_until__isnull=True) | Q(repeat_until__gte=start),
+            repeat_every_days__isnull=False,
+            series__isnull=True,
+            due_date__lt=end,
+        ).exclude(status='Cancelled')
+    )
+    if not series_tasks:
+        return
+    materialized = set(
+        FarmerTask.objects.filter(
+            series__in=[task.pk for task in series_tasks],
+            occurrence_date__range=(start, end),
+        ).values_list('series_id', 'occurrence_date')
+    )
+    # Each series yields its dates in order, so merging them never holds more than one date per series.
+    streams = [_series_dates(task, start, end) for task in series_tasks]
+    for day, task_id, task in heapq.merge(*streams):
+        if after is not None and (day, task_id) <= tuple(after):
+            continue
+        if (task_id, day) not in materialized:
+            yield task, day
+
+
+def _series_dates(task, start, end):
+    for day in iter_occurrence_dates(task.due_date, task.repeat_every_days, task.repeat_until, start, end):
+        yield day, task.pk, task
+
+
+def materialize_occurrence(series, occurrence_date):
+    """
+    The FarmerTask row for one repeat of a series, created on first use.
+    The series row itself is the occurrence on its own due date. Raises
+    ValueError when the date is not a repeat of the series.
+    """
+    if occurrence_date == series.due_date:
+        return series
+    if series.series_id or not occurrence_dates(series.due_date, series.repeat_every_days, series.repeat_until,
+                                                occurrence_date, occurrence_date):
+        raise ValueError(f'{occurrence_date.isoformat()} is not an occurrence of this task.')
+
+    defaults = {
+        'farmer_id': series.farmer_id,
+        'farmer_crop_id': series.farmer_crop_id,
+        'care_task_template_id': series.care_task_template_id,
+        'task_name': series.task_name,
+        'task_description': series.task_description,
+        'due_date': occurrence_date,
+        'priority': series.priority,
+        'importance': series.importance,
+    }
+    # get_or_create falls back to a get if a concurrent request (double tap) inserted the row first.
+    task, _ = FarmerTask.objects.get_or_create(series=series, occurrence_date=occurrence_date, defaults=defaults)
+    return task
+
+
+def virtual_row(row, series_id, day, today):
+    """A serialized series row turned into its repeat on `day` (keys missing under ?fields= are skipped)."""
+    row = dict(row)
+    overrides = {
+        'id': None,
+        'series': series_id,
+        'occurrence_date': day.isoformat(),
+        'due_date': day.isoformat(),
+        'status': 'Pending',
+        'is_completed': False,
+        'completed_date': None,
+        'reminder_sent_at': None,
+        'farmer_notes': '',
+        'photo_count': 0,
+        'days_remaining': (day - today).days,
+        'is_overdue': today > day,
+        'is_virtual': True,
+    }
+    for key, value in overrides.items():
+        if key in row:
+            row[key] = value
+    return row
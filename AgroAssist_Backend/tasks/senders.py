@@ -0,0 +1,55 @@
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderSender:
+    """
+    Delivers reminders for one channel. send() is called from dispatcher
+    threads and must not touch the database; raise to report a failure
+    (the message is stored on the reminder and the send retried later).
+    """
+
+    def __init__(self, channel, **options):
+        self.channel = channel
+
+    def send(self, message):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LogSender(ReminderSender):
+    """Writes each reminder to the log instead of a gateway (the default)."""
+
+    def send(self, message):
+        logger.info('%s reminder %s to %s: %s', self.channel, message.id, message.recipient, message.text)
+
+
+class FileSender(ReminderSender):
+    """
+    Appends each reminder as a JSON line to `path`, optionally sleeping
+    `latency_ms` per send to stand in for gateway round trips when
+    benchmarking throughput.
+    """
+
+    def __init__(self, channel, path, latency_ms=0, **options):
+        super().__init__(channel, **options)
+        self.latency = latency_ms / 1000
+        # Line buffered: each reminder is one append, so channels can share a file.
+        self._file = open(path, 'a', buffering=1, encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        if self.latency:
+            time.sleep(self.latency)
+        line = json.dumps({'id': message.id, 'channel': self.channel, 'to': message.recipient, 'text': message.text})
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        self._file.close()
@@ -1,30 +1,65 @@
 # Import serializer classes from Django REST Framework
 from rest_framework import serializers
 
+from AgroAssist_Backend.crops.serializers import CropSerializer
+from AgroAssist_Backend.fast_lists import request_today
+from AgroAssist_Backend.farmers.serializers import FarmerSerializer
+from AgroAssist_Backend.sparse_fields import SparseFieldsMixin
+
 # Import models to serialize
 from .models import FarmerTask, TaskReminder, TaskLog
 
 
 # SERIALIZER 1: FarmerTaskSerializer - Convert farmer tasks to/from JSON
-class FarmerTaskSerializer(serializers.ModelSerializer):
+class FarmerTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields that calculate data
     farmer_name = serializers.SerializerMethodField()  # Show farmer name
     crop_name = serializers.SerializerMethodField()  # Show crop name
     days_remaining = serializers.SerializerMethodField()  # Calculate days until due
     is_overdue = serializers.SerializerMethodField()  # Check if deadline passed
+    is_virtual = serializers.SerializerMethodField()  # True for computed repeats (no row yet)
     
     class Meta:
         model = FarmerTask
         fields = ['id', 'farmer', 'farmer_name', 'farmer_crop', 'crop_name', 'care_task_template',
                   'task_name', 'task_description', 'status', 'due_date', 'completed_date',
                   'priority', 'importance', 'is_completed', 'days_remaining', 'is_overdue',
-                  'reminder_sent_at', 'farmer_notes', 'photo_count', 'created_at', 'updated_at']
+                  'reminder_sent_at', 'farmer_notes', 'photo_count', 'repeat_every_days', 'repeat_until',
+                  'series', 'occurrence_date', 'is_virtual', 'created_at', 'updated_at']
         
         read_only_fields = ['created_at', 'updated_at', 'farmer_name', 'crop_name', 
-                           'days_remaining', 'is_overdue']  # Can't edit these
+                           'days_remaining', 'is_overdue', 'series', 'occurrence_date']  # Can't edit these
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'farmer_name': ('farmer__first_name', 'farmer__last_name'),
+            'crop_name': ('farmer_crop__crop__name',),
+            'days_remaining': ('is_completed', 'due_date'),
+            'is_overdue': ('is_completed', 'due_date'),
+            'is_virtual': (),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'farmer': ('farmer', FarmerSerializer), 'crop': ('farmer_crop.crop', CropSerializer)}
         extra_kwargs = {
             'farmer': {'required': False},
         }
+        # validators = [] drops DRF's conditional unique checks (they need the read-only series); validate() checks instead
+        validators = []
+    
+    def validate(self, data):
+        # A crop gets each care template task once (task_crop_template_uniq); say so instead of failing on save
+        farmer_crop = data.get('farmer_crop', getattr(self.instance, 'farmer_crop', None))
+        template = data.get('care_task_template', getattr(self.instance, 'care_task_template', None))
+        if farmer_crop is not None and template is not None and getattr(self.instance, 'series_id', None) is None:
+            duplicates = FarmerTask.objects.filter(
+                farmer_crop=farmer_crop, care_task_template=template, series__isnull=True,
+            )
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError(
+                    {'care_task_template': ['This crop already has a task for this care template.']}
+                )
+        return data
     
     def get_farmer_name(self, obj):
         # Returns farmer's full name
@@ -36,8 +71,7 @@ class FarmerTaskSerializer(serializers.ModelSerializer):
     
     def get_days_remaining(self, obj):
         # Calculate days until task is due
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         
         if obj.is_completed:  # If task already completed
             return 0  # Return 0
@@ -50,13 +84,16 @@ class FarmerTaskSerializer(serializers.ModelSerializer):
         if obj.is_completed:  # If already done
             return False  # Not overdue
         
-        from datetime import datetime
-        today = datetime.now().date()  # Get today's date
+        today = request_today(self.context)  # Today's date (same for every row in this request)
         return today > obj.due_date  # True if today is after due date
+    
+    def get_is_virtual(self, obj):
+        # Stored rows are never virtual; repeats computed from a series set this to True
+        return False
 
 
 # SERIALIZER 2: TaskReminderSerializer - Convert reminders to/from JSON
-class TaskReminderSerializer(serializers.ModelSerializer):
+class TaskReminderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     task_name = serializers.SerializerMethodField()  # Show task name
     farmer_name = serializers.SerializerMethodField()  # Show farmer name
@@ -66,9 +103,18 @@ class TaskReminderSerializer(serializers.ModelSerializer):
         model = TaskReminder
         fields = ['id', 'task', 'task_name', 'farmer_name', 'reminder_channel',
                   'reminder_date', 'sent_at', 'is_sent', 'is_pending',
-                  'reminder_message', 'created_at']
+                  'reminder_message', 'attempts', 'last_error', 'created_at']
         
-        read_only_fields = ['created_at', 'sent_at', 'task_name', 'farmer_name', 'is_pending']  # Can't edit
+        read_only_fields = ['created_at', 'sent_at', 'task_name', 'farmer_name', 'is_pending',
+                            'attempts', 'last_error']  # Can't edit (set by the dispatcher)
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'task_name': ('task__task_name',),
+            'farmer_name': ('task__farmer__first_name', 'task__farmer__last_name'),
+            'is_pending': ('is_sent',),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'farmer': ('task.farmer', FarmerSerializer)}
     
     def get_task_name(self, obj):
         # Returns the task this reminder is for
@@ -84,7 +130,7 @@ class TaskReminderSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 3: TaskLogSerializer - Convert task history to/from JSON
-class TaskLogSerializer(serializers.ModelSerializer):
+class TaskLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     task_name = serializers.SerializerMethodField()  # Show task name
     farmer_name = serializers.SerializerMethodField()  # Show farmer name
@@ -96,6 +142,14 @@ class TaskLogSerializer(serializers.ModelSerializer):
                   'performed_by_farmer', 'timestamp', 'formatted_timestamp', 'metadata']
         
         read_only_fields = ['timestamp', 'formatted_timestamp']  # Can't edit
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'task_name': ('task__task_name',),
+            'farmer_name': ('task__farmer__first_name', 'task__farmer__last_name'),
+            'formatted_timestamp': ('timestamp',),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'farmer': ('task.farmer', FarmerSerializer)}
     
     def get_task_name(self, obj):
         # Returns the task name
@@ -140,7 +194,7 @@ class CreateTaskSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 5: TaskDetailSerializer - Show task with related reminders and history
-class TaskDetailSerializer(serializers.ModelSerializer):
+class TaskDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Nested serializers to show all related data
     
     farmer_name = serializers.SerializerMethodField()  # Farmer name
@@ -172,8 +226,7 @@ class TaskDetailSerializer(serializers.ModelSerializer):
     
     def get_days_remaining(self, obj):
         # Calculate days until due
-        from datetime import datetime
-        today = datetime.now().date()
+        today = request_today(self.context)
         
         if obj.is_completed:
             return 0  # Task done
@@ -186,8 +239,7 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         if obj.is_completed:
             return False
         
-        from datetime import datetime
-        today = datetime.now().date()
+        today = request_today(self.context)
         return today > obj.due_date
 
 
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from AgroAssist_Backend.farmers.models import FarmerCrop
+
+from .generation import generate_care_tasks
+
+
+@receiver(post_save, sender=FarmerCrop, dispatch_uid='tasks_farmer_crop_saved_generate_tasks')
+def generate_tasks_on_planting(sender, instance, created, raw=False, **kwargs):
+    # Only new crops and planting date changes; other edits leave the schedule alone.
+    if raw:
+        return
+    if created or instance.planting_date != getattr(instance, '_stored_planting_date', None):
+        generate_care_tasks([instance], reschedule=not created)
+    instance._stored_planting_date = instance.planting_date
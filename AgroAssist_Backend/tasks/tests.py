@@ -1,3 +1,561 @@
-from django.test import TestCase
+import json
+import math
+import tempfile
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from AgroAssist_Backend.crops.models import Crop, CropCareTask
+from AgroAssist_Backend.farmers.models import Farmer, FarmerCrop
+from AgroAssist_Backend.fast_lists import FastListMixin, compile_list_plan
+from AgroAssist_Backend.tasks.dispatch import (
+    CLAIM_TIMEOUT, MAX_SEND_ATTEMPTS, RateLimiter, claim_reminders, dispatch_due_reminders,
+)
+from AgroAssist_Backend.tasks.generation import generate_all_care_tasks, generate_care_tasks
+from AgroAssist_Backend.tasks.models import FarmerTask, TaskLog, TaskReminder
+from AgroAssist_Backend.tasks.overdue import mark_overdue_tasks
+from AgroAssist_Backend.tasks.planner import plan_reminders, reminder_channel
+from AgroAssist_Backend.tasks.recurrence import materialize_occurrence
+from AgroAssist_Backend.tasks.views import FarmerTaskViewSet
+from AgroAssist_Backend.testing import seed_api_data
+from AgroAssist_Backend.urls import router
+from AgroAssist_Backend.weather.models import FarmersWeatherAlert
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('cursor_admin', 'cursor_admin@example.com', 'pw', is_staff=True)
+        task = FarmerTask.objects.get(care_task_template__isnull=True)
+        TaskLog.objects.bulk_create(TaskLog(task=task, action='Updated') for _ in range(45))
+        # Equal timestamps force the id tiebreak to do the work.
+        tied_at = timezone.now()
+        TaskLog.objects.filter(id__in=TaskLog.objects.order_by('id').values('id')[:30]).update(timestamp=tied_at)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def walk(self, url, key='next'):
+        ids = []
+        query_counts = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertNotIn('count', response.data)
+            ids.append([row['id'] for row in response.data['results']])
+            query_counts.append(len(queries))
+            url = response.data[key]
+        return ids, query_counts
+
+    def test_cursor_pages_cover_every_row_once_in_order(self):
+        expected = list(TaskLog.objects.order_by('-timestamp', 'id').values_list('id', flat=True))
+        pages, query_counts = self.walk(reverse('task-logs-list') + '?cursor=')
+        self.assertEqual([row_id for page in pages for row_id in page], expected)
+        self.assertEqual(set(query_counts), {1})
+
+    def test_previous_links_walk_back_to_the_first_page(self):
+        forward, _ = self.walk(reverse('task-logs-list') + '?cursor=')
+        last_page = self.client.get(reverse('task-logs-list') + '?cursor=')
+        while last_page.data['next']:
+            last_page = self.client.get(last_page.data['next'])
+        backward, _ = self.walk(last_page.data['previous'], key='previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_page_number_mode_is_unchanged_without_cursor(self):
+        response = self.client.get(reverse('task-logs-list'))
+        self.assertEqual(response.data['count'], TaskLog.objects.count())
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse('task-logs-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class SparseFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('sparse_admin', 'sparse_admin@example.com', 'pw', is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, name, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['results'], queries.captured_queries
+
+    def test_fields_limits_keys_and_selected_columns(self):
+        rows, queries = self.get('tasks-list', {'fields': 'id,task_name,is_overdue'})
+        self.assertEqual(set(rows[0]), {'id', 'task_name', 'is_overdue'})
+        select = queries[-1]['sql']
+        self.assertNotIn('task_description', select)
+        self.assertNotIn('farmers_farmer', select)
+
+    def test_method_field_dependencies_are_loaded(self):
+        rows, queries = self.get('tasks-list', {'fields': 'id,farmer_name,crop_name'})
+        self.assertEqual(rows[0]['farmer_name'], 'Farmer0 Patil')
+        self.assertTrue(rows[0]['crop_name'].startswith('Crop'))
+        self.assertEqual(len(queries), 2)
+
+    def test_omit_drops_fields(self):
+        rows, _queries = self.get('weather-forecast-list', {'omit': 'temperature_range,rainfall_description'})
+        self.assertNotIn('temperature_range', rows[0])
+        self.assertIn('forecast_date', rows[0])
+
+    def test_expand_inlines_related_rows_without_extra_queries(self):
+        plain_rows, plain_queries = self.get('tasks-list', {})
+        rows, queries = self.get('tasks-list', {'expand': 'crop,farmer'})
+        self.assertEqual(len(queries), len(plain_queries))
+        self.assertEqual(rows[0]['farmer']['id'], plain_rows[0]['farmer'])
+        self.assertEqual(rows[0]['crop']['name'], plain_rows[0]['crop_name'])
+
+    def test_farmer_document_retrieve_with_fields(self):
+        url = reverse('farmers-detail', args=[Farmer.objects.order_by('pk').values_list('pk', flat=True).first()])
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'id,first_name'})
+        self.assertEqual(set(response.data), {'id', 'first_name'})
+
+    def test_expand_with_fields(self):
+        rows, queries = self.get('farmer-crops-list', {'fields': 'id,status', 'expand': 'crop'})
+        self.assertEqual(set(rows[0]), {'id', 'status', 'crop'})
+        self.assertIn('growth_duration_days', rows[0]['crop'])
+        self.assertEqual(len(queries), 2)
+
+
+class FastListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data()
+        cls.admin = User.objects.create_user('fast_admin', 'fast_admin@example.com', 'pw', is_staff=True)
+        alert = FarmersWeatherAlert.objects.first()
+        alert.expires_at = timezone.now() + timedelta(hours=5)
+        alert.save()
+        FarmerTask.objects.filter(id=FarmerTask.objects.first().id).update(is_completed=True)
+
+    def list_view(self, viewset, basename, params):
+        view = viewset()
+        view.action = 'list'
+        view.format_kwarg = None
+        view.kwargs = {}
+        view.request = Request(APIRequestFactory().get(reverse(f'{basename}-list'), params))
+        view.request.user = self.admin
+        return view
+
+    def test_fast_path_json_matches_serializer(self):
+        fast_viewsets = [(prefix, viewset, basename) for prefix, viewset, basename in router.registry if issubclass(viewset, FastListMixin)]
+        self.assertTrue(fast_viewsets)
+        for prefix, viewset, basename in fast_viewsets:
+            for params in ({}, {'fields': 'id,farmer_name'}, {'omit': 'id'}):
+                with self.subTest(prefix, params=params):
+                    view = self.list_view(viewset, basename, params)
+                    queryset = view.filter_queryset(view.get_queryset())
+                    expected = view.get_serializer(queryset, many=True).data
+                    plan = compile_list_plan(view.get_serializer())
+                    self.assertIsNotNone(plan)
+                    actual = plan.represent(queryset.values(*plan.paths))
+                    self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_expand_falls_back_to_serializer(self):
+        view = self.list_view(FarmerTaskViewSet, 'tasks', {'expand': 'farmer'})
+        self.assertIsNone(compile_list_plan(view.get_serializer()))
+
+
+class CareTaskGenerationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('generation_admin', 'generation_admin@example.com', 'pw', is_staff=True)
+        cls.farmer = Farmer.objects.get()
+        cls.crop = Crop.objects.get()
+        CropCareTask.objects.create(
+            crop=cls.crop, task_name='Scout pests', description='Walk the field', recommended_dap=35,
+            frequency='Weekly', instructions='Check leaves',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def plant(self, planting_date, status='Growing'):
+        response = self.client.post(reverse('farmer-crops-list'), {
+            'farmer': self.farmer.pk, 'crop': self.crop.pk, 'planting_date': planting_date.isoformat(),
+            'status': status, 'area_allocated_hectares': 1.0,
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data['id']
+
+    def test_planting_creates_tasks_and_logs(self):
+        planted = timezone.localdate()
+        farmer_crop_id = self.plant(planted)
+        tasks = FarmerTask.objects.filter(farmer_crop_id=farmer_crop_id).order_by('due_date')
+        self.assertEqual(
+            [(task.task_name, task.due_date) for task in tasks],
+            [('Weed', planted + timedelta(days=20)), ('Scout pests', planted + timedelta(days=35))],
+        )
+        self.assertEqual(TaskLog.objects.filter(task__in=tasks, action='Created').count(), 2)
+
+    def test_rerun_and_unrelated_saves_create_nothing(self):
+        farmer_crop_id = self.plant(timezone.localdate())
+        farmer_crop = FarmerCrop.objects.get(pk=farmer_crop_id)
+        farmer_crop.status = 'Growing'
+        farmer_crop.save()
+        self.assertEqual(generate_care_tasks([farmer_crop]), (0, 0))
+        self.assertEqual(FarmerTask.objects.filter(farmer_crop_id=farmer_crop_id).count(), 2)
+
+    def test_planting_date_change_reschedules_open_tasks(self):
+        farmer_crop_id = self.plant(timezone.localdate())
+        done = FarmerTask.objects.get(farmer_crop_id=farmer_crop_id, task_name='Weed')
+        done.is_completed = True
+        done.save()
+        moved = timezone.localdate() + timedelta(days=10)
+        response = self.client.patch(
+            reverse('farmer-crops-detail', args=[farmer_crop_id]), {'planting_date': moved.isoformat()},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        scout = FarmerTask.objects.get(farmer_crop_id=farmer_crop_id, task_name='Scout pests')
+        self.assertEqual(scout.due_date, moved + timedelta(days=35))
+        self.assertEqual(FarmerTask.objects.get(pk=done.pk).due_date, done.due_date)
+        self.assertTrue(TaskLog.objects.filter(task=scout, action='Updated').exists())
+
+    def test_duplicate_template_task_is_rejected(self):
+        farmer_crop_id = self.plant(timezone.localdate())
+        generated = FarmerTask.objects.get(farmer_crop_id=farmer_crop_id, task_name='Scout pests')
+        payload = {
+            'farmer_crop': farmer_crop_id, 'care_task_template': generated.care_task_template_id,
+            'task_name': 'Scout again', 'task_description': 'Second copy', 'due_date': generated.due_date.isoformat(),
+        }
+        response = self.client.post(reverse('tasks-list'), payload)
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('care_task_template', response.data)
+        response = self.client.patch(reverse('tasks-detail', args=[generated.pk]), {'task_name': 'Scout pests now'})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_closed_crops_get_no_tasks(self):
+        farmer_crop_id = self.plant(timezone.localdate() - timedelta(days=200), status='Harvested')
+        self.assertFalse(FarmerTask.objects.filter(farmer_crop_id=farmer_crop_id).exists())
+
+    def test_bulk_run_query_count_does_not_grow_with_crops(self):
+        planted = timezone.localdate()
+        # bulk_create skips the post_save generation, like a seasonal import.
+        FarmerCrop.objects.bulk_create(
+            FarmerCrop(farmer=self.farmer, crop=self.crop, planting_date=planted + timedelta(days=day),
+                       status='Planned', area_allocated_hectares=0.1)
+            for day in range(1, 41)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            created, rescheduled = generate_all_care_tasks(chunk_size=100)
+        # 40 new crops x 2 templates, plus 'Scout pests' for the seeded crop (added after it was planted).
+        self.assertEqual((created, rescheduled), (81, 0))
+
+        def insert_batches(model, rows):
+            # bulk_create splits on the backend's parameter limit as well as on its batch_size (1000).
+            fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+            return math.ceil(rows / min(1000, connection.ops.bulk_batch_size(fields, [None] * rows)))
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        # Templates, then for the one chunk: farmer crops and existing tasks; then the empty next chunk.
+        self.assertEqual(len([sql for sql in statements if sql.startswith('SELECT')]), 4)
+        self.assertEqual(len([sql for sql in statements if sql.startswith('INSERT INTO "tasks_farmertask"')]),
+                         insert_batches(FarmerTask, 81))
+        self.assertEqual(len([sql for sql in statements if sql.startswith('INSERT INTO "tasks_tasklog"')]),
+                         insert_batches(TaskLog, 81))
+        self.assertFalse([sql for sql in statements if sql.startswith(('UPDATE', 'DELETE'))])
+        self.assertEqual(generate_all_care_tasks(chunk_size=100), (0, 0))
+
+
+class TaskRecurrenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('recurrence_admin', 'recurrence_admin@example.com', 'pw', is_staff=True)
+        cls.today = timezone.localdate()
+        farmer_crop = FarmerCrop.objects.get(status='Growing')
+        cls.series = FarmerTask.objects.create(
+            farmer=farmer_crop.farmer, farmer_crop=farmer_crop, task_name='Scout', task_description='Scout pests',
+            due_date=cls.today + timedelta(days=1), repeat_every_days=7, repeat_until=cls.today + timedelta(days=30),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def window(self, **params):
+        params = {'start': self.today.isoformat(), 'end': (self.today + timedelta(days=29)).isoformat(), **params}
+        return self.client.get(reverse('tasks-list'), params)
+
+    def scout_rows(self, response):
+        return [(row['id'], row['due_date'], row['is_virtual']) for row in response.data['results']
+                if row['task_name'] == 'Scout']
+
+    def test_window_merges_real_and_virtual_repeats_in_due_order(self):
+        response = self.window()
+        self.assertEqual(response.status_code, 200, response.content)
+        days = [(self.today + timedelta(days=offset)).isoformat() for offset in (1, 8, 15, 22, 29)]
+        self.assertEqual(
+            self.scout_rows(response),
+            [(self.series.pk, days[0], False)] + [(None, day, True) for day in days[1:]],
+        )
+        due_dates = [row['due_date'] for row in response.data['results']]
+        self.assertEqual(due_dates, sorted(due_dates))
+
+    def test_acting_on_a_repeat_materializes_it_once(self):
+        day = (self.today + timedelta(days=8)).isoformat()
+        url = reverse('tasks-complete', args=[self.series.pk])
+        first = self.client.post(url, {'occurrence_date': day})
+        self.assertEqual(first.status_code, 200, first.content)
+        self.assertEqual((first.data['series'], first.data['status']), (self.series.pk, 'Completed'))
+        self.assertEqual(self.client.post(url, {'occurrence_date': day}).data['id'], first.data['id'])
+        self.assertEqual(TaskLog.objects.filter(task_id=first.data['id'], action='Completed').count(), 2)
+
+        rows = self.scout_rows(self.window())
+        self.assertIn((first.data['id'], day, False), rows)
+        self.assertEqual(len(rows), 5)
+
+        bad = self.client.post(url, {'occurrence_date': (self.today + timedelta(days=9)).isoformat()})
+        self.assertEqual(bad.status_code, 400)
+
+    def test_window_pages_cover_every_occurrence_once(self):
+        FarmerTask.objects.filter(pk=self.series.pk).update(repeat_every_days=1)
+        self.series.refresh_from_db()
+        for offset in (5, 6):
+            materialize_occurrence(self.series, self.today + timedelta(days=offset))
+        expected = [(row['id'], row['due_date']) for row in self.window(page_size=100).data['results']]
+        seen = []
+        url = reverse('tasks-list') + f'?start={self.today.isoformat()}&end={(self.today + timedelta(days=29)).isoformat()}'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertLessEqual(len(queries), 3)
+            seen += [(row['id'], row['due_date']) for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(set(seen)), len(expected))
+        self.assertGreater(len(expected), 20)
+
+    def test_window_rejects_ordering_and_page(self):
+        for params in ({'ordering': '-due_date'}, {'page': 2}):
+            with self.subTest(params=params):
+                self.assertEqual(self.window(**params).status_code, 400)
+
+    def test_calendar_groups_by_day_and_pages_by_window(self):
+        response = self.client.get(reverse('tasks-calendar'), {'start': self.today.isoformat()})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['end'], (self.today + timedelta(days=6)).isoformat())
+        self.assertIn((self.today + timedelta(days=7)).isoformat(), response.data['next'])
+        by_day = {day['date']: [task['task_name'] for task in day['tasks']] for day in response.data['days']}
+        self.assertIn('Scout', by_day[(self.today + timedelta(days=1)).isoformat()])
+        next_week = self.client.get(response.data['next'])
+        self.assertIn((self.today + timedelta(days=8)).isoformat(), [day['date'] for day in next_week.data['days']])
+
+    def test_generated_tasks_carry_the_template_frequency(self):
+        crop = Crop.objects.get()
+        CropCareTask.objects.create(crop=crop, task_name='Irrigate', description='Water', recommended_dap=5,
+                                    frequency='Bi-weekly', instructions='Drip')
+        farmer_crop = FarmerCrop.objects.create(
+            farmer=Farmer.objects.get(), crop=crop, planting_date=self.today, status='Planned',
+            area_allocated_hectares=0.5,
+        )
+        task = FarmerTask.objects.get(farmer_crop=farmer_crop, task_name='Irrigate')
+        self.assertEqual(task.repeat_every_days, 14)
+        self.assertEqual(task.repeat_until, self.today + timedelta(days=crop.growth_duration_days))
+
+
+class OverdueSweepTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.today = timezone.localdate()
+        farmer_crop = FarmerCrop.objects.get(status='Growing')
+        cls.tasks = {
+            (status, offset): FarmerTask.objects.create(
+                farmer=farmer_crop.farmer, farmer_crop=farmer_crop, task_name=f'{status} {offset}',
+                task_description='Sweep', status=status, is_completed=status == 'Completed',
+                due_date=cls.today + timedelta(days=offset),
+            )
+            for status in ('Pending', 'In Progress', 'Completed', 'Cancelled')
+            for offset in (-3, 0)
+        }
+
+    def test_sweep_marks_only_open_past_due_tasks(self):
+        expected = set(
+            FarmerTask.objects.filter(due_date__lt=self.today, is_completed=False, status__in=['Pending', 'In Progress'])
+            .values_list('pk', flat=True)
+        )
+        self.assertIn(self.tasks['In Progress', -3].pk, expected)
+
+        self.assertEqual(mark_overdue_tasks(self.today, batch_size=2), len(expected))
+        self.assertEqual(set(FarmerTask.objects.filter(status='Overdue').values_list('pk', flat=True)), expected)
+        self.assertEqual(FarmerTask.objects.get(pk=self.tasks['Cancelled', -3].pk).status, 'Cancelled')
+        self.assertEqual(FarmerTask.objects.get(pk=self.tasks['Pending', 0].pk).status, 'Pending')
+
+        logs = TaskLog.objects.filter(description='Marked overdue')
+        self.assertEqual(set(logs.values_list('task_id', flat=True)), expected)
+        self.assertEqual(logs.get(task=self.tasks['In Progress', -3]).metadata, 'status=In Progress->Overdue')
+
+        self.assertEqual(mark_overdue_tasks(self.today), 0)
+        self.assertEqual(logs.count(), len(expected))
+
+    def test_sweep_queries_are_bounded_by_id_ranges(self):
+        ids = FarmerTask.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        ranges = len(range(ids['first'], ids['last'] + 1, 4))
+        with CaptureQueriesContext(connection) as queries:
+            mark_overdue_tasks(self.today, batch_size=4)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertTrue(updates)
+        self.assertTrue(all('"id" >=' in sql and 'WHERE' in sql for sql in updates))
+        self.assertLessEqual(len(updates), ranges)
+
+    @override_settings(CRON_SECRET='nightly')
+    def test_cron_job_reports_changed_rows(self):
+        url = reverse('job-mark-overdue-tasks')
+        self.assertEqual(APIClient().get(url).status_code, 403)
+        expected = FarmerTask.objects.filter(due_date__lt=self.today, is_completed=False).exclude(
+            status__in=['Overdue', 'Cancelled'],
+        ).count()
+        response = APIClient().get(url, HTTP_AUTHORIZATION='Bearer nightly')
+        self.assertEqual(response.data, {'marked_overdue': expected})
+
+
+@override_settings(DAILY_DIGESTS=False)
+class ReminderDispatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.today = timezone.localdate()
+        task = FarmerTask.objects.get(task_name='Irrigate')
+        TaskReminder.objects.bulk_create([
+            TaskReminder(task=task, reminder_channel=channel, reminder_date=cls.today - timedelta(days=index % 2),
+                         reminder_message=f'{channel} {index}')
+            for index, channel in enumerate(['SMS', 'WhatsApp', 'App', 'Email'] * 5)
+        ] + [TaskReminder(task=task, reminder_channel='SMS', reminder_date=cls.today + timedelta(days=1),
+                          reminder_message='Tomorrow')])
+        cls.due = TaskReminder.objects.filter(reminder_date__lte=cls.today).count()
+
+    def channels(self, backend='AgroAssist_Backend.tasks.senders.FileSender', **options):
+        return {name: {'BACKEND': backend, 'OPTIONS': options, 'CONCURRENCY': 3}
+                for name in ['SMS', 'WhatsApp', 'App', 'Email']}
+
+    def test_due_reminders_are_sent_once_through_channel_senders(self):
+        with tempfile.NamedTemporaryFile('r', suffix='.jsonl') as out:
+            # Per batch of 10: claim, read, then savepoint + 2 UPDATEs; plus the final empty claim.
+            with self.assertNumQueries(3 * 6 + 1):
+                totals = dispatch_due_reminders(self.today, batch_size=10, channels=self.channels(path=out.name))
+            lines = [json.loads(line) for line in out]
+        self.assertEqual(totals, {'sent': self.due, 'failed': 0})
+        self.assertEqual(len({line['id'] for line in lines}), self.due)
+        farmer = Farmer.objects.get()
+        self.assertEqual({line['to'] for line in lines if line['channel'] == 'Email'}, {farmer.email})
+        self.assertEqual({line['to'] for line in lines if line['channel'] == 'SMS'}, {farmer.phone_number})
+
+        self.assertFalse(TaskReminder.objects.filter(reminder_date__lte=self.today, is_sent=False).exists())
+        self.assertFalse(TaskReminder.objects.filter(is_sent=True, sent_at__isnull=True).exists())
+        self.assertFalse(TaskReminder.objects.get(reminder_message='Tomorrow').is_sent)
+        self.assertIsNotNone(FarmerTask.objects.get(task_name='Irrigate').reminder_sent_at)
+        self.assertEqual(dispatch_due_reminders(self.today, channels=self.channels(path=out.name)),
+                         {'sent': 0, 'failed': 0})
+
+    def test_failed_sends_are_retried_after_the_claim_timeout(self):
+        channels = self.channels('AgroAssist_Backend.testing.FailingSender')
+        self.assertEqual(dispatch_due_reminders(self.today, channels=channels), {'sent': 0, 'failed': self.due})
+        self.assertEqual(set(TaskReminder.objects.filter(attempts=1).values_list('last_error', flat=True)),
+                         {'Gateway down'})
+        self.assertEqual(dispatch_due_reminders(self.today, channels=channels), {'sent': 0, 'failed': 0})
+
+        for _ in range(MAX_SEND_ATTEMPTS):
+            TaskReminder.objects.update(claimed_at=timezone.now() - CLAIM_TIMEOUT - timedelta(seconds=1))
+            dispatch_due_reminders(self.today, channels=channels)
+        self.assertEqual(TaskReminder.objects.filter(attempts=MAX_SEND_ATTEMPTS).count(), self.due)
+
+    def test_claims_do_not_overlap(self):
+        now = timezone.now()
+        first = {message.id for _, message in claim_reminders(self.today, 8, now)}
+        second = {message.id for _, message in claim_reminders(self.today, 100, now)}
+        self.assertEqual((len(first), len(second)), (8, self.due - 8))
+        self.assertFalse(first & second)
+        self.assertEqual(claim_reminders(self.today, 100, now), [])
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = RateLimiter(200)
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - started, 4 / 200)
+
+
+class ReminderPlanningTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.today = timezone.localdate()
+        farmer_crop = FarmerCrop.objects.get(status='Growing')
+        for name, offset, status in [('Spray', 3, 'Pending'), ('Done', 3, 'Completed'), ('Later', 10, 'Pending'),
+                                     ('Dropped', 2, 'Cancelled')]:
+            FarmerTask.objects.create(
+                farmer=farmer_crop.farmer, farmer_crop=farmer_crop, task_name=name, task_description=name,
+                status=status, is_completed=status == 'Completed', due_date=cls.today + timedelta(days=offset),
+            )
+
+    def planned(self):
+        return set(TaskReminder.objects.filter(reminder_channel='WhatsApp').values_list(
+            'task__task_name', 'reminder_date',
+        ))
+
+    def test_pending_tasks_due_soon_get_reminders_at_each_offset(self):
+        self.assertEqual(plan_reminders(self.today, days=7, offsets=[1, 0], chunk_size=1), 3)
+        day = lambda offset: self.today + timedelta(days=offset)
+        self.assertEqual(self.planned(), {('Irrigate', day(0)), ('Spray', day(2)), ('Spray', day(3))})
+        self.assertEqual(TaskReminder.objects.get(task__task_name='Spray', reminder_date=day(3)).reminder_message,
+                         f'Reminder: Spray is due on {day(3)}.')
+
+    def test_rerun_creates_nothing(self):
+        plan_reminders(self.today, days=7, offsets=[1, 0])
+        # Candidate tasks, existing reminders, then the empty next chunk; no INSERT.
+        with self.assertNumQueries(3):
+            self.assertEqual(plan_reminders(self.today, days=7, offsets=[1, 0]), 0)
+
+    def test_nightly_runs_keep_each_task_on_its_offsets(self):
+        farmer_crop = FarmerCrop.objects.get(status='Growing')
+        FarmerTask.objects.create(
+            farmer=farmer_crop.farmer, farmer_crop=farmer_crop, task_name='Fertilize', task_description='Fertilize',
+            due_date=self.today + timedelta(days=5),
+        )
+        for night in range(6):
+            plan_reminders(self.today + timedelta(days=night), days=7, offsets=[3, 1])
+        dates = lambda name: sorted(
+            (reminder_date - self.today).days
+            for reminder_date in TaskReminder.objects.filter(task__task_name=name).values_list('reminder_date', flat=True)
+        )
+        self.assertEqual(dates('Fertilize'), [2, 4])
+        self.assertEqual(dates('Spray'), [0, 2])
+        # Planned too late for either offset: one reminder on the first night, none on the due day.
+        self.assertEqual(dates('Irrigate'), [0])
+
+    def test_channel_follows_contact_method(self):
+        Farmer.objects.update(contact_method='email')
+        plan_reminders(self.today, days=3, offsets=[0])
+        self.assertEqual(set(TaskReminder.objects.filter(is_sent=False).values_list('reminder_channel', flat=True)),
+                         {'SMS', 'Email'})
+        self.assertEqual(reminder_channel('Phone call'), 'App')
+
+    @override_settings(CRON_SECRET='nightly', REMINDER_PLAN_DAYS=7, REMINDER_OFFSETS_DAYS=[1, 0])
+    def test_cron_job_plans_with_settings(self):
+        response = APIClient().get(reverse('job-plan-reminders'), HTTP_AUTHORIZATION='Bearer nightly')
+        self.assertEqual(response.data, {'reminders_created': 3})
@@ -1,30 +1,87 @@
 # Tasks API ViewSets - Task management for farmers
+import heapq
+from collections import OrderedDict
+from datetime import date, timedelta
+from itertools import islice
+
+from django.db.models import Q
 from rest_framework import viewsets, filters
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from .models import FarmerTask, TaskReminder, TaskLog
+from .recurrence import MAX_WINDOW_DAYS, materialize_occurrence, virtual_occurrences, virtual_row
 from .serializers import FarmerTaskSerializer, TaskReminderSerializer, TaskLogSerializer
-from AgroAssist_Backend.farmers.models import Farmer
+from AgroAssist_Backend.farmers.mixins import LinkedFarmerMixin
+from AgroAssist_Backend.fast_lists import FastListMixin, request_today
+from AgroAssist_Backend.pagination import KeysetPagination
+from AgroAssist_Backend.sparse_fields import SparseQuerysetMixin
+
+class StandardPagination(KeysetPagination):
+    page_size = 20  # Show 20 results per page (add ?cursor= for keyset paging where supported)
+
+class OccurrencePagination(KeysetPagination):
+    """
+    Forward keyset paging for the merged real + virtual occurrences of a
+    ?start=&end= window. The cursor is the (due_date, id) of the last row
+    shown (a repeat's id is its series id), so each page merges and
+    serializes only page_size + 1 occurrences however wide the window is.
+    """
+
+    page_size = 20
+    page_size_query_param = 'page_size'  # Allow ?page_size=50
+    max_page_size = 100  # Never give more than 100
+    cursor_ordering = ('due_date', 'id')
 
+    def paginate_occurrences(self, view, request, start, end):
+        self.request = request
+        self.model = FarmerTask
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        if reverse:
+            raise NotFound(self.invalid_cursor_message)
+        occurrences = view.occurrences(start, end, after=position, limit=self.page_size + 1)
+        self.has_next = len(occurrences) > self.page_size
+        self.page_rows = occurrences[:self.page_size]
+        return [row for _, row in view.serialize_occurrences(self.page_rows)]
 
-def _linked_farmer_for_user(user):
-    return Farmer.objects.filter(email__iexact=user.email).first()
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([('next', self.get_next_link()), ('results', data)]))
 
-class StandardPagination(PageNumberPagination):
-    page_size = 20  # Show 20 results per page
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        day, task_id = self.page_rows[-1][:2]
+        cursor = self.encode_cursor([day.isoformat(), task_id], reverse=False)
+        return replace_query_param(self._base_url(), self.cursor_query_param, cursor)
+
+
+def parse_window(params, default_days):
+    """(start, end) dates from ?start=&end= (ISO dates), defaulting to today and start + default_days - 1."""
+    try:
+        start = date.fromisoformat(params['start']) if params.get('start') else date.today()
+        end = date.fromisoformat(params['end']) if params.get('end') else start + timedelta(days=default_days - 1)
+    except ValueError:
+        raise ValidationError({'start': ['start and end must be dates (YYYY-MM-DD).']})
+    if end < start or (end - start).days >= MAX_WINDOW_DAYS:
+        raise ValidationError({'end': [f'end must be on or after start and at most {MAX_WINDOW_DAYS} days later.']})
+    return start, end
 
 # FarmerTask ViewSet - Task management for farmers
-class FarmerTaskViewSet(viewsets.ModelViewSet):
+class FarmerTaskViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = FarmerTask.objects.all()  # All farmer tasks
     serializer_class = FarmerTaskSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate results
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Filter/sort
     search_fields = ['farmer__first_name', 'task_name']  # Search by farmer or task name
     ordering = ['due_date']  # Sort by due date (urgent first)
+    cursor_ordering = ('due_date', 'id')  # ?cursor= paging order (id breaks ties)
     
     # Require authentication (ADDED)
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 2, 'retrieve': 1, 'calendar': 3}
     
     def get_permissions(self):
         """Authenticated users can create; only admins can update/delete."""
@@ -35,16 +92,16 @@ class FarmerTaskViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Scope tasks: admins see all, farmers see only their assigned tasks."""
         user = self.request.user
-        queryset = FarmerTask.objects.all()
+        queryset = FarmerTask.objects.select_related('farmer', 'farmer_crop__crop')
         
         # Admins see all tasks
         if user.is_staff or user.is_superuser:
             return queryset
         
         # Farmers see only their assigned tasks
-        farmer = _linked_farmer_for_user(user)
-        if farmer:
-            return queryset.filter(farmer=farmer)
+        farmer_id = self.get_linked_farmer_id()
+        if farmer_id:
+            return queryset.filter(farmer_id=farmer_id)
         
         # Return empty if not admin and not linked farmer
         return queryset.none()
@@ -65,7 +122,7 @@ class FarmerTaskViewSet(viewsets.ModelViewSet):
             return
 
         # Farmers can create only for their own profile and own crop records.
-        farmer = _linked_farmer_for_user(user)
+        farmer = self.get_linked_farmer()
         if not farmer:
             raise PermissionDenied('No farmer profile linked to this user.')
 
@@ -78,8 +135,116 @@ class FarmerTaskViewSet(viewsets.ModelViewSet):
 
         serializer.save(farmer=farmer)
 
+    def occurrences(self, start, end, after=None, limit=None):
+        """
+        (due date, id, is virtual, task) for tasks due in [start, end] merged
+        with the virtual repeats of repeating tasks, in (due date, id) order
+        (a repeat carries its series' id and follows a stored row with the
+        same key). `after` starts past a (due date, id) position and `limit`
+        stops the merge early. Three queries whatever the window.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        real_tasks = queryset.filter(due_date__range=(start, end)).order_by('due_date', 'id')
+        if after is not None:
+            start = max(start, after[0])
+            real_tasks = real_tasks.filter(Q(due_date__gt=after[0]) | Q(due_date=after[0], id__gt=after[1]))
+        horizon = end
+        if limit is not None:
+            real_tasks = list(real_tasks[:limit])
+            if len(real_tasks) == limit:
+                # Repeats past the last stored row that fits the page can't make it either.
+                horizon = real_tasks[-1].due_date
+
+        merged = heapq.merge(
+            ((task.due_date, task.pk, False, task) for task in real_tasks),
+            ((day, task.pk, True, task) for task, day in virtual_occurrences(queryset, start, horizon, after)),
+            key=lambda item: item[:3],
+        )
+        return list(islice(merged, limit))
+
+    def serialize_occurrences(self, occurrences):
+        """(due date, row) for occurrences(); one serializer pass for the stored rows, one for the series."""
+        real_tasks = [task for _, _, is_virtual, task in occurrences if not is_virtual]
+        real_rows = iter(self.get_serializer(real_tasks, many=True).data)
+        series_tasks = {task.pk: task for _, _, is_virtual, task in occurrences if is_virtual}
+        series_rows = dict(zip(series_tasks, self.get_serializer(list(series_tasks.values()), many=True).data))
+        today = request_today(self.get_serializer_context())
+        return [
+            (day, virtual_row(series_rows[task_id], task_id, day, today) if is_virtual else next(real_rows))
+            for day, task_id, is_virtual, _ in occurrences
+        ]
+
+    def list(self, request, *args, **kwargs):
+        # ?start=&end= lists real tasks and virtual repeats of repeating tasks in that window, paged by ?cursor=
+        if 'start' not in request.query_params and 'end' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        for param in ('ordering', 'page'):
+            if param in request.query_params:
+                raise ValidationError({param: [f'{param} is not supported with start/end; the window is in due date order, paged by cursor.']})
+        start, end = parse_window(request.query_params, 30)
+        paginator = OccurrencePagination()
+        page = paginator.paginate_occurrences(self, request, start, end)
+        return paginator.get_paginated_response(page)
+
+    # ACTION: Calendar of real and virtual task occurrences, one window (default one week) at a time
+    @action(detail=False, methods=['get'])  # GET at /tasks/calendar/?start=2025-03-01&end=2025-03-07
+    def calendar(self, request):
+        start, end = parse_window(request.query_params, 7)
+        days = {}
+        for day, row in self.serialize_occurrences(self.occurrences(start, end)):
+            days.setdefault(day.isoformat(), []).append(row)
+
+        # previous/next move the whole window, so the calendar pages by date range
+        span = timedelta(days=(end - start).days + 1)
+        url = request.build_absolute_uri()
+        links = {}
+        for name, shift in (('previous', -span), ('next', span)):
+            link = replace_query_param(url, 'start', (start + shift).isoformat())
+            links[name] = replace_query_param(link, 'end', (end + shift).isoformat())
+        return Response({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            **links,
+            'days': [{'date': day, 'tasks': tasks} for day, tasks in days.items()],
+        })
+
+    # ACTION: Farmer starts a task (or one repeat of a repeating task, via occurrence_date)
+    @action(detail=True, methods=['post'])  # POST at /tasks/{id}/start/
+    def start(self, request, pk=None):
+        return self.act_on_occurrence(request, 'In Progress', 'Started')
+
+    # ACTION: Farmer completes a task (or one repeat of a repeating task, via occurrence_date)
+    @action(detail=True, methods=['post'])  # POST at /tasks/{id}/complete/
+    def complete(self, request, pk=None):
+        return self.act_on_occurrence(request, 'Completed', 'Completed')
+
+    def act_on_occurrence(self, request, status_value, log_action):
+        task = self.get_object()  # Farmers can only act on their own tasks
+        occurrence_date = request.data.get('occurrence_date')
+        if occurrence_date:
+            try:
+                # Only repeats a farmer acts on become FarmerTask rows
+                task = materialize_occurrence(task, date.fromisoformat(str(occurrence_date)))
+            except ValueError as error:
+                raise ValidationError({'occurrence_date': [str(error)]})
+
+        task.status = status_value
+        update_fields = ['status', 'updated_at']
+        if status_value == 'Completed':
+            task.is_completed = True
+            task.completed_date = date.today()
+            update_fields += ['is_completed', 'completed_date']
+        if 'farmer_notes' in request.data:
+            task.farmer_notes = request.data['farmer_notes']
+            update_fields.append('farmer_notes')
+        task.save(update_fields=update_fields)
+        TaskLog.objects.create(
+            task=task, action=log_action, performed_by_farmer_id=self.get_linked_farmer_id() or None,
+        )
+        return Response(self.get_serializer(task).data)
+
 # Task Reminder ViewSet - Notifications for tasks
-class TaskReminderViewSet(viewsets.ModelViewSet):
+class TaskReminderViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = TaskReminder.objects.all()  # All reminders
     serializer_class = TaskReminderSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate
@@ -87,6 +252,7 @@ class TaskReminderViewSet(viewsets.ModelViewSet):
     search_fields = ['task__task_name']  # Search by task name
     ordering = ['reminder_date']  # By date
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -100,21 +266,23 @@ class TaskReminderViewSet(viewsets.ModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if farmer:
-            return queryset.filter(task__farmer=farmer)
+        farmer_id = self.get_linked_farmer_id()
+        if farmer_id:
+            return queryset.filter(task__farmer_id=farmer_id)
 
         return queryset.none()
 
 # Task Log ViewSet - Task history and activity tracking
-class TaskLogViewSet(viewsets.ReadOnlyModelViewSet):
+class TaskLogViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = TaskLog.objects.all()  # All task logs (read-only)
     serializer_class = TaskLogSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Filter
     search_fields = ['task__task_name']  # Search by task name
     ordering = ['-timestamp']  # Newest logs first
+    cursor_ordering = ('-timestamp', 'id')  # ?cursor= paging order (id breaks ties)
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_queryset(self):
         user = self.request.user
@@ -123,8 +291,8 @@ class TaskLogViewSet(viewsets.ReadOnlyModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if farmer:
-            return queryset.filter(task__farmer=farmer)
+        farmer_id = self.get_linked_farmer_id()
+        if farmer_id:
+            return queryset.filter(task__farmer_id=farmer_id)
 
         return queryset.none()
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from AgroAssist_Backend.crops.models import Crop, CropCareTask, CropGrowthStage, CropGuide, CropRecommendation
+from AgroAssist_Backend.farmers.models import Farmer, FarmerCrop, FarmerInventory, ImportJob, ImportJobError
+from AgroAssist_Backend.tasks.models import FarmerTask, TaskLog, TaskReminder
+from AgroAssist_Backend.tasks.senders import ReminderSender
+from AgroAssist_Backend.weather.models import FarmersWeatherAlert, WeatherData, WeatherForecast
+
+
+ROWS_PER_MODEL = 3
+
+
+def seed_api_data(rows=ROWS_PER_MODEL):
+    """Create a few rows in every API table so per-row queries show up in counts."""
+    today = timezone.localdate()
+    now = timezone.now()
+    for index in range(rows):
+        crop = Crop.objects.create(
+            name=f'Crop {index}',
+            description='Grown in Maharashtra',
+            season='Kharif',
+            soil_type='Loamy',
+            growth_duration_days=120,
+            optimal_temperature=27.0,
+            optimal_humidity=60.0,
+            optimal_soil_moisture=40.0,
+        )
+        CropGuide.objects.create(
+            crop=crop,
+            sowing_instructions='Sow',
+            watering_schedule='Weekly',
+            fertilizer_schedule='NPK',
+            disease_management='Scout',
+            pest_management='Traps',
+            harvesting_instructions='Harvest',
+        )
+        CropGrowthStage.objects.create(
+            crop=crop, stage_name='Germination', duration_days=10, stage_number=1,
+            optimal_temperature=25.0, optimal_humidity=60.0, optimal_soil_moisture=40.0,
+        )
+        CropCareTask.objects.create(
+            crop=crop, task_name='Weed', description='Weed field', recommended_dap=20, instructions='Hand weed',
+        )
+        CropRecommendation.objects.create(
+            crop=crop, recommended_season='Kharif', recommendation_reason='Good fit', priority_score=index,
+        )
+
+        farmer = Farmer.objects.create(
+            first_name=f'Farmer{index}',
+            last_name='Patil',
+            email=f'farmer{index}@example.com',
+            phone_number=f'90000000{index:02d}',
+            address='Village Road',
+            city='Pune',
+            state='Maharashtra',
+            postal_code=411001,
+            land_area_hectares=2.0,
+            soil_type='Loamy',
+            experience_level='Beginner',
+        )
+        for status, offset in (('Growing', 7), ('Harvested', 150)):
+            farmer_crop = FarmerCrop.objects.create(
+                farmer=farmer, crop=crop, planting_date=today - timedelta(days=offset),
+                status=status, area_allocated_hectares=1.0,
+            )
+        FarmerInventory.objects.create(
+            farmer=farmer, item_name='Old Seeds', item_type='Seeds', quantity=5, expiry_date=today - timedelta(days=3),
+        )
+        FarmerInventory.objects.create(
+            farmer=farmer, item_name='Urea', item_type='Seeds', quantity=5, expiry_date=today + timedelta(days=10),
+        )
+        task = FarmerTask.objects.create(
+            farmer=farmer, farmer_crop=farmer_crop, task_name='Irrigate', task_description='Irrigate field',
+            due_date=today + timedelta(days=index),
+        )
+        TaskReminder.objects.create(
+            task=task, reminder_channel='SMS', reminder_date=today, reminder_message='Irrigate today',
+        )
+        TaskLog.objects.create(task=task, action='Created', performed_by_farmer=farmer)
+        FarmersWeatherAlert.objects.create(
+            farmer=farmer, alert_title='Rain', alert_message='Heavy rain', severity='High',
+            alert_type='Rain', issued_at=now,
+        )
+        WeatherData.objects.create(
+            location='Pune', temperature=28.0, humidity=60, rainfall=2, condition='Sunny',
+            recorded_at=now - timedelta(hours=index),
+        )
+        job = ImportJob.objects.create(section='farmers', status='completed', file_name=f'farmers{index}.csv')
+        ImportJobError.objects.create(job=job, row_number=2, message='farmers.email is required (row 2).')
+        WeatherForecast.objects.create(
+            location='Pune', forecast_date=today + timedelta(days=index), min_temperature=20.0,
+            max_temperature=32.0, rainfall_probability=40, humidity=60, condition='Cloudy',
+            forecast_issued_at=now,
+        )
+
+
+class FailingSender(ReminderSender):
+    def send(self, message):
+        raise ConnectionError('Gateway down')
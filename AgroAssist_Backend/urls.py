@@ -10,8 +10,9 @@ from rest_framework.routers import DefaultRouter  # Router for automatic URL gen
 from AgroAssist_Backend.crops.views import (CropViewSet, CropGuideViewSet, 
                                            CropGrowthStageViewSet, CropCareTaskViewSet, 
                                            CropRecommendationViewSet)
-from AgroAssist_Backend.farmers.views import FarmerViewSet, FarmerCropViewSet, FarmerInventoryViewSet
-from AgroAssist_Backend.weather.views import WeatherDataViewSet, FarmersWeatherAlertViewSet, WeatherForecastViewSet
+from AgroAssist_Backend.farmers.views import FarmerViewSet, FarmerCropViewSet, FarmerInventoryViewSet, ImportJobViewSet
+from AgroAssist_Backend.weather.views import (WeatherDataViewSet, FarmersWeatherAlertViewSet, WeatherForecastViewSet,
+                                             WeatherIngestView)
 from AgroAssist_Backend.tasks.views import FarmerTaskViewSet, TaskReminderViewSet, TaskLogViewSet
 
 # CREATE ROUTER - Automatically generates URLs for viewsets
@@ -28,6 +29,7 @@ router.register(r'recommendations', CropRecommendationViewSet, basename='recomme
 router.register(r'farmers', FarmerViewSet, basename='farmers')  # /api/farmers/ for farmers
 router.register(r'farmer-crops', FarmerCropViewSet, basename='farmer-crops')  # /api/farmer-crops/
 router.register(r'inventory', FarmerInventoryViewSet, basename='inventory')  # /api/inventory/
+router.register(r'import-jobs', ImportJobViewSet, basename='import-jobs')  # /api/import-jobs/ (admin CSV uploads)
 
 # REGISTER WEATHER APP VIEWSETS
 router.register(r'weather-data', WeatherDataViewSet, basename='weather-data')  # /api/weather-data/
@@ -44,6 +46,8 @@ urlpatterns = [
     # Admin interface - /admin/
     path('admin/', admin.site.urls),
     path('api/auth/', include('AgroAssist_Backend.farmers.auth_urls')),
+    path('api/jobs/', include('AgroAssist_Backend.farmers.job_urls')),  # Scheduled jobs (cron)
+    path('api/weather-ingest/', WeatherIngestView.as_view(), name='weather-ingest'),  # Admin bulk weather upload
     
     # API ROUTES - All REST API endpoints go under /api/
     # include(router.urls) automatically adds:
@@ -0,0 +1,141 @@
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from AgroAssist_Backend.farmers.models import Farmer
+
+from .locations import location_words, names_city
+from .models import FarmersWeatherAlert, WeatherForecast
+
+# A forecast field compared against a threshold ('gte' or 'lte'); a hit alerts every farmer in the location.
+AlertRule = namedtuple('AlertRule', 'field op threshold alert_type severity title')
+
+DEFAULT_RULES = (
+    AlertRule('expected_rainfall_mm', 'gte', 100, 'Rain', 'Critical', 'Extremely heavy rain'),
+    AlertRule('expected_rainfall_mm', 'gte', 50, 'Rain', 'High', 'Heavy rain'),
+    AlertRule('rainfall_probability', 'gte', 80, 'Rain', 'Medium', 'Rain likely'),
+    AlertRule('max_temperature', 'gte', 45, 'Heat', 'Critical', 'Severe heat wave'),
+    AlertRule('max_temperature', 'gte', 40, 'Heat', 'High', 'Heat wave'),
+    AlertRule('min_temperature', 'lte', 2, 'Frost', 'Critical', 'Ground frost'),
+    AlertRule('min_temperature', 'lte', 6, 'Frost', 'High', 'Cold wave'),
+    AlertRule('wind_speed', 'gte', 60, 'Wind', 'Critical', 'Storm winds'),
+    AlertRule('wind_speed', 'gte', 40, 'Wind', 'High', 'Strong wind'),
+)
+
+# A farmer gets at most one alert of each type within this window.
+DUPLICATE_WINDOW = timedelta(hours=24)
+
+_SEVERITY_RANK = {'Low': 0, 'Medium': 1, 'High': 2, 'Critical': 3}
+_UNITS = {'expected_rainfall_mm': ' mm', 'rainfall_probability': '%', 'max_temperature': ' C',
+          'min_temperature': ' C', 'wind_speed': ' km/h'}
+
+
+def _matches(rule, forecast):
+    value = forecast[rule.field]
+    return value >= rule.threshold if rule.op == 'gte' else value <= rule.threshold
+
+
+def location_alerts(forecasts, rules=DEFAULT_RULES):
+    """
+    {location: {alert_type: (rule, forecast)}} for forecast rows (dicts):
+    per location and type, the most severe matching rule, on its earliest day.
+    """
+    alerts = {}
+    for forecast in sorted(forecasts, key=lambda row: row['forecast_date']):
+        by_type = alerts.setdefault(forecast['location'], {})
+        for rule in rules:
+            if not _matches(rule, forecast):
+                continue
+            current = by_type.get(rule.alert_type)
+            if current is None or _SEVERITY_RANK[rule.severity] > _SEVERITY_RANK[current[0].severity]:
+                by_type[rule.alert_type] = (rule, forecast)
+    return {location: by_type for location, by_type in alerts.items() if by_type}
+
+
+def _alert_fields(rule, forecast):
+    day = forecast['forecast_date']
+    value = forecast[rule.field]
+    return {
+        'alert_title': f"{rule.title} in {forecast['location']}",
+        'alert_message': (f"Forecast for {day.isoformat()}: {rule.field.replace('_', ' ')} "
+                          f"{value:g}{_UNITS.get(rule.field, '')}. Protect crops and plan field work."),
+        'severity': rule.severity,
+        'alert_type': rule.alert_type,
+        'expires_at': timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)),
+    }
+
+
+def fan_out_forecast_alerts(start=None, days=3, rules=DEFAULT_RULES, window=DUPLICATE_WINDOW, chunk_size=5000,
+                            progress=None):
+    """
+    Turn forecasts for [start, start + days) that cross a rule threshold
+    into a FarmersWeatherAlert for every farmer in the location.
+
+    A farmer matches a forecast when their city's words appear whole in
+    its location ('Pune' matches 'Pune District' but not 'Punjab'); a
+    blank city matches nothing. Cities are resolved from one grouped query;
+    farmers of the affected cities are read in primary-key chunks over
+    farmer_city_idx. Per chunk, one query finds alerts of the same types
+    issued within `window` (duplicates are skipped) and one bulk_create
+    writes the rest. Returns (created, suppressed).
+    """
+    now = timezone.now()
+    start = start or timezone.localdate()
+    forecasts = WeatherForecast.objects.filter(
+        forecast_date__gte=start, forecast_date__lt=start + timedelta(days=days),
+    ).order_by().values('location', 'forecast_date', *{rule.field for rule in rules})
+    by_location = location_alerts(forecasts, rules)
+    if not by_location:
+        return 0, 0
+
+    # {city: {alert_type: alert fields}}, the most severe across the locations naming the city.
+    by_city = {}
+    words = {location: location_words(location) for location in by_location}
+    for city in Farmer.objects.order_by().values_list('city', flat=True).distinct():
+        city_words = location_words(city)
+        if not city_words:
+            continue
+        for location, by_type in by_location.items():
+            if not names_city(words[location], city_words):
+                continue
+            city_alerts = by_city.setdefault(city, {})
+            for alert_type, (rule, forecast) in by_type.items():
+                current = city_alerts.get(alert_type)
+                if current is None or _SEVERITY_RANK[rule.severity] > _SEVERITY_RANK[current['severity']]:
+                    city_alerts[alert_type] = _alert_fields(rule, forecast)
+    if not by_city:
+        return 0, 0
+
+    alert_types = {rule.alert_type for rule in rules}
+    farmers = Farmer.objects.filter(city__in=list(by_city)).values_list('pk', 'city')
+    created = suppressed = 0
+    last_pk = 0
+    while True:
+        chunk = list(farmers.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+        if not chunk:
+            return created, suppressed
+        last_pk = chunk[-1][0]
+
+        recent = set(
+            FarmersWeatherAlert.objects.filter(
+                farmer__gte=chunk[0][0],
+                farmer__lte=last_pk,
+                alert_type__in=alert_types,
+                issued_at__gte=now - window,
+            ).order_by().values_list('farmer_id', 'alert_type')
+        )
+        alerts = []
+        for farmer_id, city in chunk:
+            for alert_type, fields in by_city[city].items():
+                if (farmer_id, alert_type) in recent:
+                    suppressed += 1
+                else:
+                    alerts.append(FarmersWeatherAlert(farmer_id=farmer_id, issued_at=now, **fields))
+        if alerts:
+            with transaction.atomic():
+                FarmersWeatherAlert.objects.bulk_create(alerts, batch_size=1000)
+            created += len(alerts)
+        if progress:
+            progress(last_pk, created, suppressed)
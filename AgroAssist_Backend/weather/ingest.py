@@ -0,0 +1,241 @@
+import codecs
+import csv
+import json
+import math
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import WeatherData, WeatherForecast
+
+FORMATS = ('ndjson', 'csv')
+KINDS = ('forecast', 'observation')
+# Rejected rows listed in the summary (all of them are counted).
+MAX_REPORTED_REJECTS = 100
+
+_CONDITIONS = {value.lower(): value for value, _ in WeatherForecast.CONDITION_CHOICES}
+_FORECAST_UPDATE_FIELDS = [
+    'min_temperature', 'max_temperature', 'rainfall_probability', 'expected_rainfall_mm', 'humidity',
+    'condition', 'wind_speed', 'forecast_issued_at', 'updated_at',
+]
+
+
+def _is_utf8(text):
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def iter_rows(stream, fmt):
+    """
+    (line number, row dict) for each non-blank record of a binary stream,
+    read incrementally. Records that are not valid UTF-8, and NDJSON lines
+    that do not hold a JSON object, come back as (line number, error message).
+    """
+    # surrogateescape keeps undecodable bytes in the text so one bad record is rejected, not the whole body.
+    lines = codecs.getreader('utf-8-sig')(stream, errors='surrogateescape')
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            texts = [text for text in (*row.keys(), *row.values()) if isinstance(text, str)]
+            if not any(value and value.strip() for value in row.values() if isinstance(value, str)):
+                continue
+            if not all(_is_utf8(text) for text in texts):
+                yield reader.line_num, 'not valid UTF-8'
+                continue
+            yield reader.line_num, {key.strip(): value for key, value in row.items() if key}
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if not _is_utf8(line):
+            yield line_number, 'not valid UTF-8'
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, 'not valid JSON'
+            continue
+        yield line_number, row if isinstance(row, dict) else 'not a JSON object'
+
+
+def _value(row, field, errors, default=None):
+    value = row.get(field)
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == '':
+        if default is None:
+            errors.append(f'{field} is required')
+        return default
+    return value
+
+
+def _number(row, field, errors, cast=float, default=None, low=None, high=None):
+    value = _value(row, field, errors, default)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = float(value)
+        if not math.isfinite(number):
+            raise ValueError
+        number = cast(number)
+    except (TypeError, ValueError):
+        errors.append(f'{field} must be a number')
+        return None
+    if (low is not None and number < low) or (high is not None and number > high):
+        errors.append(f'{field} must be between {low} and {high}')
+    return number
+
+
+def _location(row, errors):
+    location = _value(row, 'location', errors)
+    if location is not None and (not isinstance(location, str) or len(location) > 100):
+        errors.append('location must be text of at most 100 characters')
+    return location
+
+
+def _condition(row, errors):
+    value = _value(row, 'condition', errors)
+    if value is None:
+        return None
+    condition = _CONDITIONS.get(str(value).lower())
+    if condition is None:
+        errors.append(f"condition '{value}' is invalid")
+    return condition
+
+
+def _timestamp(row, field, errors, default=None):
+    value = _value(row, field, errors, default)
+    if value is None or value is default:
+        # Missing: the error (or the default) is already settled.
+        return value
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        # Well formed but impossible, e.g. month 13.
+        parsed = None
+    if parsed is None:
+        errors.append(f'{field} must be an ISO datetime')
+        return None
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _forecast(row, now, errors):
+    location = _location(row, errors)
+    day = _value(row, 'forecast_date', errors)
+    try:
+        forecast_date = parse_date(str(day)) if day is not None else None
+    except ValueError:
+        # Well formed but impossible, e.g. month 13.
+        forecast_date = None
+    if day is not None and forecast_date is None:
+        errors.append('forecast_date must be YYYY-MM-DD')
+    forecast = WeatherForecast(
+        location=location,
+        forecast_date=forecast_date,
+        min_temperature=_number(row, 'min_temperature', errors),
+        max_temperature=_number(row, 'max_temperature', errors),
+        rainfall_probability=_number(row, 'rainfall_probability', errors, int, low=0, high=100),
+        expected_rainfall_mm=_number(row, 'expected_rainfall_mm', errors, int, default=0, low=0),
+        humidity=_number(row, 'humidity', errors, int, low=0, high=100),
+        condition=_condition(row, errors),
+        wind_speed=_number(row, 'wind_speed', errors, default=0, low=0),
+        forecast_issued_at=_timestamp(row, 'forecast_issued_at', errors, default=now),
+        # Bulk upserts skip auto_now; without this the ETag/Last-Modified of the forecast list would not move.
+        updated_at=now,
+    )
+    if not errors and forecast.min_temperature > forecast.max_temperature:
+        errors.append('min_temperature is above max_temperature')
+    return forecast
+
+
+def _observation(row, now, errors):
+    return WeatherData(
+        location=_location(row, errors),
+        temperature=_number(row, 'temperature', errors),
+        humidity=_number(row, 'humidity', errors, int, low=0, high=100),
+        rainfall=_number(row, 'rainfall', errors, int, low=0),
+        condition=_condition(row, errors),
+        wind_speed=_number(row, 'wind_speed', errors, default=0, low=0),
+        recorded_at=_timestamp(row, 'recorded_at', errors),
+        updated_at=now,
+    )
+
+
+def _write(forecasts, observations):
+    with transaction.atomic():
+        # Upsert on the (location, forecast_date) unique key: a newer forecast replaces the stored one.
+        WeatherForecast.objects.bulk_create(
+            forecasts.values(),
+            update_conflicts=True,
+            unique_fields=['location', 'forecast_date'],
+            update_fields=_FORECAST_UPDATE_FIELDS,
+        )
+        WeatherData.objects.bulk_create(observations)
+
+
+def ingest_weather(stream, fmt='ndjson', kind='forecast', batch_size=2000, progress=None):
+    """
+    Stream-parse NDJSON or CSV weather rows from a binary stream and write
+    them in batches of batch_size rows, one transaction per batch:
+    forecasts are upserted on (location, forecast_date), observations
+    appended. `kind` is the default row type; a row's own `type` column
+    ('forecast' or 'observation') overrides it.
+
+    Returns {'rows', 'forecasts', 'observations', 'rejected', 'rejects'},
+    rejects being the first MAX_REPORTED_REJECTS {'line', 'errors'} entries.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(KINDS)}")
+
+    summary = {'rows': 0, 'forecasts': 0, 'observations': 0, 'rejected': 0, 'rejects': []}
+    now = timezone.now()
+    forecasts = {}
+    observations = []
+
+    def reject(line_number, errors):
+        summary['rejected'] += 1
+        if len(summary['rejects']) < MAX_REPORTED_REJECTS:
+            summary['rejects'].append({'line': line_number, 'errors': errors})
+
+    def flush():
+        _write(forecasts, observations)
+        summary['forecasts'] += len(forecasts)
+        summary['observations'] += len(observations)
+        forecasts.clear()
+        observations.clear()
+        if progress:
+            progress(summary)
+
+    for line_number, row in iter_rows(stream, fmt):
+        summary['rows'] += 1
+        if isinstance(row, str):
+            reject(line_number, [row])
+            continue
+        row_kind = str(row.get('type') or kind).strip().lower()
+        errors = []
+        if row_kind == 'forecast':
+            forecast = _forecast(row, now, errors)
+            if not errors:
+                # A repeated key within a batch keeps the last row (one upsert may not touch a row twice).
+                forecasts[forecast.location, forecast.forecast_date] = forecast
+        elif row_kind == 'observation':
+            observation = _observation(row, now, errors)
+            if not errors:
+                observations.append(observation)
+        else:
+            errors.append(f"type '{row_kind}' is invalid")
+        if errors:
+            reject(line_number, errors)
+        elif len(forecasts) + len(observations) >= batch_size:
+            flush()
+    if forecasts or observations:
+        flush()
+    return summary
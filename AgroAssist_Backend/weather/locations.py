@@ -0,0 +1,16 @@
+import re
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def location_words(text):
+    """Casefolded words of a city or forecast location; () for a blank one."""
+    return tuple(_WORD_RE.findall((text or '').casefold()))
+
+
+def names_city(location_words, city_words):
+    """True when the city's words appear whole and in order in the location ('Pune' in 'Pune District')."""
+    size = len(city_words)
+    if not size:
+        return False
+    return any(location_words[i:i + size] == city_words for i in range(len(location_words) - size + 1))
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0006_hot_path_indexes'),
+        ('weather', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmersweatheralert',
+            index=models.Index(fields=['farmer', '-issued_at'], name='alert_farmer_issued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmersweatheralert',
+            index=models.Index(fields=['-issued_at'], name='alert_issued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['location', '-recorded_at'], name='weatherdata_loc_recorded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['-recorded_at'], name='weatherdata_recorded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherforecast',
+            index=models.Index(fields=['forecast_date'], name='forecast_date_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0007_precomputed_recommendations'),
+        ('weather', '0003_weather_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmersweatheralert',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='farmersweatheralert',
+            index=models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['farmer'], name='alert_unnotified_farmer_idx'),
+        ),
+    ]
@@ -37,11 +37,19 @@ class WeatherData(models.Model):
     # DateTimeField = Auto-set when record created in database
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # DateTimeField = Auto-set on every save (MAX(updated_at) is the list's Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True)
+    
     # Meta class = Configuration for WeatherData model
     class Meta:
         verbose_name = "Weather Data"  # Display name (singular)
         verbose_name_plural = "Weather Data"  # Display name (plural)
         ordering = ['-recorded_at']  # Show most recent weather first
+        indexes = [
+            models.Index(fields=['location', '-recorded_at'], name='weatherdata_loc_recorded_idx'),
+            models.Index(fields=['-recorded_at'], name='weatherdata_recorded_idx'),
+            models.Index(fields=['updated_at'], name='weatherdata_updated_idx'),  # MAX(updated_at) validator
+        ]
     
     def __str__(self):
         # Shows "Pune - Sunny - 28.5Â°C" when displaying
@@ -95,6 +103,9 @@ class FarmersWeatherAlert(models.Model):
     # TextField = What action farmer took (optional)
     farmer_notes = models.TextField(blank=True)  # Farmer's notes about what they did
     
+    # DateTimeField = When the alert went out in the farmer's daily digest (empty = not sent yet)
+    notified_at = models.DateTimeField(blank=True, null=True)  # When farmer was notified
+    
     # DateTimeField = Auto-set when record created
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -106,6 +117,12 @@ class FarmersWeatherAlert(models.Model):
         verbose_name = "Weather Alert"  # Display name (singular)
         verbose_name_plural = "Weather Alerts"  # Display name (plural)
         ordering = ['-issued_at']  # Show most recent alerts first
+        indexes = [
+            models.Index(fields=['farmer', '-issued_at'], name='alert_farmer_issued_idx'),
+            models.Index(fields=['-issued_at'], name='alert_issued_idx'),
+            # Partial index = Only alerts not yet sent in a digest
+            models.Index(fields=['farmer'], condition=models.Q(notified_at__isnull=True), name='alert_unnotified_farmer_idx'),
+        ]
     
     def __str__(self):
         # Shows "Heavy Rain Warning - Rajesh Patil (High)" when displaying
@@ -154,6 +171,9 @@ class WeatherForecast(models.Model):
     # DateTimeField = Auto-set when record created in database
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # DateTimeField = Auto-set on every save (MAX(updated_at) is the list's Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True)
+    
     # Meta class = Configuration for WeatherForecast model
     class Meta:
         verbose_name = "Weather Forecast"  # Display name (singular)
@@ -161,6 +181,10 @@ class WeatherForecast(models.Model):
         ordering = ['forecast_date']  # Show forecasts in chronological order
         # unique_together = Can't have two forecasts for same location/date
         unique_together = ('location', 'forecast_date')  # One forecast per location per day only
+        indexes = [
+            models.Index(fields=['forecast_date'], name='forecast_date_idx'),  # Default list ordering
+            models.Index(fields=['updated_at'], name='forecast_updated_idx'),  # MAX(updated_at) validator
+        ]
     
     def __str__(self):
         # Shows "Pune - 2025-02-25 - Rainy (18-30Â°C)" when displaying
@@ -1,13 +1,16 @@
 # Import serializer classes from Django REST Framework
 from rest_framework import serializers
-from django.utils import timezone
+
+from AgroAssist_Backend.fast_lists import request_now
+from AgroAssist_Backend.farmers.serializers import FarmerSerializer
+from AgroAssist_Backend.sparse_fields import SparseFieldsMixin
 
 # Import models to serialize
 from .models import WeatherData, FarmersWeatherAlert, WeatherForecast
 
 
 # SERIALIZER 1: WeatherDataSerializer - Convert current weather to/from JSON
-class WeatherDataSerializer(serializers.ModelSerializer):
+class WeatherDataSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     formatted_recorded_at = serializers.SerializerMethodField()  # Format date nicely
     
@@ -17,6 +20,8 @@ class WeatherDataSerializer(serializers.ModelSerializer):
                   'wind_speed', 'recorded_at', 'formatted_recorded_at', 'created_at']
         
         read_only_fields = ['created_at', 'recorded_at', 'formatted_recorded_at']  # Can't edit
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {'formatted_recorded_at': ('recorded_at',)}
     
     def get_formatted_recorded_at(self, obj):
         # Format the recorded_at datetime nicely for display
@@ -24,7 +29,7 @@ class WeatherDataSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 2: FarmersWeatherAlertSerializer - Convert weather alerts to/from JSON
-class FarmersWeatherAlertSerializer(serializers.ModelSerializer):
+class FarmersWeatherAlertSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     farmer_name = serializers.SerializerMethodField()  # Show farmer name
     is_active = serializers.SerializerMethodField()  # Check if alert is still active
@@ -38,6 +43,14 @@ class FarmersWeatherAlertSerializer(serializers.ModelSerializer):
         
         read_only_fields = ['created_at', 'updated_at', 'issued_at', 'farmer_name', 
                            'is_active', 'time_until_expiry']  # Can't edit these
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'farmer_name': ('farmer__first_name', 'farmer__last_name'),
+            'is_active': ('expires_at',),
+            'time_until_expiry': ('expires_at',),
+        }
+        # expandable_fields = ?expand= shows the full related object instead of its id
+        expandable_fields = {'farmer': ('farmer', FarmerSerializer)}
     
     def get_farmer_name(self, obj):
         # Returns farmer's full name
@@ -48,7 +61,7 @@ class FarmersWeatherAlertSerializer(serializers.ModelSerializer):
         if not obj.expires_at:  # If no expiry set
             return True  # Still active
         
-        now = timezone.now()  # Current date/time (timezone-aware)
+        now = request_now(self.context)  # Current date/time (timezone-aware, once per request)
         return now < obj.expires_at  # True if before expiry
     
     def get_time_until_expiry(self, obj):
@@ -56,14 +69,14 @@ class FarmersWeatherAlertSerializer(serializers.ModelSerializer):
         if not obj.expires_at:  # If no expiry
             return None  # Unknown
         
-        now = timezone.now()  # Current date/time (timezone-aware)
+        now = request_now(self.context)  # Current date/time (timezone-aware, once per request)
         difference = obj.expires_at - now  # Calculate time remaining
         hours = difference.total_seconds() / 3600  # Convert to hours
         return round(hours, 1)  # Round to 1 decimal place
 
 
 # SERIALIZER 3: WeatherForecastSerializer - Convert weather forecast to/from JSON
-class WeatherForecastSerializer(serializers.ModelSerializer):
+class WeatherForecastSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields
     temperature_range = serializers.SerializerMethodField()  # Show min-max temp
     rainfall_description = serializers.SerializerMethodField()  # Describe rainfall chance
@@ -76,6 +89,11 @@ class WeatherForecastSerializer(serializers.ModelSerializer):
                   'forecast_issued_at', 'created_at']
         
         read_only_fields = ['created_at', 'forecast_issued_at', 'temperature_range', 'rainfall_description']  # Can't edit
+        # field_dependencies = Model fields each method field reads (for ?fields= column trimming)
+        field_dependencies = {
+            'temperature_range': ('min_temperature', 'max_temperature'),
+            'rainfall_description': ('rainfall_probability',),
+        }
     
     def get_temperature_range(self, obj):
         # Returns formatted temperature range like "18-35°C"
@@ -98,7 +116,7 @@ class WeatherForecastSerializer(serializers.ModelSerializer):
 
 
 # SERIALIZER 4: WeatherAlertDetailSerializer - Show alert with all details
-class WeatherAlertDetailSerializer(serializers.ModelSerializer):
+class WeatherAlertDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # SerializerMethodField = Custom fields for additional info
     farmer_name = serializers.SerializerMethodField()  # Farmer name
     farmer_details = serializers.SerializerMethodField()  # Farmer contact info
@@ -132,7 +150,7 @@ class WeatherAlertDetailSerializer(serializers.ModelSerializer):
         if not obj.expires_at:
             return True
         
-        now = timezone.now()
+        now = request_now(self.context)
         return now < obj.expires_at
     
     def get_recommendation(self, obj):
@@ -1,3 +1,152 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from AgroAssist_Backend.farmers.models import Farmer
+from AgroAssist_Backend.testing import seed_api_data
+from AgroAssist_Backend.weather.fanout import fan_out_forecast_alerts
+from AgroAssist_Backend.weather.models import FarmersWeatherAlert, WeatherData, WeatherForecast
+
+
+class WeatherAlertFanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=2)
+        cls.today = timezone.localdate()
+        Farmer.objects.filter(first_name='Farmer1').update(city='Nashik')
+        for location, fields in [('Pune District', {'expected_rainfall_mm': 120, 'wind_speed': 45}),
+                                 ('Nagpur', {'max_temperature': 46})]:
+            WeatherForecast.objects.create(
+                location=location, forecast_date=cls.today + timedelta(days=1), min_temperature=20.0,
+                max_temperature=fields.get('max_temperature', 30.0), rainfall_probability=90, humidity=80,
+                condition='Stormy', expected_rainfall_mm=fields.get('expected_rainfall_mm', 0),
+                wind_speed=fields.get('wind_speed', 0), forecast_issued_at=timezone.now(),
+            )
+
+    def test_threshold_hits_fan_out_to_farmers_in_the_location(self):
+        # Forecasts, cities, farmer chunk, recent alerts, savepoint + INSERT + release, empty chunk.
+        with self.assertNumQueries(8):
+            created, suppressed = fan_out_forecast_alerts(self.today, days=3)
+        # The seeded farmer's Rain alert from today suppresses the new one.
+        self.assertEqual((created, suppressed), (1, 1))
+        wind = FarmersWeatherAlert.objects.get(alert_type='Wind')
+        self.assertEqual((wind.farmer.city, wind.severity, wind.alert_title), ('Pune', 'High', 'Strong wind in Pune District'))
+        self.assertEqual(wind.expires_at.date(), self.today + timedelta(days=2))
+        self.assertFalse(FarmersWeatherAlert.objects.filter(farmer__city='Nashik', alert_type='Wind').exists())
+
+        self.assertEqual(fan_out_forecast_alerts(self.today, days=3), (0, 2))
+
+    def test_most_severe_rule_wins_once_the_window_passes(self):
+        created, _ = fan_out_forecast_alerts(self.today, days=3, window=timedelta(0))
+        self.assertEqual(created, 2)
+        rain = FarmersWeatherAlert.objects.filter(alert_type='Rain').latest('pk')
+        self.assertEqual((rain.severity, rain.alert_title), ('Critical', 'Extremely heavy rain in Pune District'))
+        self.assertIn('120 mm', rain.alert_message)
+
+    def test_blank_and_partial_cities_match_no_location(self):
+        seeded = FarmersWeatherAlert.objects.filter(farmer__first_name='Farmer1').count()
+        for city in ('', 'Pun', 'Nag pur'):
+            with self.subTest(city=city):
+                Farmer.objects.filter(first_name='Farmer1').update(city=city)
+                fan_out_forecast_alerts(self.today, days=3, window=timedelta(0))
+                self.assertEqual(FarmersWeatherAlert.objects.filter(farmer__first_name='Farmer1').count(), seeded)
+
+    @override_settings(CRON_SECRET='nightly')
+    def test_cron_job_reports_counts(self):
+        response = APIClient().get(reverse('job-fan-out-weather-alerts'), HTTP_AUTHORIZATION='Bearer nightly')
+        self.assertEqual(response.data, {'alerts_created': 1, 'duplicates_skipped': 1})
+
+
+class WeatherIngestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_api_data(rows=1)
+        cls.admin = User.objects.create_user('ingest_admin', 'ingest_admin@example.com', 'pw', is_staff=True)
+        cls.today = timezone.localdate()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, body, content_type='application/x-ndjson', **params):
+        url = reverse('weather-ingest')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.generic('POST', url, body.encode(), content_type=content_type)
+
+    def forecast(self, location, day, **fields):
+        return json.dumps({
+            'location': location, 'forecast_date': day.isoformat(), 'min_temperature': 19, 'max_temperature': 33,
+            'rainfall_probability': 70, 'humidity': 75, 'condition': 'rainy', **fields,
+        })
+
+    def test_ndjson_upserts_forecasts_and_reports_rejects(self):
+        etag = self.client.get(reverse('weather-forecast-list'))['ETag']
+        body = '\n'.join([
+            self.forecast('Pune', self.today, expected_rainfall_mm=55),
+            self.forecast('Nashik', self.today),
+            '{not json',
+            self.forecast('Nashik', self.today + timedelta(days=1), humidity=150),
+            json.dumps({'type': 'observation', 'location': 'Pune', 'temperature': 29.5, 'humidity': 65,
+                        'rainfall': 4, 'condition': 'Cloudy', 'recorded_at': '2026-06-01T06:00:00'}),
+            '',
+            json.dumps({'forecast_date': self.today.isoformat()}),
+        ])
+        response = self.post(body)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            {key: response.data[key] for key in ('rows', 'forecasts', 'observations', 'rejected')},
+            {'rows': 6, 'forecasts': 2, 'observations': 1, 'rejected': 3},
+        )
+        self.assertEqual([reject['line'] for reject in response.data['rejects']], [3, 4, 7])
+        self.assertEqual(response.data['rejects'][1]['errors'], ['humidity must be between 0 and 100'])
+
+        pune = WeatherForecast.objects.get(location='Pune', forecast_date=self.today)
+        self.assertEqual((pune.condition, pune.expected_rainfall_mm), ('Rainy', 55))
+        self.assertEqual(WeatherForecast.objects.filter(location='Pune').count(), 1)
+        self.assertEqual(WeatherData.objects.filter(temperature=29.5).count(), 1)
+        self.assertNotEqual(self.client.get(reverse('weather-forecast-list'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_csv_observations(self):
+        body = ('location,temperature,humidity,rainfall,condition,recorded_at\n'
+                'Pune,30.5,55,0,Sunny,2026-06-01T09:00:00+05:30\n'
+                'Pune,hot,55,0,Sunny,2026-06-01T10:00:00+05:30\n')
+        response = self.post(body, 'text/csv', kind='observation')
+        self.assertEqual((response.data['observations'], response.data['rejected']), (1, 1))
+        self.assertEqual(response.data['rejects'], [{'line': 3, 'errors': ['temperature must be a number']}])
+
+    def test_impossible_dates_and_bad_bytes_are_rejected(self):
+        body = b'\n'.join([
+            self.forecast('Pune', self.today).encode(),
+            self.forecast('Pune', self.today).replace(self.today.isoformat(), '2026-13-01').encode(),
+            self.forecast('Nashik', self.today, forecast_issued_at='2026-13-01T06:00:00').encode(),
+            json.dumps({'type': 'observation', 'location': 'Pune', 'temperature': 29.5, 'humidity': 65,
+                        'rainfall': 4, 'condition': 'Cloudy', 'recorded_at': '2026-02-30T06:00:00'}).encode(),
+            b'{"location": "Pune\xff"}',
+        ])
+        response = self.client.generic('POST', reverse('weather-ingest'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.data['forecasts'], response.data['rejected']), (1, 4))
+        self.assertEqual([reject['errors'] for reject in response.data['rejects']], [
+            ['forecast_date must be YYYY-MM-DD'], ['forecast_issued_at must be an ISO datetime'],
+            ['recorded_at must be an ISO datetime'], ['not valid UTF-8'],
+        ])
+
+        csv_body = (b'location,temperature,humidity,rainfall,condition,recorded_at\n'
+                    b'Pune\xe9,30.5,55,0,Sunny,2026-06-01T09:00:00+05:30\n'
+                    b'Pune,30.5,55,0,Sunny,2026-06-01T09:00:00+05:30\n')
+        response = self.client.generic('POST', reverse('weather-ingest') + '?kind=observation', csv_body,
+                                       content_type='text/csv')
+        self.assertEqual(response.data['rejects'], [{'line': 2, 'errors': ['not valid UTF-8']}])
+        self.assertEqual(response.data['observations'], 1)
+
+    def test_admin_only_and_kind_checked(self):
+        self.assertEqual(self.post('{}', kind='alerts').status_code, 400)
+        user = User.objects.create_user('ingest_farmer', 'ingest_farmer@example.com', 'pw')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.post(self.forecast('Pune', self.today)).status_code, 403)
@@ -1,26 +1,31 @@
 # Weather API ViewSets - Readonly access to weather data
-from rest_framework import viewsets, filters
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import viewsets, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .ingest import KINDS, ingest_weather
 from .models import WeatherData, FarmersWeatherAlert, WeatherForecast
 from .serializers import WeatherDataSerializer, FarmersWeatherAlertSerializer, WeatherForecastSerializer
-from AgroAssist_Backend.farmers.models import Farmer
+from AgroAssist_Backend.conditional import UpdatedAtConditionalMixin
+from AgroAssist_Backend.farmers.mixins import LinkedFarmerMixin
+from AgroAssist_Backend.fast_lists import FastListMixin
+from AgroAssist_Backend.pagination import KeysetPagination
+from AgroAssist_Backend.sparse_fields import SparseQuerysetMixin
 
-
-def _linked_farmer_for_user(user):
-    return Farmer.objects.filter(email__iexact=user.email).first()
-
-class StandardPagination(PageNumberPagination):
-    page_size = 20  # Show 20 results per page
+class StandardPagination(KeysetPagination):
+    page_size = 20  # Show 20 results per page (add ?cursor= for keyset paging where supported)
 
 # WeatherData ViewSet - Current weather information
-class WeatherDataViewSet(viewsets.ReadOnlyModelViewSet):
+class WeatherDataViewSet(UpdatedAtConditionalMixin, SparseQuerysetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = WeatherData.objects.all()  # All current weather records
     serializer_class = WeatherDataSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate results
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Search and sort
     search_fields = ['location']  # Search by location name
     ordering = ['-recorded_at']  # Newest first
+    cursor_ordering = ('-recorded_at', 'id')  # ?cursor= paging order (id breaks ties)
+    query_budgets = {'list': 3, 'retrieve': 2}  # +1 for the ETag/Last-Modified aggregate
 
     def get_queryset(self):
         queryset = WeatherData.objects.all().order_by('-recorded_at')
@@ -30,14 +35,16 @@ class WeatherDataViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 # Weather Alert ViewSet - Farmer weather alerts
-class FarmersWeatherAlertViewSet(viewsets.ModelViewSet):
+class FarmersWeatherAlertViewSet(LinkedFarmerMixin, SparseQuerysetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = FarmersWeatherAlert.objects.all()  # All alerts
     serializer_class = FarmersWeatherAlertSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Filter
     search_fields = ['farmer__first_name', 'alert_type']  # Search
     ordering = ['-issued_at']  # Newest first
+    cursor_ordering = ('-issued_at', 'id')  # ?cursor= paging order (id breaks ties)
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -46,7 +53,7 @@ class FarmersWeatherAlertViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = FarmersWeatherAlert.objects.all().order_by('-issued_at')
+        queryset = FarmersWeatherAlert.objects.select_related('farmer').order_by('-issued_at')
 
         if user.is_staff or user.is_superuser:
             farmer_id = self.request.query_params.get('farmer')
@@ -54,20 +61,21 @@ class FarmersWeatherAlertViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(farmer_id=farmer_id)
             return queryset
 
-        farmer = _linked_farmer_for_user(user)
-        if farmer:
-            return queryset.filter(farmer=farmer)
+        farmer_id = self.get_linked_farmer_id()
+        if farmer_id:
+            return queryset.filter(farmer_id=farmer_id)
 
         return queryset.none()
 
 # Forecast ViewSet - Weather predictions
-class WeatherForecastViewSet(viewsets.ReadOnlyModelViewSet):
+class WeatherForecastViewSet(UpdatedAtConditionalMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = WeatherForecast.objects.all()  # All forecasts
     serializer_class = WeatherForecastSerializer  # Convert to JSON
     pagination_class = StandardPagination  # Paginate
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]  # Filter
     search_fields = ['location']  # Search by location
     ordering = ['forecast_date']  # By date (earliest first)
+    query_budgets = {'list': 3, 'retrieve': 2}  # +1 for the ETag/Last-Modified aggregate
 
     def get_queryset(self):
         queryset = WeatherForecast.objects.all().order_by('forecast_date')
@@ -75,3 +83,23 @@ class WeatherForecastViewSet(viewsets.ReadOnlyModelViewSet):
         if location:
             queryset = queryset.filter(location__icontains=location)
         return queryset
+
+# Bulk ingest view - Admins POST many observations/forecasts at once
+class WeatherIngestView(APIView):
+    """
+    POST NDJSON (application/x-ndjson) or CSV (text/csv) weather rows.
+    ?kind=forecast (default) or observation; a row's own `type` wins.
+    The body is parsed as it streams in, never loaded whole.
+    """
+    permission_classes = [IsAdminUser]  # Only admins can load weather feeds
+
+    def post(self, request):
+        kind = request.query_params.get('kind', 'forecast')
+        if kind not in KINDS:
+            raise ValidationError({'kind': f"Must be one of: {', '.join(KINDS)}."})
+        # Content-Type decides the format (text/csv = CSV, anything else = NDJSON)
+        fmt = 'csv' if request.content_type.split(';')[0].strip() == 'text/csv' else 'ndjson'
+        if request.stream is None:
+            raise ValidationError('Request body is empty.')
+        summary = ingest_weather(request.stream, fmt, kind)
+        return Response(summary, status=status.HTTP_200_OK)